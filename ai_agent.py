@@ -103,6 +103,81 @@ class MacadamiaTradeAIAgent:
         
         return summary
     
+    def analyze_delta(self, delta: Dict) -> str:
+        """수집 델타(신규 경로/금액 변화/수정 기간)만으로 변화 분석 - 최근 기간 전체를 다시 읽지 않음"""
+        if not delta or not delta.get('records'):
+            return "새로 수집된 마카다미아 무역 데이터가 없습니다."
+        
+        prompt = f"""
+        다음은 이번 수집에서 새로 확인된 마카다미아 무역 데이터의 변경 사항입니다:
+        
+        {json.dumps(delta, ensure_ascii=False, indent=2, default=str)}
+        
+        new_routes는 처음 나타난 무역 경로, value_changes는 직전 기간 또는 수정 전 대비 금액 변화가 큰 경로/기간,
+        revised_periods는 이미 집계된 기간에 추가로 반영된 데이터입니다.
+        
+        이 변경 사항을 바탕으로 다음 사항들을 분석해주세요:
+        1. 새로 등장한 무역 경로의 의미
+        2. 금액이 크게 변한 경로와 가능한 원인
+        3. 수정된 통계가 기존 판단에 주는 영향
+        4. 주목할만한 변화나 패턴
+        
+        한국어로 간결하고 전문적인 분석을 작성해주세요.
+        """
+        
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-4",
+                messages=[
+                    {"role": "system", "content": "당신은 국제무역 전문 분석가입니다. 마카다미아 무역 데이터를 분석하여 인사이트를 제공합니다."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=1500,
+                temperature=0.3
+            )
+            
+            return response.choices[0].message.content
+            
+        except Exception as e:
+            logger.error(f"AI 델타 분석 오류: {e}")
+            return f"분석 중 오류가 발생했습니다: {e}"
+    
+    def generate_delta_report(self, delta: Dict) -> str:
+        """수집 델타 기반 일일 보고서 생성"""
+        analysis = self.analyze_delta(delta)
+        
+        new_routes = '\n'.join(
+            f"- {entry['origin']} → {entry['destination']} ({entry['product_code']}, {entry['trade_type']}): "
+            f"${entry['value_usd']:,.0f}, 기간 {', '.join(entry['periods'])}"
+            for entry in delta.get('new_routes', [])
+        ) or '- 없음'
+        value_changes = '\n'.join(
+            f"- {entry['origin']} → {entry['destination']} {entry['period']}: "
+            f"${entry['previous_value']:,.0f} → ${entry['value_usd']:,.0f} ({entry['change_pct']:+.1f}%)"
+            for entry in delta.get('value_changes', [])
+        ) or '- 없음'
+        
+        return f"""
+# 마카다미아 무역 일일 보고서
+**생성일시:** {datetime.now().strftime('%Y년 %m월 %d일 %H:%M')}
+
+## 📊 신규 수집 현황
+- 신규 데이터: {delta.get('records', 0)}건 (${delta.get('value_usd', 0):,.0f})
+- 신규 기간: {len(delta.get('new_periods', []))}건, 수정된 기간: {len(delta.get('revised_periods', []))}건
+
+## 🆕 신규 경로
+{new_routes}
+
+## 📈 금액 변화
+{value_changes}
+
+## 🧠 AI 분석
+{analysis}
+
+---
+*이 보고서는 AI 에이전트에 의해 자동 생성되었습니다.*
+        """
+    
     def generate_daily_report(self) -> str:
         """일일 보고서 생성 및 텔레그램 알림"""
         analysis = self.analyze_trade_trends(1)
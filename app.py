@@ -13,7 +13,6 @@ from web import (
     DataAPIHandler, AIAPIHandler, ProductAPIHandler, ReportAPIHandler,
     DashboardAPI, TelegramAPI, DatabaseAPI, HealthAPI
 )
-from scheduler import MacadamiaTradeScheduler
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -41,9 +40,8 @@ def create_modular_app():
     health_api = HealthAPI()
     logger.info("API handlers created successfully")
     
-    # 스케줄러 설정
-    scheduler = MacadamiaTradeScheduler()
-    logger.info("Scheduler initialized")
+    # 스케줄러 (create_components에서 수집기와 함께 생성됨)
+    scheduler = components['scheduler']
     
     # === 기본 라우트 ===
     @app.route('/')
@@ -135,7 +133,7 @@ def create_modular_app():
     # === 데이터베이스 API ===
     @app.route('/api/init-database', methods=['POST'])
     def init_database():
-        return database_api.init_database()
+        return database_api.init_database(components['scraper'])
     
     @app.route('/api/database/status')
     def database_status():
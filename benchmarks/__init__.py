@@ -0,0 +1,10 @@
+# Offline benchmarking tools
+from .http_replay import FixtureStore, ReplayServer, recording, replaying, run_collection
+
+__all__ = [
+    'FixtureStore',
+    'ReplayServer',
+    'recording',
+    'replaying',
+    'run_collection'
+]
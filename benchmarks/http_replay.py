@@ -0,0 +1,364 @@
+"""
+스크래퍼 HTTP 응답 기록/재생 도구
+실제 응답을 한 번 압축 픽스처로 기록한 뒤, 로컬 대체 서버에서 지연/오류를 주입하며
+재생하여 수집 처리량과 병렬 처리 변경을 오프라인에서 재현 가능하게 측정
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import argparse
+import base64
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'http')
+
+# 본문을 풀어서 저장하므로 전송 관련 헤더는 기록하지 않음
+_HOP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+_REPLAY_URL_HEADER = 'X-Replay-Url'
+
+
+def fixture_key(method: str, url: str, body=None) -> str:
+    """요청 식별 키 (쿼리 파라미터 순서 무관)"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    canonical = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ''))
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    digest = hashlib.sha1(f"{method.upper()} {canonical}".encode('utf-8'))
+    if body:
+        digest.update(b'\0' + body)
+    return digest.hexdigest()
+
+
+class FixtureStore:
+    """요청별 응답을 gzip JSON 파일로 보관하는 픽스처 저장소"""
+
+    def __init__(self, root: str = DEFAULT_STORE):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{key}.json.gz")
+
+    def save(self, method: str, url: str, request_body, status: int, headers: Dict, body: bytes):
+        """응답 기록 (본문은 UTF-8 텍스트면 그대로, 아니면 base64)"""
+        try:
+            text, encoding = body.decode('utf-8'), 'text'
+        except UnicodeDecodeError:
+            text, encoding = base64.b64encode(body).decode('ascii'), 'base64'
+
+        entry = {
+            'method': method.upper(),
+            'url': url,
+            'status': status,
+            'headers': {name: value for name, value in headers.items() if name.lower() not in _HOP_HEADERS},
+            'body': text,
+            'body_encoding': encoding,
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        key = fixture_key(method, url, request_body)
+        with self._lock, gzip.open(self._path(key), 'wt', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        return key
+
+    def load(self, key: str) -> Optional[Dict]:
+        """기록된 응답 (없으면 None) - body는 bytes로 복원"""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            entry = json.load(f)
+        if entry.pop('body_encoding', 'text') == 'base64':
+            entry['body'] = base64.b64decode(entry['body'])
+        else:
+            entry['body'] = entry['body'].encode('utf-8')
+        return entry
+
+    def keys(self):
+        return [name[:-len('.json.gz')] for name in os.listdir(self.root) if name.endswith('.json.gz')]
+
+    def __len__(self):
+        return len(self.keys())
+
+
+class RecordingAdapter(HTTPAdapter):
+    """실제 요청을 보내고 응답을 픽스처 저장소에 기록하는 어댑터"""
+
+    def __init__(self, store: FixtureStore, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, stream=False, **kwargs):
+        response = super().send(request, stream=stream, **kwargs)
+        body = response.content
+        self.store.save(request.method, request.url, request.body,
+                        response.status_code, dict(response.headers), body)
+
+        # 스트리밍 소비자(ijson 등)가 다시 읽을 수 있도록 원시 응답을 복원
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in _HOP_HEADERS}
+        response.raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=response.status_code,
+                                    preload_content=False)
+        return response
+
+
+class ReplayServer:
+    """픽스처를 제공하는 로컬 대체 서버 (지연/오류 주입 가능)
+
+    Args:
+        latency: 응답 전 기본 지연 (초)
+        jitter: 기본 지연에 더하는 0~jitter초 무작위 지연
+        error_rate: 오류를 주입할 요청 비율 (0~1)
+        error_status: 주입할 HTTP 상태 코드 (0이면 응답 없이 연결 종료)
+        compress: 클라이언트가 허용하면 gzip으로 압축하여 전송
+    """
+
+    def __init__(self, store: FixtureStore, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, compress: bool = True,
+                 seed: int = None):
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.compress = compress
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'hits': 0, 'misses': 0, 'injected_errors': 0}
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'ReplayServer':
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                server._handle(self)
+
+            do_POST = do_PUT = do_DELETE = do_HEAD = do_GET
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='replay-server', daemon=True)
+        self._thread.start()
+        logger.info(f"재생 서버 시작: {self.base_url} (픽스처 {len(self.store)}개)")
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _handle(self, handler: BaseHTTPRequestHandler):
+        self._count('requests')
+        length = int(handler.headers.get('Content-Length') or 0)
+        request_body = handler.rfile.read(length) if length else None
+        url = handler.headers.get(_REPLAY_URL_HEADER, handler.path)
+
+        with self._random_lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            inject_error = self.error_rate > 0 and self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+
+        if inject_error:
+            self._count('injected_errors')
+            if not self.error_status:
+                # 응답 없이 연결 종료 (연결 재설정 상황 재현)
+                handler.close_connection = True
+                return
+            self._send(handler, self.error_status, {'Content-Type': 'text/plain'}, b'injected error')
+            return
+
+        entry = self.store.load(fixture_key(handler.command, url, request_body))
+        if entry is None:
+            self._count('misses')
+            logger.warning(f"기록되지 않은 요청: {handler.command} {url}")
+            self._send(handler, 404, {'Content-Type': 'text/plain', 'X-Replay-Miss': '1'}, b'no fixture')
+            return
+
+        self._count('hits')
+        body = entry['body']
+        headers = dict(entry['headers'])
+        if self.compress and 'gzip' in (handler.headers.get('Accept-Encoding') or ''):
+            body = gzip.compress(body, compresslevel=5)
+            headers['Content-Encoding'] = 'gzip'
+        self._send(handler, entry['status'], headers, body, head_only=handler.command == 'HEAD')
+
+    def _send(self, handler, status: int, headers: Dict, body: bytes, head_only: bool = False):
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        if not head_only:
+            handler.wfile.write(body)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class ReplayAdapter(HTTPAdapter):
+    """모든 요청을 재생 서버로 보내는 어댑터 (원래 URL은 헤더로 전달)"""
+
+    def __init__(self, server: ReplayServer, **kwargs):
+        super().__init__(**kwargs)
+        self.server = server
+
+    def send(self, request, **kwargs):
+        original_url = request.url
+        parts = urlsplit(original_url)
+        request = request.copy()
+        request.headers[_REPLAY_URL_HEADER] = original_url
+        request.url = urlunsplit(('http', urlsplit(self.server.base_url).netloc, parts.path or '/', parts.query, ''))
+        response = super().send(request, **kwargs)
+        response.url = original_url
+        return response
+
+
+def _mount(session: requests.Session, adapter: HTTPAdapter) -> Dict:
+    """세션의 모든 어댑터(호스트별 어댑터 포함)를 교체하고 기존 어댑터 반환"""
+    previous = dict(session.adapters)
+    for prefix in list(previous) + ['https://', 'http://']:
+        session.mount(prefix, adapter)
+    return previous
+
+
+def _restore(session: requests.Session, previous: Dict):
+    session.adapters.clear()
+    session.adapters.update(previous)
+
+
+@contextmanager
+def recording(session: requests.Session, store: FixtureStore) -> Iterator[FixtureStore]:
+    """블록 안에서 세션의 모든 응답을 기록"""
+    previous = _mount(session, RecordingAdapter(store))
+    try:
+        yield store
+    finally:
+        _restore(session, previous)
+
+
+@contextmanager
+def replaying(session: requests.Session, store: FixtureStore, **server_options) -> Iterator[ReplayServer]:
+    """블록 안에서 세션의 모든 요청을 로컬 재생 서버로 응답"""
+    with ReplayServer(store, **server_options) as server:
+        previous = _mount(session, ReplayAdapter(server))
+        try:
+            yield server
+        finally:
+            _restore(session, previous)
+
+
+def build_scrapers(session: requests.Session):
+    """메인 수집기와 동일한 구성의 스크래퍼 목록"""
+    from scrapers import (UNComtradeScraper, KoreaCustomsScraper, AdditionalSourcesScraper,
+                          PublicDataScraper, HistoricalDataScraper)
+    return [
+        UNComtradeScraper(session),
+        KoreaCustomsScraper(session),
+        AdditionalSourcesScraper(session),
+        PublicDataScraper(session),
+        HistoricalDataScraper(session)
+    ]
+
+
+def run_collection(session: requests.Session, group: str = 'current', max_workers: int = 8) -> Dict:
+    """모든 소스를 갱신 주기와 관계없이 한 번 수집하고 처리량 측정"""
+    from scrapers.source_registry import SourceRegistry, SourceOrchestrator
+
+    registry = SourceRegistry()
+    for scraper in build_scrapers(session):
+        registry.register_all(scraper.source_specs())
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    result = SourceOrchestrator(registry, max_workers=max_workers).run(group, force=True)
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(records) for records in result['records'].values())
+    return {
+        'group': group,
+        'elapsed': round(elapsed, 3),
+        'cpu': round(time.process_time() - cpu_started, 3),
+        'records': total,
+        'records_per_sec': round(total / elapsed, 1) if elapsed else 0.0,
+        'per_source': {
+            name: {'records': len(result['records'].get(name, [])), 'seconds': seconds}
+            for name, seconds in result['timings'].items()
+        },
+        'errors': result['errors']
+    }
+
+
+def main():
+    from scrapers.http_client import create_http_session
+
+    parser = argparse.ArgumentParser(description='스크래퍼 HTTP 응답 기록/재생')
+    parser.add_argument('mode', choices=['record', 'replay'], help='기록 또는 재생')
+    parser.add_argument('--store', default=DEFAULT_STORE, help='픽스처 저장 경로')
+    parser.add_argument('--group', default='current', help='수집 그룹 (current, historical)')
+    parser.add_argument('--workers', type=int, default=8, help='병렬 수집 수')
+    parser.add_argument('--latency', type=float, default=0.0, help='재생 응답 지연 (초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='재생 응답 추가 무작위 지연 (초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='오류 주입 비율 (0~1)')
+    parser.add_argument('--error-status', type=int, default=503, help='주입할 상태 코드 (0이면 연결 종료)')
+    parser.add_argument('--seed', type=int, default=None, help='지연/오류 주입 난수 시드')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = FixtureStore(args.store)
+    session = create_http_session()
+
+    if args.mode == 'record':
+        with recording(session, store):
+            report = run_collection(session, args.group, args.workers)
+        report['fixtures'] = len(store)
+    else:
+        with replaying(session, store, latency=args.latency, jitter=args.jitter,
+                       error_rate=args.error_rate, error_status=args.error_status, seed=args.seed) as server:
+            report = run_collection(session, args.group, args.workers)
+            report['server'] = dict(server.stats)
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
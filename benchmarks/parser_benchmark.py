@@ -0,0 +1,337 @@
+"""
+스크래퍼 소스별 파서 처리량 벤치마크
+합성 페이로드(10~100k행) 또는 기록된 픽스처를 각 소스 파서에 입력하여
+초당 처리 행 수, 메모리 할당 수, 최대 메모리를 측정하고 기준값 대비 성능 저하를 검사
+"""
+from typing import Callable, Dict, List, Optional
+import argparse
+import gc
+import io
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+import requests
+from urllib3.response import HTTPResponse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers import (UNComtradeScraper, KoreaCustomsScraper, AdditionalSourcesScraper,
+                      PublicDataScraper, HistoricalDataScraper)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parser_baseline.json')
+DEFAULT_THRESHOLD = 0.25
+
+_COUNTRIES = ['Australia', 'South Africa', 'Kenya', 'Guatemala', 'Malawi', 'Brazil', 'China', 'Vietnam']
+
+
+class PayloadSession:
+    """모든 요청에 같은 페이로드로 응답하는 벤치마크용 세션"""
+
+    def __init__(self, payload: bytes, content_type: str):
+        self.payload = payload
+        self.content_type = content_type
+        self.headers = {}
+
+    def get(self, url, params=None, timeout=None, stream=False, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers['Content-Type'] = self.content_type
+        response.raw = HTTPResponse(body=io.BytesIO(self.payload), status=200, preload_content=False,
+                                    headers={'Content-Type': self.content_type})
+        if not stream:
+            response._content = self.payload
+        return response
+
+
+# 합성 페이로드 생성기 (행 수 → bytes)
+
+def _html_table(rows: int, table_class: str = 'table', tables: int = 1) -> bytes:
+    """국가/금액/금액/수량/상대국 5열 통계 테이블"""
+    per_table = max(1, rows // tables)
+    parts = ['<html><head><title>stats</title></head><body><div class="content">']
+    written = 0
+    for _ in range(tables):
+        parts.append(f'<table class="{table_class}"><tr><th>Country</th><th>Value</th>'
+                     f'<th>Amount</th><th>Quantity</th><th>Partner</th></tr>')
+        for _ in range(per_table if tables > 1 else rows):
+            country = _COUNTRIES[written % len(_COUNTRIES)]
+            parts.append(f'<tr><td>{country}</td><td>{12345 + written:,}</td>'
+                         f'<td>{1234.5 + written:,.1f}</td><td>{678 + written % 1000}</td><td>Korea</td></tr>')
+            written += 1
+        parts.append('</table>')
+    parts.append('</div></body></html>')
+    return ''.join(parts).encode('utf-8')
+
+
+def _html_sections(rows: int, css_class: str) -> bytes:
+    parts = ['<html><body>']
+    parts.extend(f'<div class="{css_class}">Korea trade statistics {i}</div>' for i in range(rows))
+    parts.append('</body></html>')
+    return ''.join(parts).encode('utf-8')
+
+
+def _html_links(rows: int, match: str) -> bytes:
+    """일치하는 링크가 마지막에 하나만 있는 페이지 (페이지 전체 탐색 비용 측정)"""
+    parts = ['<html><body><ul>']
+    parts.extend(f'<li><a href="/page/{i}.html">Page {i}</a></li>' for i in range(rows - 1))
+    parts.append(f'<li><a href="/files/{match}">Data</a></li></ul></body></html>')
+    return ''.join(parts).encode('utf-8')
+
+
+def _json(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _comtrade_json(rows: int) -> bytes:
+    return _json({'data': [{
+        'reporterDesc': 'Rep. of Korea', 'partnerDesc': _COUNTRIES[i % len(_COUNTRIES)],
+        'cmdCode': '080250', 'cmdDesc': 'Macadamia nuts, fresh or dried, in shell',
+        'primaryValue': 12345.6 + i, 'qty': 100 + i, 'flowDesc': 'Imports',
+        'period': '2024', 'refYear': 2024
+    } for i in range(rows)]})
+
+
+def _customs_json(rows: int) -> bytes:
+    return _json({'data': [{
+        'expCntyCd': 'AU', 'hsSgn': '0802501000', 'prdlstNm': '마카다미아',
+        'expUsdAmt': 5000 + i, 'expKg': 100 + i, 'expDclYy': '2024'
+    } for i in range(rows)]})
+
+
+def _faostat_json(rows: int) -> bytes:
+    return _json({'data': [{
+        'ReporterCountry': _COUNTRIES[i % len(_COUNTRIES)], 'ItemCode': '256',
+        'Item': 'Nuts', 'Value': 1000 + i, 'Year': str(2020 + i % 5)
+    } for i in range(rows)]})
+
+
+def _worldbank_json(rows: int) -> bytes:
+    return _json([{'page': 1, 'total': rows}, [{'date': str(2000 + i % 25), 'value': 1.5 + i} for i in range(rows)]])
+
+
+def _usda_json(rows: int) -> bytes:
+    return _json([{'Value': 100 + i, 'Market_Year': str(2020 + i % 5)} for i in range(rows)])
+
+
+def _eurostat_json(rows: int) -> bytes:
+    return _json({'value': {str(i): 1000.0 + i for i in range(rows)}})
+
+
+def _nz_json(rows: int) -> bytes:
+    return _json({'datasets': [{'title': f'Overseas trade dataset {i}'} for i in range(rows)]})
+
+
+def _canada_json(rows: int) -> bytes:
+    cubes = [{'cubeTitleEn': f'Population table {i}'} for i in range(rows - 1)]
+    return _json(cubes + [{'cubeTitleEn': 'International merchandise trade'}])
+
+
+def _trade_online_json(rows: int) -> bytes:
+    return _json({'data': [{
+        'partner_name': 'Australia', 'commodity_code': '080250', 'commodity_name': 'Macadamia',
+        'trade_value': 1000 + i, 'quantity': 10 + i, 'flow': 'Import'
+    } for i in range(rows)]})
+
+
+_HTML = 'text/html; charset=utf-8'
+_JSON = 'application/json'
+
+
+def _comtrade(session) -> List[Dict]:
+    scraper = UNComtradeScraper(session)
+    return [record for batch in scraper._iter_response_batches(scraper.BASE_URL, year=2024) for record in batch]
+
+
+class BenchmarkCase:
+    """소스 파서 벤치마크 항목"""
+
+    def __init__(self, name: str, payload: Callable[[int], bytes], content_type: str,
+                 parse: Callable[[object], List[Dict]]):
+        self.name = name
+        self.payload = payload            # 행 수 → 합성 페이로드
+        self.content_type = content_type
+        self.parse = parse                # 세션 → 레코드 목록
+
+
+CASES = [
+    BenchmarkCase('UN_Comtrade', _comtrade_json, _JSON, _comtrade),
+    BenchmarkCase('Korea_Customs', _customs_json, _JSON,
+                  lambda session: KoreaCustomsScraper(session).scrape_current_data()),
+    BenchmarkCase('Korea_Customs_HTML', _html_table, _HTML,
+                  lambda session: KoreaCustomsScraper(session).scrape_current_data()),
+    BenchmarkCase('KITA', _html_table, _HTML,
+                  lambda session: AdditionalSourcesScraper(session)._scrape_kita_data()),
+    BenchmarkCase('FAOSTAT', _faostat_json, _JSON,
+                  lambda session: AdditionalSourcesScraper(session)._scrape_faostat_data()),
+    BenchmarkCase('World_Bank', _worldbank_json, _JSON,
+                  lambda session: AdditionalSourcesScraper(session)._scrape_worldbank_data()),
+    BenchmarkCase('Trading_Economics', _html_table, _HTML,
+                  lambda session: AdditionalSourcesScraper(session)._scrape_trading_economics_data()),
+    BenchmarkCase('USDA', _usda_json, _JSON,
+                  lambda session: AdditionalSourcesScraper(session)._scrape_usda_data()),
+    BenchmarkCase('Eurostat', _eurostat_json, _JSON,
+                  lambda session: AdditionalSourcesScraper(session)._scrape_eurostat_data()),
+    BenchmarkCase('KATI', _html_table, _HTML,
+                  lambda session: PublicDataScraper(session)._scrape_kati_data()),
+    BenchmarkCase('SARS', lambda rows: _html_sections(rows, 'trade-stats'), _HTML,
+                  lambda session: PublicDataScraper(session)._scrape_sars_data()),
+    BenchmarkCase('Australian_Bureau', _html_table, _HTML,
+                  lambda session: PublicDataScraper(session)._scrape_australian_bureau_data()),
+    BenchmarkCase('NZ_Stats', _nz_json, _JSON,
+                  lambda session: PublicDataScraper(session)._scrape_nz_stats_data()),
+    BenchmarkCase('Canada_Stats', _canada_json, _JSON,
+                  lambda session: PublicDataScraper(session)._scrape_canada_stats_data()),
+    BenchmarkCase('UK_Trade', lambda rows: _html_links(rows, 'trade.csv'), _HTML,
+                  lambda session: PublicDataScraper(session)._scrape_uk_trade_data()),
+    BenchmarkCase('Japan_Customs', lambda rows: _html_links(rows, 'stat/index.htm'), _HTML,
+                  lambda session: PublicDataScraper(session)._scrape_japan_customs_data()),
+    BenchmarkCase('Singapore_Trade', lambda rows: _html_table(rows, tables=rows), _HTML,
+                  lambda session: PublicDataScraper(session)._scrape_singapore_trade_data()),
+    BenchmarkCase('ITC_TradeMap', _html_table, _HTML,
+                  lambda session: HistoricalDataScraper(session)._scrape_itc_data(2023)),
+    BenchmarkCase('Trade_Data_Online', _trade_online_json, _JSON,
+                  lambda session: HistoricalDataScraper(session)._scrape_trade_data_online(2023)),
+    BenchmarkCase('Global_Trade_Atlas', lambda rows: _html_sections(rows, 'trade-data'), _HTML,
+                  lambda session: HistoricalDataScraper(session)._scrape_global_trade_atlas(2023))
+]
+
+
+def measure(parse: Callable[[], List[Dict]], rows: int, repeat: int = 3) -> Dict:
+    """파서 실행 시간(최솟값), 할당 블록 수, 최대 메모리 측정"""
+    timings = []
+    records = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        records = parse()
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+
+    # 메모리 측정은 추적 오버헤드가 있어 시간 측정과 분리
+    records = None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        records = parse()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    allocations = sum(stat.count_diff for stat in after.compare_to(before, 'lineno') if stat.count_diff > 0)
+
+    return {
+        'rows': rows,
+        'records': len(records or []),
+        'seconds': round(best, 6),
+        'rows_per_sec': round(rows / best, 1) if best else 0.0,
+        'records_per_sec': round(len(records or []) / best, 1) if best else 0.0,
+        'allocations': allocations,
+        'peak_kb': round(peak / 1024, 1)
+    }
+
+
+def run_synthetic(cases: List[BenchmarkCase], sizes: List[int], repeat: int) -> Dict[str, Dict[str, Dict]]:
+    """합성 페이로드 크기별 벤치마크"""
+    results = {}
+    for case in cases:
+        results[case.name] = {}
+        for rows in sizes:
+            session = PayloadSession(case.payload(rows), case.content_type)
+            results[case.name][str(rows)] = measure(lambda: case.parse(session), rows, repeat)
+            logger.debug(f"{case.name} {rows}행: {results[case.name][str(rows)]}")
+    return results
+
+
+def run_recorded(cases: List[BenchmarkCase], store_path: str, repeat: int) -> Dict[str, Dict[str, Dict]]:
+    """기록된 픽스처를 재생하며 벤치마크 (행 수 대신 레코드 수 기준)"""
+    from benchmarks.http_replay import FixtureStore, replaying
+
+    results = {}
+    session = requests.Session()
+    with replaying(session, FixtureStore(store_path), compress=False):
+        for case in cases:
+            result = measure(lambda: case.parse(session), 0, repeat)
+            result['rows_per_sec'] = result['records_per_sec']
+            results[case.name] = {'recorded': result}
+    return results
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """기준값 대비 처리량 저하/메모리 증가가 threshold를 넘는 항목"""
+    regressions = []
+    for name, sizes in results.items():
+        for size, current in sizes.items():
+            base = baseline.get(name, {}).get(size)
+            if not base:
+                continue
+            if base['rows_per_sec'] and current['rows_per_sec'] < base['rows_per_sec'] * (1 - threshold):
+                regressions.append(f"{name}[{size}] 처리량 {base['rows_per_sec']:,.0f} → {current['rows_per_sec']:,.0f} 행/초")
+            if base['peak_kb'] and current['peak_kb'] > base['peak_kb'] * (1 + threshold):
+                regressions.append(f"{name}[{size}] 최대 메모리 {base['peak_kb']:,.0f} → {current['peak_kb']:,.0f} KB")
+    return regressions
+
+
+def print_table(results: Dict):
+    print(f"{'source':<20} {'size':>9} {'records':>8} {'rows/s':>12} {'allocs':>9} {'peak KB':>10}")
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            print(f"{name:<20} {size:>9} {result['records']:>8} {result['rows_per_sec']:>12,.0f} "
+                  f"{result['allocations']:>9} {result['peak_kb']:>10,.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='스크래퍼 파서 처리량 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='합성 페이로드 행 수')
+    parser.add_argument('--sources', nargs='+', help='측정할 소스 이름 (기본: 전체)')
+    parser.add_argument('--repeat', type=int, default=3, help='시간 측정 반복 횟수')
+    parser.add_argument('--fixtures', help='기록된 픽스처 경로 (지정 시 합성 대신 재생)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='기준값 JSON 경로')
+    parser.add_argument('--save-baseline', action='store_true', help='이번 결과를 기준값으로 저장')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='허용 성능 저하 비율')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args(argv)
+
+    # 파서 내부 로그는 측정에 영향을 주므로 경고 이상만 출력
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    logging.getLogger().setLevel(logging.WARNING)
+
+    cases = [case for case in CASES if not args.sources or case.name in args.sources]
+    if args.fixtures:
+        results = run_recorded(cases, args.fixtures, args.repeat)
+    else:
+        results = run_synthetic(cases, args.sizes, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_table(results)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n성능 저하 {len(regressions)}건 (허용 {args.threshold:.0%}):")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\n기준값 대비 성능 저하 없음 (허용 {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
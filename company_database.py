@@ -1,16 +1,93 @@
 """
 수출업체와 수입업체의 상세 정보 데이터베이스
 실제 공개 정보를 기반으로 한 회사 정보
+프로세스당 한 번만 만들어 읽기 전용(MappingProxyType/tuple)으로 고정하고 공유함 - get_company_database()
 """
 
 import random
-from typing import Dict, List
-from datetime import datetime, timedelta
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Dict, Tuple
+
+from hs_index import normalize_hs_code
+
+# 회사 항목에 hs_codes가 없을 때의 취급 품목 (마카다미아 너트 - Config.MACADAMIA_HS_CODES와 동일)
+DEFAULT_HS_SPECIALTIES = ('080250', '080251')
+
+# 원산지 국가별 주요 수출 대상국
+EXPORT_DESTINATIONS = MappingProxyType({
+    'Australia': ('China', 'Japan', 'South Korea', 'Germany', 'USA'),
+    'South Africa': ('Germany', 'China', 'USA', 'Netherlands'),
+    'Kenya': ('Germany', 'USA', 'Netherlands', 'UK')
+})
+DEFAULT_EXPORT_DESTINATIONS = ('China', 'Germany', 'USA')
+
+_EMPTY = MappingProxyType({})
+
+
+def freeze(value):
+    """dict/list를 읽기 전용 MappingProxyType/tuple로 재귀 변환"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """freeze의 역변환 (수정/직렬화가 필요한 호출자용 복사본)"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def json_default(value):
+    """json.dumps default - 고정된 회사 정보를 일반 dict로, 나머지는 문자열로"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
 
 class CompanyDatabase:
+    """국가/회사명/HS 품목/수출 대상국 색인을 갖춘 읽기 전용 회사 정보
+
+    조회 결과는 모든 호출자가 공유하는 읽기 전용 객체이므로 수정하려면 thaw()로 복사.
+    직접 생성하지 말고 get_company_database()로 프로세스 공용 인스턴스를 사용.
+    """
+    
     def __init__(self):
-        self.exporters = self._load_exporter_database()
-        self.importers = self._load_importer_database()
+        self.exporters = self._freeze_by_country(self._load_exporter_database())
+        self.importers = self._freeze_by_country(self._load_importer_database())
+        self._build_indexes()
+    
+    @staticmethod
+    def _freeze_by_country(database: Dict) -> Mapping:
+        return MappingProxyType({country: freeze(companies) for country, companies in database.items()})
+    
+    def _build_indexes(self):
+        """회사명/HS 품목/수출 대상국 색인 생성 (생성 시 한 번)"""
+        by_name = {}
+        by_hs_code = {}
+        by_destination = {}
+        for country, companies in self.exporters.items():
+            for company in companies:
+                by_name.setdefault(company['company_name'].casefold(), company)
+                for hs_code in company.get('hs_codes', DEFAULT_HS_SPECIALTIES):
+                    by_hs_code.setdefault(hs_code, []).append(company)
+                for destination in company.get('export_markets', ()):
+                    by_destination.setdefault(destination, []).append(company)
+        for country, companies in self.importers.items():
+            for company in companies:
+                by_name.setdefault(company['company_name'].casefold(), company)
+        
+        self.companies_by_name = MappingProxyType(by_name)
+        self.exporters_by_hs_code = MappingProxyType({code: tuple(found) for code, found in by_hs_code.items()})
+        self.exporters_by_destination = MappingProxyType({country: tuple(found) for country, found in by_destination.items()})
+        self._importer_fallbacks = {}
+        self._fallback_lock = threading.Lock()
     
     def _load_exporter_database(self) -> Dict:
         """실제 마카다미아 수출업체 데이터베이스"""
@@ -308,32 +385,71 @@ class CompanyDatabase:
             ]
         }
     
-    def get_exporter(self, country: str) -> Dict:
-        """특정 국가의 수출업체 정보 반환"""
-        exporters = self.exporters.get(country, [])
-        return random.choice(exporters) if exporters else {}
+    def get_exporter(self, country: str, rng=random) -> Mapping:
+        """특정 국가의 수출업체 정보 반환 (rng: 시드 고정 생성기)"""
+        exporters = self.exporters.get(country, ())
+        return rng.choice(exporters) if exporters else _EMPTY
     
-    def get_importer(self, country: str) -> Dict:
-        """특정 국가의 수입업체 정보 반환"""
-        importers = self.importers.get(country, [])
+    def get_importer(self, country: str, rng=random) -> Mapping:
+        """특정 국가의 수입업체 정보 반환 (rng: 시드 고정 생성기)"""
+        importers = self.importers.get(country, ())
         if importers:
-            return random.choice(importers)
-        else:
-            # 기본 수입업체 정보
-            return {
-                'company_name': f'{country} Import Company Ltd',
-                'ceo_name': 'Unknown',
-                'address': f'{country} Trade Center',
-                'import_license': f'{country}-IMP-001',
-                'phone': 'N/A',
-                'email': 'N/A'
-            }
+            return rng.choice(importers)
+        return self._importer_fallback(country)
     
-    def get_export_destinations(self, origin_country: str) -> List[str]:
+    def _importer_fallback(self, country: str) -> Mapping:
+        """등록되지 않은 국가의 기본 수입업체 정보 (국가별로 한 번만 생성)"""
+        fallback = self._importer_fallbacks.get(country)
+        if fallback is None:
+            with self._fallback_lock:
+                fallback = self._importer_fallbacks.setdefault(country, freeze({
+                    'company_name': f'{country} Import Company Ltd',
+                    'ceo_name': 'Unknown',
+                    'address': f'{country} Trade Center',
+                    'import_license': f'{country}-IMP-001',
+                    'phone': 'N/A',
+                    'email': 'N/A'
+                }))
+        return fallback
+    
+    def get_export_destinations(self, origin_country: str) -> Tuple[str, ...]:
         """원산지 국가별 주요 수출 대상국"""
-        destinations = {
-            'Australia': ['China', 'Japan', 'South Korea', 'Germany', 'USA'],
-            'South Africa': ['Germany', 'China', 'USA', 'Netherlands'],
-            'Kenya': ['Germany', 'USA', 'Netherlands', 'UK']
-        }
-        return destinations.get(origin_country, ['China', 'Germany', 'USA'])
+        return EXPORT_DESTINATIONS.get(origin_country, DEFAULT_EXPORT_DESTINATIONS)
+    
+    def find_company(self, company_name: str) -> Mapping:
+        """회사명(대소문자 무시)으로 수출/수입업체 조회 (없으면 None)"""
+        name = (company_name or '').strip().casefold()
+        return self.companies_by_name.get(name) if name else None
+    
+    def exporters_for_product(self, product_code: str) -> Tuple[Mapping, ...]:
+        """HS 코드 취급 수출업체 (상위 코드 0802, 하위 코드 08025010 모두 허용)"""
+        # 빈 코드는 모든 특산 코드의 접두어가 되므로 조회하지 않음
+        code = normalize_hs_code(product_code)
+        if not code:
+            return ()
+        if code in self.exporters_by_hs_code:
+            return self.exporters_by_hs_code[code]
+        found = {}
+        for specialty, companies in self.exporters_by_hs_code.items():
+            if specialty.startswith(code) or code.startswith(specialty):
+                for company in companies:
+                    found.setdefault(id(company), company)
+        return tuple(found.values())
+    
+    def exporters_to(self, destination_country: str) -> Tuple[Mapping, ...]:
+        """해당 국가를 주요 수출 시장으로 둔 수출업체"""
+        return self.exporters_by_destination.get((destination_country or '').strip(), ())
+
+
+_company_database = None
+_company_database_lock = threading.Lock()
+
+
+def get_company_database() -> CompanyDatabase:
+    """프로세스 공용 회사 정보 (최초 사용 시 한 번 생성)"""
+    global _company_database
+    if _company_database is None:
+        with _company_database_lock:
+            if _company_database is None:
+                _company_database = CompanyDatabase()
+    return _company_database
@@ -3,6 +3,9 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# 프로젝트 디렉터리 (상대 경로 설정은 실행 위치와 관계없이 여기를 기준으로 해석)
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
 class Config:
     # API Keys
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
@@ -31,6 +34,27 @@ class Config:
     # 업데이트 스케줄
     UPDATE_SCHEDULE = "09:00"  # 매일 오전 9시
     
+    # 수집 예산 (초) - gunicorn --timeout 120 안에 응답하도록 여유를 둠, 0이면 제한 없음
+    COLLECTION_BUDGET_SECONDS = float(os.getenv('COLLECTION_BUDGET_SECONDS', '90'))
+    HISTORICAL_COLLECTION_BUDGET_SECONDS = float(os.getenv('HISTORICAL_COLLECTION_BUDGET_SECONDS', '0'))
+    
+    # 상세 정보 생성 모드 (eager: 저장, lazy: 시드만 저장 후 조회 시 생성, off: 생성 안 함)
+    ENRICHMENT_MODE = os.getenv('ENRICHMENT_MODE', 'eager')
+    
+    # 상세 정보/표준화 작업 프로세스 수 (0이면 파이프라인 스레드에서 처리, 기본은 수집 프로세스용 CPU 하나를 남김)
+    # 및 단계 사이 대기 배치 수
+    ENRICHMENT_WORKERS = int(os.getenv('ENRICHMENT_WORKERS', str(max(0, min(2, (os.cpu_count() or 1) - 1)))))
+    PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '4'))
+    
+    # 중복 사전 필터 (블룸 필터) 저장 경로 - gunicorn/스케줄러/CLI가 같은 파일을 쓰도록 프로젝트 data 디렉터리 기준
+    DEDUPE_FILTER_PATH = os.path.join(
+        PROJECT_DIR, 'data', os.getenv('DEDUPE_FILTER_PATH', 'trade_fingerprints.bloom')
+    )
+    
+    # 제품/HS 코드 참조 데이터 응답 캐시 (Cache-Control max-age 초) 및 검색 응답 캐시 크기
+    REFERENCE_CACHE_MAX_AGE = int(os.getenv('REFERENCE_CACHE_MAX_AGE', '86400'))
+    SEARCH_CACHE_SIZE = int(os.getenv('SEARCH_CACHE_SIZE', '1024'))
+    
     # 공개 URL (ngrok 또는 배포된 서버 URL)
     PUBLIC_URL = os.getenv('PUBLIC_URL', 'http://localhost:5002')
     
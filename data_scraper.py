@@ -1,11 +1,8 @@
-import requests
 from typing import List, Dict
-import time
 import logging
 import os
-from datetime import datetime
 from config import Config
-from models import DatabaseManager, TradeRecord
+from models import DatabaseManager
 from telegram_notifier import send_new_data_alert, send_system_alert
 from trade_detail_generator import TradeDetailGenerator
 
@@ -15,6 +12,15 @@ from scrapers.korea_customs_scraper import KoreaCustomsScraper
 from scrapers.additional_sources_scraper import AdditionalSourcesScraper
 from scrapers.public_data_scraper import PublicDataScraper
 from scrapers.historical_data_scraper import HistoricalDataScraper
+from scrapers.source_registry import SourceRegistry, SourceOrchestrator
+from scrapers.http_client import get_http_session
+from scrapers.resilience import get_circuit_breakers
+from pipeline.normalizer import TradeRecordNormalizer
+from pipeline.bulk_ingest import BulkTradeFileIngester, DEFAULT_CHUNK_SIZE
+from pipeline.dedupe import DuplicateFilter
+from pipeline.diff import SnapshotDiffEngine, TradeDelta
+from pipeline.enrichment import EnrichmentStage
+from pipeline.workers import EnrichmentWorkers, StagedPipeline
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,19 +31,17 @@ class MacadamiaTradeDataScraper:
     def __init__(self):
         self.config = Config()
         self.db = DatabaseManager(self.config.DATABASE_URL)
-        self.session = requests.Session()
+        
+        # 프로세스 전체 공유 세션 (호스트별 연결 풀, keep-alive 재사용)
+        self.session = get_http_session()
         
         # Railway 환경 감지
         self.is_railway = os.getenv('RAILWAY_ENVIRONMENT') is not None
         if self.is_railway:
             logger.info("Railway 환경에서 실행 중")
         
-        # 세션 설정
-        self.session.headers.update({
-            'User-Agent': 'MacadamiaTradeBot/1.0 (Railway Cloud Environment)' if self.is_railway else 'MacadamiaTradeBot/1.0',
-            'Accept': 'application/json',
-            'Accept-Language': 'en-US,en;q=0.9'
-        })
+        # 상세 정보 생성기
+        self.detail_generator = TradeDetailGenerator()
         
         # 모듈화된 스크래퍼들 초기화
         self.un_comtrade_scraper = UNComtradeScraper(self.session)
@@ -46,8 +50,29 @@ class MacadamiaTradeDataScraper:
         self.public_data_scraper = PublicDataScraper(self.session)
         self.historical_data_scraper = HistoricalDataScraper(self.session)
         
-        # 상세 정보 생성기
-        self.detail_generator = TradeDetailGenerator()
+        # 소스 레지스트리 (소스별 호스트/호출 간격/갱신 주기 선언)
+        self.source_registry = SourceRegistry()
+        for scraper in (self.un_comtrade_scraper, self.korea_customs_scraper,
+                        self.additional_sources_scraper, self.public_data_scraper,
+                        self.historical_data_scraper):
+            self.source_registry.register_all(scraper.source_specs())
+        self.source_orchestrator = SourceOrchestrator(self.source_registry, breakers=get_circuit_breakers())
+        
+        # 상세 정보 단계 (레코드당 한 번) 및 수집 레코드 표준화 단계
+        self.enrichment = EnrichmentStage(self.detail_generator, mode=self.config.ENRICHMENT_MODE)
+        self.normalizer = TradeRecordNormalizer(enrichment=self.enrichment)
+        # 수집 중 상세 정보/표준화는 작업 프로세스에서, 저장은 별도 스레드에서 (수집과 겹쳐 실행)
+        self.enrichment_workers = EnrichmentWorkers(self.config.ENRICHMENT_WORKERS, mode=self.enrichment.mode)
+        
+        # 중복 사전 필터 (시작 시 저장된 필터를 불러오거나 테이블에서 재구성)
+        self.duplicate_filter = DuplicateFilter(self.db, path=self.config.DEDUPE_FILTER_PATH)
+        try:
+            self.duplicate_filter.load_or_rebuild()
+        except Exception as e:
+            logger.error(f"중복 필터 초기화 오류: {e}")
+        
+        # 저장 배치와 직전 집계 스냅샷의 차이 계산 (신규 경로/금액 변화/수정 기간)
+        self.diff_engine = SnapshotDiffEngine(self.db)
         
     def scrape_un_comtrade_data(self) -> List[Dict]:
         """UN Comtrade API에서 마카다미아 무역 데이터 수집 (실제 데이터)"""
@@ -81,10 +106,14 @@ class MacadamiaTradeDataScraper:
         """특정 연도별 UN Comtrade 데이터 수집"""
         return self.un_comtrade_scraper.scrape_yearly_data(years)
     
-    def collect_all_real_data(self) -> Dict:
-        """모든 실제 데이터 소스에서 데이터 수집 (시뮬레이션 없음)"""
+    def collect_all_real_data(self, budget: float = None) -> Dict:
+        """모든 실제 데이터 소스에서 데이터 수집 (시뮬레이션 없음)
+        
+        budget(초) 안에 끝난 소스는 바로 저장하고, 끝나지 않은 소스는 다음 실행으로 미룸
+        """
         logger.info("=== 실제 데이터 수집 시작 ===")
-        all_trade_data = []
+        if budget is None:
+            budget = self.config.COLLECTION_BUDGET_SECONDS
         collection_stats = {
             'total_collected': 0,
             'sources_used': [],
@@ -92,70 +121,12 @@ class MacadamiaTradeDataScraper:
         }
         
         try:
-            # 각 실제 데이터 소스별로 수집
-            data_sources = [
-                ('UN_Comtrade', self.scrape_un_comtrade_data),
-                ('Korea_Customs', self.scrape_korea_customs_data),
-                ('Additional_Sources', self.scrape_additional_real_sources),
-                ('Public_Trade_Data', self.scrape_public_trade_data)
-            ]
-            
-            for source_name, scraper_func in data_sources:
-                try:
-                    logger.info(f"{source_name} 데이터 수집 시작...")
-                    source_data = scraper_func()
-                    
-                    if source_data:
-                        # 상세 정보 추가
-                        enhanced_data = []
-                        for record in source_data:
-                            enhanced_record = self.detail_generator.enhance_trade_record(record)
-                            enhanced_data.append(enhanced_record)
-                        
-                        all_trade_data.extend(enhanced_data)
-                        collection_stats['sources_used'].append(source_name)
-                        logger.info(f"{source_name}에서 {len(source_data)}건 수집")
-                    else:
-                        logger.warning(f"{source_name}에서 데이터 없음")
-                        
-                    time.sleep(2)  # 소스간 간격
-                    
-                except Exception as e:
-                    error_msg = f"{source_name} 수집 오류: {e}"
-                    logger.error(error_msg)
-                    collection_stats['errors'].append(error_msg)
-                    continue
+            # 갱신이 필요한 실제 데이터 소스를 병렬로 수집 (소스별 완료 즉시 저장)
+            collected, saved_count = self._collect_group('current', budget, collection_stats)
+            collection_stats['total_collected'] = collected
             
-            collection_stats['total_collected'] = len(all_trade_data)
-            
-            # 데이터베이스에 저장
-            if all_trade_data:
-                saved_count = 0
-                for trade_record in all_trade_data:
-                    try:
-                        # TradeRecord 객체 생성
-                        record = TradeRecord(
-                            product_code=trade_record.get('product_code', ''),
-                            product_description=trade_record.get('product_description', ''),
-                            country_origin=trade_record.get('country_origin', ''),
-                            country_destination=trade_record.get('country_destination', ''),
-                            trade_value=float(trade_record.get('trade_value', 0)),
-                            quantity=float(trade_record.get('quantity', 0)),
-                            trade_type=trade_record.get('trade_type', ''),
-                            period=trade_record.get('period', ''),
-                            year=int(trade_record.get('year', datetime.now().year)),
-                            source=trade_record.get('source', ''),
-                            detailed_info=trade_record.get('detailed_info', {})
-                        )
-                        
-                        # 데이터베이스에 저장
-                        record_id = self.db.save_trade_record(record)
-                        if record_id:
-                            saved_count += 1
-                            
-                    except Exception as e:
-                        logger.error(f"데이터 저장 오류: {e}")
-                        continue
+            if collected:
+                collection_stats['saved'] = saved_count
                 
                 logger.info(f"총 {saved_count}건 데이터베이스에 저장 완료")
                 
@@ -163,7 +134,9 @@ class MacadamiaTradeDataScraper:
                 if saved_count > 0:
                     try:
                         # Note: 비동기 함수는 별도 처리 필요
-                        logger.info(f"새 데이터 알림: {saved_count}건 수집됨, 소스: {collection_stats['sources_used']}")
+                        delta = collection_stats['delta']
+                        logger.info(f"새 데이터 알림: {saved_count}건 수집됨, 신규 경로 {len(delta['new_routes'])}개, "
+                                    f"금액 변화 {len(delta['value_changes'])}건, 소스: {collection_stats['sources_used']}")
                     except Exception as e:
                         logger.error(f"알림 처리 오류: {e}")
             else:
@@ -183,10 +156,11 @@ class MacadamiaTradeDataScraper:
         logger.info("=== 실제 데이터 수집 완료 ===")
         return collection_stats
     
-    def collect_historical_data(self) -> Dict:
+    def collect_historical_data(self, budget: float = None) -> Dict:
         """과거 데이터 수집"""
         logger.info("=== 과거 데이터 수집 시작 ===")
-        all_historical_data = []
+        if budget is None:
+            budget = self.config.HISTORICAL_COLLECTION_BUDGET_SECONDS
         collection_stats = {
             'total_collected': 0,
             'sources_used': [],
@@ -194,67 +168,12 @@ class MacadamiaTradeDataScraper:
         }
         
         try:
-            # 각 과거 데이터 소스별로 수집
-            historical_sources = [
-                ('UN_Comtrade_Historical', self.scrape_historical_un_comtrade_data),
-                ('Korea_Customs_Historical', self.scrape_historical_korea_customs_data),
-                ('Trade_Statistics_Historical', self.scrape_historical_trade_statistics)
-            ]
+            # 갱신이 필요한 과거 데이터 소스를 병렬로 수집 (소스별 완료 즉시 저장)
+            collected, saved_count = self._collect_group('historical', budget, collection_stats)
+            collection_stats['total_collected'] = collected
             
-            for source_name, scraper_func in historical_sources:
-                try:
-                    logger.info(f"{source_name} 과거 데이터 수집 시작...")
-                    source_data = scraper_func()
-                    
-                    if source_data:
-                        # 상세 정보 추가
-                        enhanced_data = []
-                        for record in source_data:
-                            enhanced_record = self.detail_generator.enhance_trade_record(record)
-                            enhanced_data.append(enhanced_record)
-                        
-                        all_historical_data.extend(enhanced_data)
-                        collection_stats['sources_used'].append(source_name)
-                        logger.info(f"{source_name}에서 {len(source_data)}건 수집")
-                    else:
-                        logger.warning(f"{source_name}에서 과거 데이터 없음")
-                        
-                    time.sleep(3)  # 과거 데이터 수집은 더 긴 간격
-                    
-                except Exception as e:
-                    error_msg = f"{source_name} 수집 오류: {e}"
-                    logger.error(error_msg)
-                    collection_stats['errors'].append(error_msg)
-                    continue
-            
-            collection_stats['total_collected'] = len(all_historical_data)
-            
-            # 데이터베이스에 저장
-            if all_historical_data:
-                saved_count = 0
-                for trade_record in all_historical_data:
-                    try:
-                        record = TradeRecord(
-                            product_code=trade_record.get('product_code', ''),
-                            product_description=trade_record.get('product_description', ''),
-                            country_origin=trade_record.get('country_origin', ''),
-                            country_destination=trade_record.get('country_destination', ''),
-                            trade_value=float(trade_record.get('trade_value', 0)),
-                            quantity=float(trade_record.get('quantity', 0)),
-                            trade_type=trade_record.get('trade_type', ''),
-                            period=trade_record.get('period', ''),
-                            year=int(trade_record.get('year', datetime.now().year)),
-                            source=trade_record.get('source', ''),
-                            detailed_info=trade_record.get('detailed_info', {})
-                        )
-                        
-                        record_id = self.db.save_trade_record(record)
-                        if record_id:
-                            saved_count += 1
-                            
-                    except Exception as e:
-                        logger.error(f"과거 데이터 저장 오류: {e}")
-                        continue
+            if collected:
+                collection_stats['saved'] = saved_count
                 
                 logger.info(f"총 {saved_count}건 과거 데이터 저장 완료")
             else:
@@ -268,6 +187,121 @@ class MacadamiaTradeDataScraper:
         logger.info("=== 과거 데이터 수집 완료 ===")
         return collection_stats
     
+    def collect_daily_update(self) -> Dict:
+        """일일 작업용 수집 - 현재/과거 소스를 모두 확인하고 하나의 델타로 변경 사항을 반환"""
+        logger.info("=== 일일 데이터 수집 시작 ===")
+        delta = TradeDelta()
+        result = {
+            'success': True,
+            'total_checked': 0,
+            'saved': 0,
+            'sources_used': [],
+            'errors': []
+        }
+        
+        try:
+            for group, budget in (('current', self.config.COLLECTION_BUDGET_SECONDS),
+                                  ('historical', self.config.HISTORICAL_COLLECTION_BUDGET_SECONDS)):
+                group_stats = {'errors': []}
+                collected, saved_count = self._collect_group(group, budget, group_stats, delta)
+                result['total_checked'] += collected
+                result['saved'] += saved_count
+                result['sources_used'].extend(group_stats['sources_used'])
+                result['errors'].extend(group_stats['errors'])
+        except Exception as e:
+            error_msg = f"일일 데이터 수집 중 오류: {e}"
+            logger.error(error_msg)
+            result['success'] = False
+            result['error'] = error_msg
+        
+        result['new_found'] = result['saved']
+        result['delta'] = delta.to_dict()
+        logger.info("=== 일일 데이터 수집 완료 ===")
+        return result
+    
+    def _collect_group(self, group: str, budget: float, collection_stats: Dict, delta: TradeDelta = None):
+        """소스 그룹 수집 - 예산 안에 끝난 소스는 완료 즉시 상세 정보/저장 단계로 넘김
+        
+        상세 정보/표준화와 저장은 수집 루프와 겹쳐 실행되며, 반환 전에 넘긴 배치를 모두 저장함.
+        
+        Returns:
+            (수집 건수, 저장 건수)
+        """
+        totals = {'collected': 0}
+        delta = delta if delta is not None else TradeDelta()
+        pipeline = StagedPipeline(self.enrichment_workers, lambda batch: self._persist_batch(batch, delta),
+                                  queue_size=self.config.PIPELINE_QUEUE_SIZE, release=self.db.release_session)
+        
+        def commit_source(source_name: str, source_data: List[Dict]):
+            # 소스 단위로, 스트리밍 소스는 배치마다 넘김 (예산을 넘긴 소스가 있어도 넘긴 분은 보존)
+            totals['collected'] += len(source_data)
+            pipeline.submit(source_data)
+        
+        with pipeline:
+            result = self.source_orchestrator.run(group, on_result=commit_source, budget=budget or None)
+        collection_stats['sources_used'] = result['sources_used']
+        collection_stats['sources_skipped'] = result['sources_skipped']
+        collection_stats['sources_short_circuited'] = result['sources_short_circuited']
+        collection_stats['sources_still_running'] = result['sources_still_running']
+        collection_stats['sources_deferred'] = result['sources_deferred']
+        collection_stats['errors'].extend(result['errors'])
+        collection_stats['timings'] = result['timings']
+        collection_stats['budget'] = result['budget']
+        collection_stats['pipeline'] = pipeline.stats
+        collection_stats['errors'].extend(pipeline.stats['errors'])
+        collection_stats['dedupe'] = self.duplicate_filter.snapshot()
+        collection_stats['delta'] = delta.to_dict()
+        return totals['collected'], pipeline.stats['saved']
+    
+    def save_to_database(self, trade_data: List[Dict], delta: TradeDelta = None) -> int:
+        """수집된 레코드를 표준화(지문 기반 상세 정보 포함) 단계를 거쳐 대량 저장 (이미 저장된 행은 제외)
+        
+        delta를 넘기면 저장한 행의 집계 스냅샷 대비 변경 사항을 합침.
+        """
+        try:
+            batch = self.normalizer.normalize(trade_data)
+        except Exception as e:
+            logger.error(f"데이터 표준화 오류: {e}")
+            return 0
+        return self._persist_batch(batch, delta)
+    
+    def _persist_batch(self, batch, delta: TradeDelta = None) -> int:
+        """표준화된 배치에서 이미 저장된 행을 제외하고 저장한 뒤 스냅샷 델타 반영"""
+        try:
+            batch = self.duplicate_filter.filter_batch(batch)
+            saved = self.db.save_trade_batch(batch)
+            self.duplicate_filter.add_batch(batch)
+        except Exception as e:
+            logger.error(f"데이터 저장 오류: {e}")
+            return 0
+        
+        try:
+            changes = self.diff_engine.apply(batch)
+            if delta is not None:
+                delta.merge(changes)
+        except Exception as e:
+            logger.error(f"스냅샷 델타 계산 오류: {e}")
+        return saved
+    
+    def ingest_bulk_file(self, path: str, hs_codes: List[str] = None, source: str = 'UN_Comtrade_Bulk',
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+        """로컬 벌크 파일(Comtrade CSV/ZIP 덤프 등)에서 대상 HS 코드 행만 대량 적재
+        
+        API 조회 대신 과거 데이터를 한 번에 채울 때 사용
+        """
+        logger.info(f"=== 벌크 파일 적재 시작: {path} ===")
+        ingester = BulkTradeFileIngester(
+            self.db, hs_codes or self.config.MACADAMIA_HS_CODES, source=source, chunk_size=chunk_size,
+            duplicate_filter=self.duplicate_filter, diff_engine=self.diff_engine
+        )
+        try:
+            return ingester.ingest(path)
+        except Exception as e:
+            error_msg = f"벌크 파일 적재 오류: {e}"
+            logger.error(error_msg)
+            return {'files': [], 'rows_read': 0, 'rows_matched': 0, 'rows_saved': 0, 'rows_duplicate': 0,
+                    'delta': TradeDelta().to_dict(), 'errors': [error_msg]}
+    
     def collect_simulation_data_for_testing(self) -> Dict:
         """테스트용 시뮬레이션 데이터 생성 (개발/테스트 전용)"""
         logger.info("=== 테스트용 시뮬레이션 데이터 생성 ===")
@@ -280,10 +314,9 @@ class MacadamiaTradeDataScraper:
         return self.detail_generator.generate_test_simulation_data()
     
     def close(self):
-        """리소스 정리"""
+        """리소스 정리 (공유 HTTP 세션은 다른 수집기와 함께 쓰므로 유지)"""
         try:
-            if self.session:
-                self.session.close()
+            self.enrichment_workers.shutdown()
             if self.db:
                 self.db.close()
         except Exception as e:
@@ -0,0 +1,188 @@
+"""
+HS 코드 계층 색인
+080250 / 0802.50 / '80250' 같은 표기를 숫자만의 표준형으로 통일하고,
+류(2자리) → 호(4자리) → 소호(6자리) → 세번(8/10자리) 계층을 정렬 배열로 두어
+이진 탐색으로 접두어/범위 조회와 상위/하위 코드 탐색을 함
+"""
+from bisect import bisect_left
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 코드 자릿수 → 계층 이름
+LEVELS = {2: 'chapter', 4: 'heading', 6: 'subheading', 8: 'tariff_line', 10: 'tariff_line'}
+_LEVEL_LENGTHS = (2, 4, 6, 8, 10)
+
+# 숫자 코드 뒤에 오는 정렬 상한 문자 (':'는 '9' 다음 문자)
+_UPPER = ':'
+
+# 수집 품목이 속한 류 제목
+HS_CHAPTERS = {
+    '02': '육류 및 식용 설육',
+    '03': '어류·갑각류·연체동물',
+    '08': '식용 과실과 견과류',
+    '09': '커피·차·향신료',
+    '10': '곡물'
+}
+
+
+def normalize_hs_code(code) -> str:
+    """HS 코드 표준형 (숫자만, 짝수 자릿수, 최대 10자리) - HS 코드가 아니면 (10자리 초과 포함) 빈 문자열
+
+    점 표기는 앞부분을 호(4자리)로 맞추고 뒷부분을 짝수 자리로 채움 ('802.9' → '080290'),
+    점 없는 홀수 자릿수는 숫자로 저장되며 빠진 앞자리 0을 복원 ('80250' → '080250').
+    """
+    text = str(code or '').strip().upper()
+    if text.startswith('HS'):
+        text = text[2:].strip()
+    text = text.replace(' ', '').replace('-', '')
+    if '.' in text:
+        head, _, rest = text.partition('.')
+        rest = rest.replace('.', '')
+        if not head.isdigit() or (rest and not rest.isdigit()) or len(head) > 4:
+            return ''
+        head = head.zfill(4) if len(head) > 2 else head.zfill(2)
+        if len(rest) % 2:
+            rest += '0'
+        text = head + rest
+    elif not text.isdigit():
+        return ''
+    elif len(text) % 2:
+        text = '0' + text
+    # 세번(10자리)보다 긴 숫자열은 HS 코드가 아님
+    return text if len(text) <= 10 else ''
+
+
+def hs_level(code: str) -> Optional[str]:
+    """표준형 코드의 계층 이름"""
+    return LEVELS.get(len(code))
+
+
+def hs_ancestors(code: str) -> List[str]:
+    """상위 코드 목록 (류부터 바로 위 계층까지)"""
+    return [code[:length] for length in _LEVEL_LENGTHS if length < len(code)]
+
+
+def hs_group(code, level: str = 'heading') -> str:
+    """같은 류/호/소호끼리 묶기 위한 그룹 키 (수집 데이터 집계용)"""
+    length = {'chapter': 2, 'heading': 4, 'subheading': 6}[level]
+    return normalize_hs_code(code)[:length]
+
+
+class HSCodeIndex:
+    """정렬된 코드 배열 기반 HS 코드 색인
+
+    codes는 표준형 코드의 정렬 튜플, entries는 같은 위치의 읽기 전용 항목.
+    목록에 없는 상위 계층(류/호)은 하위 코드에서 만들어 채우므로 어느 코드에서든 상위로 이동 가능.
+    """
+
+    def __init__(self, entries: Dict[str, Dict]):
+        merged = {}
+        for raw_code, entry in entries.items():
+            code = normalize_hs_code(raw_code)
+            if not code:
+                continue
+            merged.setdefault(code, {}).update(entry)
+            for ancestor in hs_ancestors(code):
+                merged.setdefault(ancestor, {})
+        for code, entry in merged.items():
+            entry['code'] = code
+            entry['level'] = hs_level(code)
+            if len(code) == 2 and not entry.get('description'):
+                entry['description'] = HS_CHAPTERS.get(code)
+
+        self.codes = tuple(sorted(merged))
+        self.entries = tuple(MappingProxyType(merged[code]) for code in self.codes)
+        self._positions = {code: position for position, code in enumerate(self.codes)}
+        children = {}
+        for code in self.codes:
+            parent = self._nearest_parent(code)
+            if parent:
+                children.setdefault(parent, []).append(code)
+        self._children = {code: tuple(found) for code, found in children.items()}
+        logger.debug(f"HS 코드 색인: {len(self.codes)}개 코드")
+
+    def _nearest_parent(self, code: str) -> Optional[str]:
+        for ancestor in reversed(hs_ancestors(code)):
+            if ancestor in self._positions:
+                return ancestor
+        return None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code) -> bool:
+        return normalize_hs_code(code) in self._positions
+
+    def get(self, code) -> Optional[MappingProxyType]:
+        """코드 항목 (표기 무관, 없으면 None)"""
+        position = self._positions.get(normalize_hs_code(code))
+        return self.entries[position] if position is not None else None
+
+    def prefix(self, prefix) -> Tuple[MappingProxyType, ...]:
+        """접두어로 시작하는 모든 코드 항목 (예: '08' → 8류 전체, '0802' → 0802호 전체)"""
+        prefix = normalize_hs_code(prefix)
+        if not prefix:
+            return ()
+        start = bisect_left(self.codes, prefix)
+        end = bisect_left(self.codes, prefix + _UPPER, start)
+        return self.entries[start:end]
+
+    def range(self, start, end) -> Tuple[MappingProxyType, ...]:
+        """start 이상, end 접두어까지의 코드 항목 (예: range('0801', '0803') → 0801~0803호 전체)"""
+        start, end = normalize_hs_code(start), normalize_hs_code(end)
+        if not start or not end:
+            return ()
+        lower = bisect_left(self.codes, start)
+        upper = bisect_left(self.codes, end + _UPPER, lower)
+        return self.entries[lower:upper]
+
+    def parent(self, code) -> Optional[MappingProxyType]:
+        """바로 위 계층 항목"""
+        parent = self._nearest_parent(normalize_hs_code(code))
+        return self.entries[self._positions[parent]] if parent else None
+
+    def children(self, code) -> Tuple[MappingProxyType, ...]:
+        """바로 아래 계층 항목"""
+        return tuple(self.entries[self._positions[child]]
+                     for child in self._children.get(normalize_hs_code(code), ()))
+
+    def ancestors(self, code) -> List[MappingProxyType]:
+        """류부터 바로 위 계층까지의 항목"""
+        return [self.entries[self._positions[ancestor]]
+                for ancestor in hs_ancestors(normalize_hs_code(code)) if ancestor in self._positions]
+
+
+def _catalog_entries() -> Dict[str, Dict]:
+    """제품 데이터베이스의 HS 코드/설명/관세 정보를 코드별 항목으로"""
+    from product_database import PRODUCT_HS_MAPPING, HS_CODE_INFO
+    entries = {}
+    for key, product in PRODUCT_HS_MAPPING.items():
+        for code in product['codes']:
+            entry = entries.setdefault(normalize_hs_code(code['code']), {})
+            entry.setdefault('description', code['description'])
+            entry.setdefault('products', []).append(key)
+    for code, info in HS_CODE_INFO.items():
+        entries.setdefault(normalize_hs_code(code), {})['info'] = info
+    for entry in entries.values():
+        if 'products' in entry:
+            entry['products'] = tuple(entry['products'])
+    return entries
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_hs_index() -> HSCodeIndex:
+    """프로세스 전체에서 공유하는 HS 코드 색인 (최초 사용 시 생성)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = HSCodeIndex(_catalog_entries())
+    return _index
+
@@ -12,10 +12,16 @@ from data_scraper import MacadamiaTradeDataScraper
 
 def main():
     parser = argparse.ArgumentParser(description='마카다미아 무역 데이터 AI 에이전트')
-    parser.add_argument('--mode', choices=['schedule', 'analyze', 'collect'], 
+    parser.add_argument('--mode', choices=['schedule', 'analyze', 'collect', 'ingest'], 
                        default='schedule', help='실행 모드 선택')
     parser.add_argument('--days', type=int, default=7, 
                        help='분석할 일수 (analyze 모드에서만 사용)')
+    parser.add_argument('--file', action='append', default=[],
+                       help='적재할 벌크 파일 경로 (ingest 모드, CSV/ZIP/GZ, 여러 번 지정 가능)')
+    parser.add_argument('--hs-codes', default=None,
+                       help='적재할 HS 코드 접두어 (쉼표 구분, 기본값: 설정의 마카다미아 HS 코드)')
+    parser.add_argument('--chunk-size', type=int, default=50000,
+                       help='한 번에 처리할 행 수 (ingest 모드)')
     
     args = parser.parse_args()
     
@@ -35,6 +41,20 @@ def main():
         scraper.save_to_database(trade_data)
         logger.info(f"데이터 수집 완료: {len(trade_data)}건")
         
+    elif args.mode == 'ingest':
+        # 벌크 파일 적재 (과거 데이터 일괄 수집)
+        if not args.file:
+            parser.error('ingest 모드에는 --file이 필요합니다')
+        hs_codes = [code.strip() for code in args.hs_codes.split(',')] if args.hs_codes else None
+        scraper = MacadamiaTradeDataScraper()
+        try:
+            for path in args.file:
+                stats = scraper.ingest_bulk_file(path, hs_codes=hs_codes, chunk_size=args.chunk_size)
+                logger.info(f"{path}: {stats['rows_read']}행 중 {stats['rows_saved']}건 적재, "
+                            f"신규 경로 {len(stats['delta']['new_routes'])}개")
+        finally:
+            scraper.close()
+        
     elif args.mode == 'analyze':
         # 분석만 실행
         logger.info(f"최근 {args.days}일 데이터 분석 모드 실행...")
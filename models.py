@@ -1,8 +1,18 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, Date, DateTime, Text
+from sqlalchemy import bindparam, create_engine, delete, insert, inspect, select, text, update, func, Column, Integer, String, Float, Date, DateTime, Text, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 from datetime import datetime
 import json
+import logging
+from company_database import json_default
+from hs_index import normalize_hs_code
+from pipeline.countries import canonical_country_code, country_name
+from pipeline.dedupe import record_fingerprint
+from pipeline.diff import rollup_rows
+from pipeline.enrichment import expand_enrichment
+from pipeline.normalizer import clean_product_code
+
+logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
@@ -21,6 +31,14 @@ class TradeRecord(Base):
     unit = Column(String(20))
     value_usd = Column(Float, nullable=False)
     trade_type = Column(String(10), nullable=False)  # 'export' or 'import'
+    
+    # 표준 국가 코드 (ISO-3166 alpha-3) - 국가별 집계용
+    origin_code = Column(String(3), index=True)
+    destination_code = Column(String(3), index=True)
+    
+    # 거래 사실 필드 지문 - 중복 판별용
+    fingerprint = Column(String(16), index=True)
+    
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # 상세 정보를 JSON으로 저장하는 필드 추가
@@ -29,7 +47,7 @@ class TradeRecord(Base):
     def set_detailed_info(self, info_dict):
         """상세 정보를 JSON으로 설정"""
         if info_dict:
-            self.detailed_info = json.dumps(info_dict, ensure_ascii=False, default=str)
+            self.detailed_info = json.dumps(info_dict, ensure_ascii=False, default=json_default)
     
     def get_detailed_info(self):
         """상세 정보를 딕셔너리로 반환"""
@@ -40,12 +58,169 @@ class TradeRecord(Base):
                 return {}
         return {}
 
+class TradeRollup(Base):
+    """경로(출발국/도착국/품목/유형) × 월 집계 - 수집 스냅샷 비교 기준"""
+    __tablename__ = 'trade_rollups'
+    __table_args__ = (UniqueConstraint('route_key', 'period', name='uq_trade_rollups_route_period'),)
+    
+    id = Column(Integer, primary_key=True)
+    route_key = Column(String(200), nullable=False, index=True)
+    period = Column(String(7), nullable=False)  # YYYY-MM
+    origin = Column(String(100))
+    destination = Column(String(100))
+    product_code = Column(String(20))
+    trade_type = Column(String(10))
+    value_usd = Column(Float, default=0.0)
+    quantity = Column(Float, default=0.0)
+    records = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class DatabaseManager:
     def __init__(self, database_url):
         self.engine = create_engine(database_url)
         Base.metadata.create_all(self.engine)
-        Session = sessionmaker(bind=self.engine)
-        self.session = Session()
+        self._ensure_country_code_columns()
+        self._ensure_fingerprint_column()
+        codes_changed = self._ensure_canonical_product_codes()
+        # 스레드별 세션 (스케줄러, Flask 요청, 파이프라인 저장 스레드가 같은 매니저를 동시에 사용)
+        self.session = scoped_session(sessionmaker(bind=self.engine))
+        self._ensure_rollups(force=codes_changed)
+    
+    def _ensure_country_code_columns(self):
+        """기존 테이블에 국가 코드 컬럼이 없으면 추가하고 표기별로 채움"""
+        existing = {column['name'] for column in inspect(self.engine).get_columns(TradeRecord.__tablename__)}
+        pairs = [('origin_code', 'country_origin'), ('destination_code', 'country_destination')]
+        missing = [(code_column, name_column) for code_column, name_column in pairs if code_column not in existing]
+        if not missing:
+            return
+        
+        try:
+            with self.engine.begin() as conn:
+                for code_column, name_column in missing:
+                    conn.execute(text(f"ALTER TABLE trade_records ADD COLUMN {code_column} VARCHAR(3)"))
+                    conn.execute(text(
+                        f"CREATE INDEX IF NOT EXISTS ix_trade_records_{code_column} ON trade_records ({code_column})"
+                    ))
+                    
+                    # 서로 다른 국가 표기마다 한 번씩만 갱신
+                    names = conn.execute(text(f"SELECT DISTINCT {name_column} FROM trade_records")).scalars().all()
+                    for name in names:
+                        code = canonical_country_code(name)
+                        if code:
+                            conn.execute(
+                                text(f"UPDATE trade_records SET {code_column} = :code WHERE {name_column} = :name"),
+                                {'code': code, 'name': name}
+                            )
+            logger.info(f"국가 코드 컬럼 추가: {[code_column for code_column, _ in missing]}")
+        except Exception as e:
+            logger.error(f"국가 코드 컬럼 추가 오류: {e}")
+    
+    def _ensure_fingerprint_column(self):
+        """기존 테이블에 지문 컬럼이 없으면 추가하고 기존 행의 지문을 채움"""
+        existing = {column['name'] for column in inspect(self.engine).get_columns(TradeRecord.__tablename__)}
+        if 'fingerprint' in existing:
+            return
+        
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text("ALTER TABLE trade_records ADD COLUMN fingerprint VARCHAR(16)"))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_trade_records_fingerprint ON trade_records (fingerprint)"
+                ))
+                rows = conn.execute(text(
+                    "SELECT id, date, origin_code, country_origin, destination_code, country_destination, "
+                    "product_code, trade_type, value_usd, quantity FROM trade_records"
+                )).all()
+                updates = [
+                    {'id': row.id, 'fingerprint': record_fingerprint(
+                        row.date, row.origin_code or row.country_origin,
+                        row.destination_code or row.country_destination,
+                        row.product_code, row.trade_type, row.value_usd, row.quantity
+                    )}
+                    for row in rows
+                ]
+                if updates:
+                    conn.execute(text("UPDATE trade_records SET fingerprint = :fingerprint WHERE id = :id"), updates)
+            logger.info(f"지문 컬럼 추가: 기존 {len(updates)}건 지문 생성")
+        except Exception as e:
+            logger.error(f"지문 컬럼 추가 오류: {e}")
+    
+    def _ensure_canonical_product_codes(self):
+        """HS 코드 표기가 표준형이 아닌 기존 행 ('0802.12' 등)의 품목 코드와 지문 갱신
+        
+        품목 코드는 HS 코드 출처의 행만 표준형으로 바꾸고, 지문은 출처와 관계없이 표기를 통일해 계산하므로
+        대상 행 모두 다시 계산하여 달라진 행만 갱신. 품목 코드가 바뀐 행이 있으면 True (집계 재구성 필요)
+        """
+        try:
+            with self.engine.begin() as conn:
+                codes = conn.execute(text("SELECT DISTINCT product_code FROM trade_records")).scalars().all()
+                variants = [code for code in codes if code and normalize_hs_code(code) not in ('', code)]
+                if not variants:
+                    return False
+                
+                rows = conn.execute(text(
+                    "SELECT id, date, origin_code, country_origin, destination_code, country_destination, "
+                    "product_code, trade_type, value_usd, quantity, fingerprint, detailed_info "
+                    "FROM trade_records WHERE product_code IN :codes"
+                ).bindparams(bindparam('codes', expanding=True)), {'codes': variants}).all()
+                
+                updates = []
+                codes_changed = 0
+                for row in rows:
+                    try:
+                        source = json.loads(row.detailed_info).get('source') if row.detailed_info else None
+                    except (ValueError, AttributeError):
+                        source = None
+                    product_code = clean_product_code(row.product_code, source)
+                    fingerprint = record_fingerprint(
+                        row.date, row.origin_code or row.country_origin,
+                        row.destination_code or row.country_destination,
+                        product_code, row.trade_type, row.value_usd, row.quantity
+                    )
+                    if product_code != row.product_code or fingerprint != row.fingerprint:
+                        updates.append({'id': row.id, 'product_code': product_code, 'fingerprint': fingerprint})
+                        codes_changed += product_code != row.product_code
+                if updates:
+                    conn.execute(text(
+                        "UPDATE trade_records SET product_code = :product_code, fingerprint = :fingerprint WHERE id = :id"
+                    ), updates)
+                    logger.info(f"품목 코드 표준화: {len(updates)}건 갱신 (품목 코드 변경 {codes_changed}건)")
+                return codes_changed > 0
+        except Exception as e:
+            logger.error(f"품목 코드 표준화 오류: {e}")
+            return False
+    
+    def get_fingerprint_watermark(self):
+        """중복 필터 기준점 (최대 id, 행 수) - 필터 밖에서 삽입된 행이 있는지 판단용"""
+        max_id, count = self.session.query(func.max(TradeRecord.id), func.count(TradeRecord.id)).one()
+        return (max_id or 0, count)
+    
+    def count_records_between(self, after_id, up_to_id):
+        """after_id < id <= up_to_id 범위의 행 수"""
+        return self.session.query(func.count(TradeRecord.id)).filter(
+            TradeRecord.id > after_id, TradeRecord.id <= up_to_id
+        ).scalar() or 0
+    
+    def iter_fingerprints(self, chunk_size=10000, after_id=0, up_to_id=None):
+        """저장된 지문을 스트리밍으로 생성 (중복 필터 재구성/갱신용, after_id < id <= up_to_id 범위)"""
+        query = select(TradeRecord.fingerprint).where(TradeRecord.fingerprint.isnot(None))
+        if after_id:
+            query = query.where(TradeRecord.id > after_id)
+        if up_to_id is not None:
+            query = query.where(TradeRecord.id <= up_to_id)
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+            for fingerprint in result.scalars():
+                yield fingerprint
+    
+    def find_fingerprints(self, fingerprints):
+        """주어진 지문 중 이미 저장된 지문"""
+        if not fingerprints:
+            return set()
+        rows = self.session.query(TradeRecord.fingerprint).filter(
+            TradeRecord.fingerprint.in_(fingerprints)
+        ).distinct().all()
+        return {fingerprint for fingerprint, in rows}
     
     def add_record(self, record_data):
         # 기본 필드와 상세 정보 분리
@@ -57,8 +232,17 @@ class DatabaseManager:
         
         basic_data = {k: v for k, v in record_data.items() if k in basic_fields}
         detailed_data = {k: v for k, v in record_data.items() if k not in basic_fields}
+        if 'product_code' in basic_data:
+            basic_data['product_code'] = clean_product_code(basic_data['product_code'], record_data.get('source'))
         
         record = TradeRecord(**basic_data)
+        record.origin_code = canonical_country_code(record.country_origin)
+        record.destination_code = canonical_country_code(record.country_destination)
+        record.fingerprint = record_fingerprint(
+            record.date, record.origin_code or record.country_origin,
+            record.destination_code or record.country_destination,
+            record.product_code, record.trade_type, record.value_usd, record.quantity
+        )
         
         # 상세 정보가 있으면 JSON으로 저장
         if detailed_data:
@@ -72,6 +256,86 @@ class DatabaseManager:
         """add_record의 별칭 - 호환성을 위해"""
         return self.add_record(record_data)
     
+    def save_trade_batch(self, batch) -> int:
+        """표준화된 TradeBatch를 한 번의 대량 삽입으로 저장"""
+        if not len(batch):
+            return 0
+        
+        try:
+            self.session.execute(insert(TradeRecord), batch.to_mappings())
+            self.session.commit()
+            return len(batch)
+        except Exception:
+            self.session.rollback()
+            raise
+    
+    def _ensure_rollups(self, force=False):
+        """집계 테이블이 원본과 어긋나면 (집계 밖 경로로 삽입된 행, 품목 코드 변경 등) 다시 만듦"""
+        try:
+            record_count = self.session.query(func.count(TradeRecord.id)).scalar() or 0
+            rollup_count = self.session.query(func.coalesce(func.sum(TradeRollup.records), 0)).scalar() or 0
+            if force or record_count != rollup_count:
+                self.rebuild_rollups()
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"집계 테이블 확인 오류: {e}")
+    
+    def rebuild_rollups(self):
+        """trade_records에서 경로 × 월 집계를 다시 계산"""
+        rows = self.session.query(
+            TradeRecord.date, TradeRecord.origin_code, TradeRecord.country_origin,
+            TradeRecord.destination_code, TradeRecord.country_destination,
+            TradeRecord.product_code, TradeRecord.trade_type,
+            func.sum(func.coalesce(TradeRecord.value_usd, 0)), func.sum(func.coalesce(TradeRecord.quantity, 0)),
+            func.count(TradeRecord.id)
+        ).group_by(
+            TradeRecord.date, TradeRecord.origin_code, TradeRecord.country_origin,
+            TradeRecord.destination_code, TradeRecord.country_destination,
+            TradeRecord.product_code, TradeRecord.trade_type
+        ).all()
+        rollups = rollup_rows(rows)
+        try:
+            self.session.execute(delete(TradeRollup))
+            if rollups:
+                self.session.execute(insert(TradeRollup), rollups)
+            self.session.commit()
+            logger.info(f"집계 테이블 재구성: {len(rollups)}개 경로/기간")
+        except Exception:
+            self.session.rollback()
+            raise
+    
+    def get_rollups(self, route_keys, chunk_size=500):
+        """경로별 기간 집계 {경로 키: {기간: {'id', 'value_usd', 'quantity', 'records'}}}"""
+        route_keys = list(route_keys)
+        snapshot = {}
+        for start in range(0, len(route_keys), chunk_size):
+            rows = self.session.query(
+                TradeRollup.id, TradeRollup.route_key, TradeRollup.period,
+                TradeRollup.value_usd, TradeRollup.quantity, TradeRollup.records
+            ).filter(TradeRollup.route_key.in_(route_keys[start:start + chunk_size])).all()
+            for row in rows:
+                snapshot.setdefault(row.route_key, {})[row.period] = {
+                    'id': row.id, 'value_usd': row.value_usd or 0.0,
+                    'quantity': row.quantity or 0.0, 'records': row.records or 0
+                }
+        return snapshot
+    
+    def upsert_rollups(self, rollups):
+        """집계 행 갱신 (id가 있으면 수정, 없으면 추가)"""
+        updates = [row for row in rollups if row.get('id')]
+        inserts = [row for row in rollups if not row.get('id')]
+        if not rollups:
+            return
+        try:
+            if updates:
+                self.session.execute(update(TradeRollup), updates)
+            if inserts:
+                self.session.execute(insert(TradeRollup), inserts)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+    
     def get_latest_records(self, days=7):
         from datetime import datetime, timedelta
         cutoff_date = datetime.now() - timedelta(days=days)
@@ -79,6 +343,33 @@ class DatabaseManager:
             TradeRecord.created_at >= cutoff_date
         ).all()
     
+    def get_country_totals(self, days=365, role='origin', limit=None):
+        """국가 코드별 거래액/건수 집계 (코드가 없는 레코드는 원래 표기로 묶음)
+        
+        Returns:
+            [(국가명, {'value': 합계, 'count': 건수, 'code': alpha-3 코드}), ...] 거래액 내림차순
+        """
+        from datetime import timedelta
+        if role == 'origin':
+            code_column, name_column = TradeRecord.origin_code, TradeRecord.country_origin
+        else:
+            code_column, name_column = TradeRecord.destination_code, TradeRecord.country_destination
+        
+        key = func.coalesce(code_column, name_column)
+        value_sum = func.sum(func.coalesce(TradeRecord.value_usd, 0))
+        query = self.session.query(
+            key, code_column, value_sum, func.count(TradeRecord.id)
+        ).filter(
+            TradeRecord.created_at >= datetime.now() - timedelta(days=days)
+        ).group_by(key, code_column).order_by(value_sum.desc())
+        if limit:
+            query = query.limit(limit)
+        
+        return [
+            (country_name(code) or key_value, {'value': total or 0, 'count': count, 'code': code})
+            for key_value, code, total, count in query.all()
+        ]
+    
     def get_recent_records(self, limit=10):
         """최근 레코드 조회"""
         return self.session.query(TradeRecord).order_by(
@@ -113,17 +404,24 @@ class DatabaseManager:
                 'unit': record.unit,
                 'value_usd': record.value_usd,
                 'trade_type': record.trade_type,
+                'origin_code': record.origin_code,
+                'destination_code': record.destination_code,
+                'fingerprint': record.fingerprint,
                 'created_at': record.created_at
             }
             
-            # 상세 정보 추가
-            detailed_info = record.get_detailed_info()
+            # 상세 정보 추가 (lazy 모드로 저장된 레코드는 지문에서 복원)
+            detailed_info = expand_enrichment(result, record.get_detailed_info())
             result.update(detailed_info)
             
             return result
         
         return None
 
+    def release_session(self):
+        """현재 스레드의 세션 반납 (요청/작업 스레드 종료 시)"""
+        self.session.remove()
+    
     def close(self):
         """세션 종료"""
-        self.session.close()
+        self.session.remove()
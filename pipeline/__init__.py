@@ -0,0 +1,28 @@
+# Ingestion pipeline stages
+from .normalizer import TradeBatch, TradeRecordNormalizer, normalize_records
+from .countries import CountryIndex, get_country_index, canonical_country_code, country_name
+from .dedupe import BloomFilter, DuplicateFilter, record_fingerprint
+from .enrichment import EnrichmentStage, expand_enrichment
+from .bulk_ingest import BulkTradeFileIngester, iter_bulk_tables, ingest_bulk_file
+from .workers import EnrichmentWorkers, StagedPipeline, normalize_batch
+
+__all__ = [
+    'TradeBatch',
+    'TradeRecordNormalizer',
+    'normalize_records',
+    'CountryIndex',
+    'get_country_index',
+    'canonical_country_code',
+    'country_name',
+    'BloomFilter',
+    'DuplicateFilter',
+    'record_fingerprint',
+    'EnrichmentStage',
+    'expand_enrichment',
+    'BulkTradeFileIngester',
+    'iter_bulk_tables',
+    'ingest_bulk_file',
+    'EnrichmentWorkers',
+    'StagedPipeline',
+    'normalize_batch'
+]
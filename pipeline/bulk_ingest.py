@@ -0,0 +1,246 @@
+"""
+무역 통계 벌크 파일 적재
+UN Comtrade 벌크 CSV/ZIP 덤프나 대용량 CSV 내보내기 파일을 압축 해제하며 스트리밍으로 읽고,
+청크 단위 열 기반 HS 코드 필터 → 표준화 → 대량 삽입으로 일정한 메모리 안에서 적재
+"""
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import bz2
+import csv
+import gzip
+import io
+import logging
+import os
+import time
+import zipfile
+
+from hs_index import hs_group, normalize_hs_code
+
+from .normalizer import TradeRecordNormalizer
+from .dedupe import DuplicateFilter
+from .diff import SnapshotDiffEngine, TradeDelta
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 필터/표준화/저장하는 행 수
+DEFAULT_CHUNK_SIZE = 50000
+
+# 벌크 파일 내 CSV로 취급하는 확장자
+_TABLE_EXTENSIONS = ('.csv', '.txt', '.tsv')
+
+# 표준 필드 → 헤더 별칭 (Comtrade Plus 벌크, 구 Comtrade 벌크, 스크래퍼 레코드 형식 순)
+COLUMN_ALIASES = {
+    'product_code': ('cmdCode', 'Commodity Code', 'product_code', 'hs_code'),
+    'product_description': ('cmdDesc', 'Commodity', 'product_description'),
+    'reporter': ('reporterDesc', 'Reporter', 'reporterISO', 'Reporter ISO'),
+    'partner': ('partnerDesc', 'Partner', 'partnerISO', 'Partner ISO'),
+    'flow': ('flowDesc', 'flowCode', 'Trade Flow', 'Trade Flow Code', 'trade_type'),
+    'period': ('period', 'refPeriodId', 'Period'),
+    'year': ('refYear', 'Year', 'year'),
+    'value': ('primaryValue', 'Trade Value (US$)', 'value_usd', 'trade_value'),
+    'net_weight': ('netWgt', 'Netweight (kg)', 'NetWeight (kg)'),
+    'quantity': ('qty', 'Qty', 'quantity'),
+    'unit': ('qtyUnitAbbr', 'Qty Unit', 'unit'),
+    'country_origin': ('country_origin',),
+    'country_destination': ('country_destination',)
+}
+
+# Comtrade 거래 흐름 코드 → 수입/수출 (재수입/재수출 등 포함)
+FLOW_TYPES = {
+    'm': 'import', 'rm': 'import', 'fm': 'import', 'mip': 'import', 'import': 'import',
+    'imports': 'import', 're-import': 'import', 're-imports': 'import',
+    'x': 'export', 'rx': 'export', 'dx': 'export', 'xip': 'export', 'export': 'export',
+    'exports': 'export', 're-export': 'export', 're-exports': 'export'
+}
+
+
+def iter_bulk_tables(path: str) -> Iterator[Tuple[str, io.TextIOBase]]:
+    """벌크 파일 안의 표 파일을 (이름, 텍스트 스트림)으로 생성
+
+    zip은 멤버별, gz/bz2는 단일 파일로 압축을 풀면서 읽음 (전체를 메모리에 올리지 않음).
+    """
+    lower = path.lower()
+    if lower.endswith('.zip'):
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.infolist():
+                if member.is_dir() or not member.filename.lower().endswith(_TABLE_EXTENSIONS):
+                    continue
+                with archive.open(member) as raw:
+                    yield member.filename, _text_stream(raw)
+        return
+
+    if lower.endswith('.gz'):
+        opener = gzip.open
+    elif lower.endswith('.bz2'):
+        opener = bz2.open
+    else:
+        opener = open
+    with opener(path, 'rb') as raw:
+        yield os.path.basename(path), _text_stream(raw)
+
+
+def _text_stream(raw) -> io.TextIOWrapper:
+    # BOM이 붙은 UTF-8 내보내기 파일 허용, 깨진 바이트는 대체 문자로
+    return io.TextIOWrapper(raw, encoding='utf-8-sig', errors='replace', newline='')
+
+
+class BulkTradeFileIngester:
+    """벌크 무역 통계 파일을 청크 단위로 필터/표준화/저장
+
+    행 필터는 청크의 HS 코드 열만 꺼내 서로 다른 코드마다 한 번만 판정하므로,
+    대상 품목이 아닌 대부분의 행은 dict로 변환하지 않고 버려짐.
+    저장한 청크는 수집 데이터와 같이 집계 스냅샷(trade_rollups)에 반영하고 델타를 모음.
+    """
+
+    def __init__(self, db, hs_codes: Iterable[str], source: str = 'UN_Comtrade_Bulk',
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, normalizer: TradeRecordNormalizer = None,
+                 duplicate_filter: DuplicateFilter = None, diff_engine: SnapshotDiffEngine = None):
+        self.db = db
+        self.duplicate_filter = duplicate_filter  # 이미 저장된 행 사전 제거 (선택)
+        self.diff_engine = diff_engine or SnapshotDiffEngine(db)
+        self.hs_prefixes = tuple(_clean_hs_code(code) for code in hs_codes if code)
+        self.source = source
+        self.chunk_size = chunk_size
+        self.normalizer = normalizer or TradeRecordNormalizer(default_source=source)
+
+    def ingest(self, path: str, progress: Callable[[Dict], None] = None) -> Dict:
+        """파일 하나를 적재하고 처리 통계 반환
+
+        Returns:
+            {'files', 'rows_read', 'rows_matched', 'rows_saved', 'rows_duplicate', 'rows_by_heading',
+             'delta', 'seconds'}
+        """
+        started = time.monotonic()
+        stats = {'files': [], 'rows_read': 0, 'rows_matched': 0, 'rows_saved': 0, 'rows_duplicate': 0,
+                 'rows_by_heading': {}, 'seconds': 0.0}
+        delta = TradeDelta()
+
+        for name, stream in iter_bulk_tables(path):
+            logger.info(f"벌크 파일 적재 시작: {name}")
+            stats['files'].append(name)
+            for rows_read, records in self.iter_matched_chunks(stream):
+                stats['rows_read'] += rows_read
+                stats['rows_matched'] += len(records)
+                # 일치 행을 HS 호(4자리)별로 집계 (0802.50 / 80250 등은 표준형으로 같은 호)
+                by_heading = stats['rows_by_heading']
+                for record in records:
+                    heading = hs_group(record['product_code'])
+                    by_heading[heading] = by_heading.get(heading, 0) + 1
+                if records:
+                    stats['rows_saved'] += self._save(self.normalizer.normalize(records), stats, delta)
+                if progress:
+                    progress(stats)
+
+        stats['delta'] = delta.to_dict()
+        stats['seconds'] = round(time.monotonic() - started, 2)
+        logger.info(
+            f"벌크 적재 완료: {stats['rows_read']}행 중 {stats['rows_matched']}행 일치, "
+            f"{stats['rows_saved']}건 저장 ({stats['seconds']}초)"
+        )
+        return stats
+
+    def _save(self, batch, stats: Dict, delta: TradeDelta) -> int:
+        if self.duplicate_filter is not None:
+            fresh = self.duplicate_filter.filter_batch(batch)
+            stats['rows_duplicate'] += len(batch) - len(fresh)
+            batch = fresh
+        saved = self.db.save_trade_batch(batch)
+        if self.duplicate_filter is not None:
+            self.duplicate_filter.add_batch(batch)
+
+        try:
+            delta.merge(self.diff_engine.apply(batch))
+        except Exception as e:
+            logger.error(f"스냅샷 델타 계산 오류: {e}")
+        return saved
+
+    def iter_matched_chunks(self, stream) -> Iterator[Tuple[int, List[Dict]]]:
+        """(읽은 행 수, HS 코드가 일치한 표준 레코드 목록)을 청크마다 생성"""
+        first_line = stream.readline()
+        if not first_line:
+            return
+        delimiter = '\t' if first_line.count('\t') > first_line.count(',') else ','
+        header = next(csv.reader([first_line], delimiter=delimiter))
+        columns = self._resolve_columns(header)
+        if 'product_code' not in columns:
+            raise ValueError(f"HS 코드 열을 찾을 수 없음: {header[:10]}")
+
+        reader = csv.reader(stream, delimiter=delimiter)
+        code_index = columns['product_code']
+        decisions = {}
+        while True:
+            chunk = list(islice(reader, self.chunk_size))
+            if not chunk:
+                return
+
+            # 열 기반 필터: HS 코드 값마다 한 번만 판정
+            matched = []
+            for row in chunk:
+                code = row[code_index] if len(row) > code_index else ''
+                keep = decisions.get(code)
+                if keep is None:
+                    keep = decisions[code] = self._matches(code)
+                if keep:
+                    matched.append(row)
+
+            yield len(chunk), [self._map_row(row, columns) for row in matched]
+
+    def _resolve_columns(self, header: List[str]) -> Dict[str, int]:
+        """표준 필드별 헤더 열 위치 (별칭 중 먼저 나오는 이름 우선)"""
+        positions = {name.strip(): index for index, name in enumerate(header)}
+        columns = {}
+        for field, aliases in COLUMN_ALIASES.items():
+            for alias in aliases:
+                if alias in positions:
+                    columns[field] = positions[alias]
+                    break
+        return columns
+
+    def _matches(self, code: str) -> bool:
+        if not self.hs_prefixes:
+            return True
+        return _clean_hs_code(code).startswith(self.hs_prefixes)
+
+    def _map_row(self, row: List[str], columns: Dict[str, int]) -> Dict:
+        """일치한 행을 스크래퍼 레코드 형식으로 변환"""
+        def get(field: str) -> Optional[str]:
+            index = columns.get(field)
+            if index is None or index >= len(row):
+                return None
+            return row[index].strip() or None
+
+        flow = FLOW_TYPES.get((get('flow') or '').lower(), 'import')
+        reporter, partner = get('reporter'), get('partner')
+        # 보고국 기준 통계: 수입이면 상대국 → 보고국, 수출이면 보고국 → 상대국
+        if flow == 'import':
+            origin, destination = partner, reporter
+        else:
+            origin, destination = reporter, partner
+
+        net_weight = get('net_weight')
+        return {
+            'country_origin': get('country_origin') or origin or '',
+            'country_destination': get('country_destination') or destination or '',
+            'product_code': _clean_hs_code(get('product_code') or ''),
+            'product_description': get('product_description') or '',
+            'trade_value': get('value'),
+            'quantity': net_weight if net_weight is not None else get('quantity'),
+            'unit': 'kg' if net_weight is not None else get('unit'),
+            'trade_type': flow,
+            'period': get('period') or '',
+            'year': get('year'),
+            'source': self.source
+        }
+
+
+def _clean_hs_code(code) -> str:
+    """HS 코드 표준형 (숫자로 저장되어 빠진 앞자리 0 복원: 80250 → 080250)"""
+    return normalize_hs_code(code) or str(code).strip()
+
+
+def ingest_bulk_file(db, path: str, hs_codes: Iterable[str], source: str = 'UN_Comtrade_Bulk',
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, duplicate_filter: DuplicateFilter = None,
+                     diff_engine: SnapshotDiffEngine = None) -> Dict:
+    """벌크 파일 적재 단축 함수"""
+    return BulkTradeFileIngester(db, hs_codes, source=source, chunk_size=chunk_size,
+                                 duplicate_filter=duplicate_filter, diff_engine=diff_engine).ingest(path)
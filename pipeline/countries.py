@@ -0,0 +1,102 @@
+"""
+국가/상대국 코드 표준화 테이블
+ISO-3166(alpha-2/alpha-3/M49 숫자 코드)과 별칭 색인을 한 번만 적재하여
+'036', 'AU', 'Korea, Republic of', 'Hawaii (USA)' 같은 표기를 alpha-3 코드로 통일
+"""
+from typing import Optional, Tuple
+import json
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+# iso-codes 패키지의 iso_3166-1 데이터에서 생성한 코드 테이블
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'country_codes.json')
+
+_PUNCTUATION_TABLE = str.maketrans({'.': '', "'": '', '’': '', ',': ' ', '(': ' ', ')': ' ', '-': ' ', '/': ' '})
+_PARENTHESIS_PATTERN = re.compile(r'\(([^)]+)\)')
+
+
+def _key(value) -> str:
+    """색인 조회용 키 (대소문자/구두점/공백 차이 제거)"""
+    key = ' '.join(str(value).casefold().translate(_PUNCTUATION_TABLE).split())
+    if key.startswith('the '):
+        key = key[4:]
+    if key.isdigit():
+        key = key.zfill(3)
+    return key
+
+
+class CountryIndex:
+    """국가 코드 조회 테이블"""
+
+    def __init__(self, path: str = DATA_PATH):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+
+        self.names = {}     # alpha-3 → 표시명
+        self.numeric = {}   # alpha-3 → M49 숫자 코드
+        self._index = {}    # 조회 키 → alpha-3
+
+        for alpha3, alpha2, numeric, display, *other_names in data['countries']:
+            self.names[alpha3] = display
+            self.numeric[alpha3] = numeric
+            for value in (alpha3, alpha2, numeric, display, *other_names):
+                if value:
+                    self._index.setdefault(_key(value), alpha3)
+
+        # 별칭은 ISO 명칭보다 우선
+        for alias, alpha3 in data['aliases'].items():
+            self._index[_key(alias)] = alpha3
+
+        logger.debug(f"국가 코드 테이블 적재: {len(self.names)}개국, 조회 키 {len(self._index)}개")
+
+    def code(self, value) -> Optional[str]:
+        """표기에 해당하는 alpha-3 코드 (알 수 없으면 None)"""
+        if value is None or value == '':
+            return None
+        key = _key(value)
+        code = self._index.get(key)
+        if code is None:
+            # 'Hawaii (USA)'처럼 괄호 안에 소속 국가가 있는 표기
+            match = _PARENTHESIS_PATTERN.search(str(value))
+            if match:
+                code = self._index.get(_key(match.group(1)))
+        return code
+
+    def name(self, code: str) -> Optional[str]:
+        """alpha-3 코드의 표시명"""
+        return self.names.get(code)
+
+    def resolve(self, value) -> Tuple[str, Optional[str]]:
+        """(표시명, alpha-3 코드) 반환 - 알 수 없는 표기는 공백만 정리하여 유지"""
+        code = self.code(value)
+        if code is not None:
+            return self.names[code], code
+        return ' '.join(str(value or '').split())[:100], None
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_country_index() -> CountryIndex:
+    """프로세스 전체에서 공유하는 국가 코드 테이블 (최초 호출 시 적재)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CountryIndex()
+    return _index
+
+
+def canonical_country_code(value) -> Optional[str]:
+    """국가 표기를 alpha-3 코드로 변환"""
+    return get_country_index().code(value)
+
+
+def country_name(code: str) -> Optional[str]:
+    """alpha-3 코드의 표시명"""
+    return get_country_index().name(code)
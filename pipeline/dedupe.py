@@ -0,0 +1,281 @@
+"""
+수집 레코드 중복 사전 필터
+레코드 지문(날짜/국가/품목/유형/금액/수량 해시)을 블룸 필터에 담아 DB 조회 없이
+확실히 새로운 행을 걸러내고, 필터에 걸린 행만 지문 컬럼으로 정확히 확인
+"""
+from datetime import date
+from typing import Dict, Iterable, List, Set, Tuple
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+
+from hs_index import normalize_hs_code
+
+logger = logging.getLogger(__name__)
+
+# 정확 확인 쿼리 한 번에 넣는 지문 수
+VERIFY_CHUNK_SIZE = 500
+
+# 지문 계산 방식 버전 - 바뀌면 저장된 필터 파일을 쓰지 않고 다시 만듦
+# (2: 품목 코드를 HS 표준형으로 통일한 뒤 해시)
+FINGERPRINT_VERSION = 2
+
+
+def record_fingerprint(record_date, origin: str, destination: str, product_code: str,
+                       trade_type: str, value_usd, quantity) -> str:
+    """거래 사실 필드의 64비트 지문 (16자리 16진수)
+
+    회사명 등 상세 정보는 수집마다 달라질 수 있으므로 제외.
+    품목 코드는 표기가 달라도 ('0802.12' / '080212') 같은 지문이 나오도록 HS 표준형으로 통일하여 해시.
+    """
+    product_code = (product_code or '').strip()
+    if isinstance(record_date, date):
+        record_date = record_date.isoformat()
+    key = '|'.join((
+        str(record_date or ''),
+        (origin or '').strip().casefold(),
+        (destination or '').strip().casefold(),
+        normalize_hs_code(product_code) or product_code,
+        (trade_type or '').strip().lower(),
+        f"{float(value_usd or 0.0):.2f}",
+        f"{float(quantity or 0.0):.3f}"
+    ))
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def batch_fingerprints(columns: Dict[str, list]) -> List[str]:
+    """TradeBatch 열에서 행별 지문 열 생성 (국가는 코드 우선, 없으면 표기)"""
+    origins = [code or name for code, name in zip(columns['origin_code'], columns['country_origin'])]
+    destinations = [code or name for code, name in zip(columns['destination_code'], columns['country_destination'])]
+    return [
+        record_fingerprint(*row)
+        for row in zip(columns['date'], origins, destinations, columns['product_code'],
+                       columns['trade_type'], columns['value_usd'], columns['quantity'])
+    ]
+
+
+class BloomFilter:
+    """64비트 지문용 블룸 필터 (이중 해싱으로 k개 비트 위치 생성)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, int(math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.size / self.capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, fingerprint: str):
+        value = int(fingerprint, 16)
+        h1 = value & 0xFFFFFFFF
+        h2 = (value >> 32) | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hash_count)]
+
+    def add(self, fingerprint: str):
+        bits = self.bits
+        for position in self._positions(fingerprint):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, fingerprint: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(fingerprint))
+
+    def expected_false_positive_rate(self) -> float:
+        """현재 원소 수 기준 이론적 오탐률"""
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+    def to_bytes(self, meta: Dict = None) -> bytes:
+        header = dict(meta or {}, capacity=self.capacity, error_rate=self.error_rate,
+                      size=self.size, hash_count=self.hash_count, count=self.count)
+        return json.dumps(header).encode('utf-8') + b'\n' + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Tuple['BloomFilter', Dict]:
+        header_line, bits = data.split(b'\n', 1)
+        header = json.loads(header_line)
+        bloom = cls(header['capacity'], header['error_rate'])
+        if bloom.size != header['size'] or len(bits) != len(bloom.bits):
+            raise ValueError('블룸 필터 파일 크기 불일치')
+        bloom.hash_count = header['hash_count']
+        bloom.count = header['count']
+        bloom.bits = bytearray(bits)
+        return bloom, header
+
+
+class DuplicateFilter:
+    """블룸 필터 + 지문 컬럼 정확 확인으로 이미 저장된 행을 삽입 전에 제거
+
+    필터는 자신이 흡수한 행의 기준점(최대 id, 행 수)을 함께 보관하고 파일에 저장함.
+    테이블의 기준점이 앞서 있으면 (업로드, 단건 저장, 다른 프로세스 등 필터를 거치지 않은 삽입)
+    기준점 이후 행의 지문을 읽어 추가하고, 삭제 등으로 행 수가 맞지 않으면 지문 컬럼에서 다시 만듦.
+    """
+
+    def __init__(self, db, path: str = None, error_rate: float = 0.01, min_capacity: int = 100000):
+        self.db = db
+        self.path = path
+        self.error_rate = error_rate
+        self.min_capacity = min_capacity
+        self.bloom = None
+        self.watermark = None  # 필터가 흡수한 행의 (최대 id, 행 수)
+        self._lock = threading.Lock()
+        self.stats = {
+            'checked': 0,
+            'definitely_new': 0,
+            'candidates': 0,
+            'verified_duplicates': 0,
+            'false_positives': 0,
+            'batch_duplicates': 0
+        }
+
+    def load_or_rebuild(self) -> 'DuplicateFilter':
+        """저장된 필터를 불러와 테이블 기준점까지 따라잡고, 쓸 수 없으면 테이블에서 다시 만듦"""
+        with self._lock:
+            current = self.db.get_fingerprint_watermark()
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path, 'rb') as f:
+                        bloom, header = BloomFilter.from_bytes(f.read())
+                    watermark = tuple(header.get('watermark') or ())
+                    if (len(watermark) == 2 and bloom.count <= bloom.capacity
+                            and header.get('fingerprint_version') == FINGERPRINT_VERSION):
+                        self.bloom, self.watermark = bloom, watermark
+                        if self._catch_up(current) and bloom.count <= bloom.capacity:
+                            logger.info(f"중복 필터 불러옴: {bloom.count}개 지문 ({self.path})")
+                            if watermark != current:
+                                self._save()
+                            return self
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"중복 필터 파일 무시: {e}")
+            self._rebuild(current)
+        return self
+
+    def _sync(self):
+        """테이블 기준점까지 필터 갱신 (잠금 안에서 호출)"""
+        current = self.db.get_fingerprint_watermark()
+        if current == self.watermark:
+            return
+        if not self._catch_up(current) or self.bloom.count > self.bloom.capacity:
+            # 삭제로 행 수가 어긋났거나 설계 용량 초과 (오탐률 증가) 시 더 큰 필터로 재구성
+            self._rebuild(current)
+        else:
+            self._save()
+
+    def _catch_up(self, current: Tuple[int, int]) -> bool:
+        """흡수한 기준점 이후 삽입된 행의 지문을 필터에 추가 (행 수가 맞지 않으면 False - 재구성 필요)"""
+        if current == self.watermark:
+            return True
+        max_id, count = self.watermark
+        current_max_id, current_count = current
+        if current_max_id < max_id or count + self.db.count_records_between(max_id, current_max_id) != current_count:
+            logger.info(f"중복 필터 기준점 불일치 (필터 {self.watermark}, 테이블 {current})")
+            return False
+        added = 0
+        for fingerprint in self.db.iter_fingerprints(after_id=max_id, up_to_id=current_max_id):
+            self.bloom.add(fingerprint)
+            added += 1
+        self.watermark = current
+        if added:
+            logger.debug(f"중복 필터 갱신: 기준점 이후 {added}개 지문 추가")
+        return True
+
+    def _rebuild(self, watermark: Tuple[int, int]):
+        max_id, row_count = watermark
+        bloom = BloomFilter(max(self.min_capacity, row_count * 2), self.error_rate)
+        for fingerprint in self.db.iter_fingerprints(up_to_id=max_id):
+            bloom.add(fingerprint)
+        self.bloom = bloom
+        self.watermark = tuple(watermark)
+        logger.info(f"중복 필터 재구성: {bloom.count}개 지문, 비트 {bloom.size}, 해시 {bloom.hash_count}개")
+        self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(self.bloom.to_bytes({'watermark': list(self.watermark), 'fingerprint_version': FINGERPRINT_VERSION}))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"중복 필터 저장 실패: {e}")
+
+    def filter_batch(self, batch):
+        """이미 저장된 행과 배치 내 중복 행을 제거한 배치 반환
+
+        블룸 필터에 없는 행은 확실히 새 행이므로 DB를 조회하지 않음.
+        """
+        if self.bloom is None:
+            self.load_or_rebuild()
+        fingerprints = batch['fingerprint']
+
+        with self._lock:
+            # 필터를 거치지 않고 삽입된 행부터 반영
+            self._sync()
+            candidates = {fingerprint for fingerprint in fingerprints if fingerprint in self.bloom}
+        existing = self._verify(candidates)
+
+        seen: Set[str] = set()
+        mask = []
+        batch_duplicates = 0
+        for fingerprint in fingerprints:
+            if fingerprint in existing:
+                mask.append(False)
+            elif fingerprint in seen:
+                batch_duplicates += 1
+                mask.append(False)
+            else:
+                seen.add(fingerprint)
+                mask.append(True)
+
+        with self._lock:
+            stats = self.stats
+            stats['checked'] += len(fingerprints)
+            stats['candidates'] += len(candidates)
+            stats['verified_duplicates'] += len(existing)
+            stats['false_positives'] += len(candidates) - len(existing)
+            stats['definitely_new'] += len(seen) - (len(candidates) - len(existing))
+            stats['batch_duplicates'] += batch_duplicates
+
+        if all(mask):
+            return batch
+        logger.info(f"중복 {len(mask) - len(seen)}건 제외 (필터 후보 {len(candidates)}건 중 기존 {len(existing)}건)")
+        return batch.select(mask)
+
+    def _verify(self, candidates: Iterable[str]) -> Set[str]:
+        """필터 후보 지문 중 실제로 저장된 지문"""
+        candidates = list(candidates)
+        existing = set()
+        for start in range(0, len(candidates), VERIFY_CHUNK_SIZE):
+            existing.update(self.db.find_fingerprints(candidates[start:start + VERIFY_CHUNK_SIZE]))
+        return existing
+
+    def add_batch(self, batch):
+        """저장한 배치를 필터에 반영하고 파일 갱신
+
+        배치 지문을 직접 넣지 않고 테이블에서 기준점 이후 행을 읽어 추가하므로,
+        그 사이 다른 경로로 삽입된 행도 함께 반영되고 기준점이 흡수한 행과 일치함.
+        """
+        with self._lock:
+            if self.bloom is None or not len(batch):
+                return
+            self._sync()
+
+    def snapshot(self) -> Dict:
+        """필터 상태와 측정 오탐률 (API 응답용)"""
+        with self._lock:
+            stats = dict(self.stats)
+            bloom = self.bloom
+            watermark = self.watermark
+        truly_new = stats['definitely_new'] + stats['false_positives']
+        return {
+            **stats,
+            'fingerprints': bloom.count if bloom else 0,
+            'watermark': list(watermark) if watermark else None,
+            'measured_false_positive_rate': round(stats['false_positives'] / truly_new, 5) if truly_new else None,
+            'expected_false_positive_rate': round(bloom.expected_false_positive_rate(), 5) if bloom else None
+        }
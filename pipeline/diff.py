@@ -0,0 +1,203 @@
+"""
+수집 스냅샷 차이 계산 단계
+새로 저장한 배치를 경로(출발국/도착국/품목/유형) × 기간(월) 집계로 묶어
+trade_rollups 집계 테이블의 직전 스냅샷과 비교하고, 신규 경로/기간별 금액 변화/수정된 기간을
+구조화된 델타로 만든 뒤 집계 테이블을 갱신
+"""
+from typing import Dict, Iterable, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 직전 기간 대비 금액 변화 보고 기준 (비율)
+DEFAULT_CHANGE_THRESHOLD = 0.2
+
+
+def route_key(origin: str, destination: str, product_code: str, trade_type: str) -> str:
+    """경로 식별 키 (국가는 alpha-3 코드 또는 표기)"""
+    return '|'.join((origin or '', destination or '', product_code or '', trade_type or ''))
+
+
+def period_of(record_date) -> str:
+    """집계 기간 (YYYY-MM)"""
+    return f"{record_date.year:04d}-{record_date.month:02d}"
+
+
+def _change_pct(previous: float, current: float):
+    if not previous:
+        return None
+    return round((current - previous) / previous * 100, 1)
+
+
+class TradeDelta:
+    """한 번의 수집 실행에서 생긴 변경 사항"""
+
+    def __init__(self):
+        self.records = 0
+        self.value_usd = 0.0
+        self.new_routes = {}        # 경로 키 → 경로 정보와 기간별 합계
+        self.new_periods = []       # 기존 경로의 새 기간
+        self.revised_periods = []   # 이미 집계된 기간에 추가된 행
+        self.value_changes = []     # 기준 이상 금액 변화 (새 기간: 직전 기간 대비, 수정: 수정 전 대비)
+
+    def is_empty(self) -> bool:
+        return self.records == 0
+
+    def merge(self, other: 'TradeDelta') -> 'TradeDelta':
+        self.records += other.records
+        self.value_usd += other.value_usd
+        for key, entry in other.new_routes.items():
+            if key in self.new_routes:
+                target = self.new_routes[key]
+                target['periods'] = sorted(set(target['periods']) | set(entry['periods']))
+                for name in ('value_usd', 'quantity', 'records'):
+                    target[name] += entry[name]
+            else:
+                self.new_routes[key] = entry
+        self.new_periods.extend(other.new_periods)
+        self.revised_periods.extend(other.revised_periods)
+        self.value_changes.extend(other.value_changes)
+        return self
+
+    def to_dict(self) -> Dict:
+        """알림/AI/보고서 단계에 넘기는 JSON 호환 형태"""
+        return {
+            'records': self.records,
+            'value_usd': round(self.value_usd, 2),
+            'new_routes': sorted(self.new_routes.values(), key=lambda entry: entry['value_usd'], reverse=True),
+            'new_periods': self.new_periods,
+            'revised_periods': self.revised_periods,
+            'value_changes': sorted(self.value_changes, key=lambda entry: abs(entry['change_pct'] or 0), reverse=True)
+        }
+
+
+class SnapshotDiffEngine:
+    """저장된 배치와 집계 테이블 스냅샷의 차이 계산 및 집계 갱신"""
+
+    def __init__(self, db, change_threshold: float = DEFAULT_CHANGE_THRESHOLD):
+        self.db = db
+        self.change_threshold = change_threshold
+
+    def apply(self, batch) -> TradeDelta:
+        """저장한 배치의 델타를 계산하고 집계 테이블에 반영"""
+        delta = TradeDelta()
+        if not len(batch):
+            return delta
+
+        groups = self._aggregate(batch)
+        snapshot = self.db.get_rollups({key for key, _ in groups})
+        updates = []
+
+        # 기간 순으로 처리하여 같은 배치 안의 앞 기간을 다음 기간의 비교 기준으로 사용
+        for (key, period), group in sorted(groups.items()):
+            route = group['route']
+            periods = snapshot.setdefault(key, {})
+            delta.records += group['records']
+            delta.value_usd += group['value_usd']
+
+            previous = periods.get(period)
+            if not periods or key in delta.new_routes:
+                entry = delta.new_routes.setdefault(key, {**route, 'periods': [], 'value_usd': 0.0,
+                                                          'quantity': 0.0, 'records': 0})
+                entry['periods'].append(period)
+                for name in ('value_usd', 'quantity', 'records'):
+                    entry[name] += group[name]
+            elif previous is None:
+                self._record_new_period(delta, route, period, periods, group)
+            else:
+                self._record_revision(delta, route, period, previous, group)
+
+            merged = self._merge(previous, group)
+            periods[period] = merged
+            updates.append({'route_key': key, 'period': period, **route, **merged})
+
+        self.db.upsert_rollups(updates)
+        logger.info(
+            f"스냅샷 델타: 신규 경로 {len(delta.new_routes)}, 신규 기간 {len(delta.new_periods)}, "
+            f"수정 기간 {len(delta.revised_periods)}, 금액 변화 {len(delta.value_changes)}"
+        )
+        return delta
+
+    def _aggregate(self, batch) -> Dict[Tuple[str, str], Dict]:
+        """배치 열을 (경로 키, 기간)별 합계로 집계"""
+        groups = {}
+        columns = zip(batch['date'], batch['origin_code'], batch['country_origin'],
+                      batch['destination_code'], batch['country_destination'], batch['product_code'],
+                      batch['trade_type'], batch['value_usd'], batch['quantity'])
+        for record_date, origin_code, origin, destination_code, destination, product_code, trade_type, value, quantity in columns:
+            key = route_key(origin_code or origin, destination_code or destination, product_code, trade_type)
+            group = groups.get((key, period_of(record_date)))
+            if group is None:
+                group = groups[(key, period_of(record_date))] = {
+                    'route': {'origin': origin, 'destination': destination,
+                              'product_code': product_code, 'trade_type': trade_type},
+                    'value_usd': 0.0, 'quantity': 0.0, 'records': 0
+                }
+            group['value_usd'] += value
+            group['quantity'] += quantity
+            group['records'] += 1
+        return groups
+
+    def _record_new_period(self, delta: TradeDelta, route: Dict, period: str, periods: Dict, group: Dict):
+        earlier = [known for known in periods if known < period]
+        previous_period = max(earlier) if earlier else None
+        previous_value = periods[previous_period]['value_usd'] if previous_period else None
+        entry = {
+            **route,
+            'period': period,
+            'value_usd': round(group['value_usd'], 2),
+            'records': group['records'],
+            'previous_period': previous_period,
+            'previous_value': round(previous_value, 2) if previous_value is not None else None,
+            'change_pct': _change_pct(previous_value, group['value_usd'])
+        }
+        delta.new_periods.append(entry)
+        if self._is_significant(previous_value, group['value_usd']):
+            delta.value_changes.append({**entry, 'kind': 'period_over_period'})
+
+    def _record_revision(self, delta: TradeDelta, route: Dict, period: str, previous: Dict, group: Dict):
+        revised_value = previous['value_usd'] + group['value_usd']
+        entry = {
+            **route,
+            'period': period,
+            'previous_value': round(previous['value_usd'], 2),
+            'value_usd': round(revised_value, 2),
+            'added_records': group['records'],
+            'change_pct': _change_pct(previous['value_usd'], revised_value)
+        }
+        delta.revised_periods.append(entry)
+        if self._is_significant(previous['value_usd'], revised_value):
+            delta.value_changes.append({**entry, 'kind': 'revision'})
+
+    def _is_significant(self, previous, current: float) -> bool:
+        if not previous:
+            return False
+        return abs(current - previous) / abs(previous) >= self.change_threshold
+
+    @staticmethod
+    def _merge(previous: Dict, group: Dict) -> Dict:
+        if previous is None:
+            return {name: group[name] for name in ('value_usd', 'quantity', 'records')}
+        merged = {name: previous[name] + group[name] for name in ('value_usd', 'quantity', 'records')}
+        merged['id'] = previous['id']
+        return merged
+
+
+def rollup_rows(rows: Iterable[Tuple]) -> List[Dict]:
+    """(날짜, 출발 코드, 출발국, 도착 코드, 도착국, 품목, 유형, 금액 합, 수량 합, 건수) 행을
+    (경로, 월) 집계 행으로 묶음 - 집계 테이블 재구성용"""
+    rollups = {}
+    for record_date, origin_code, origin, destination_code, destination, product_code, trade_type, value, quantity, count in rows:
+        key = route_key(origin_code or origin, destination_code or destination, product_code, trade_type)
+        period = period_of(record_date)
+        entry = rollups.get((key, period))
+        if entry is None:
+            entry = rollups[(key, period)] = {
+                'route_key': key, 'period': period, 'origin': origin, 'destination': destination,
+                'product_code': product_code, 'trade_type': trade_type,
+                'value_usd': 0.0, 'quantity': 0.0, 'records': 0
+            }
+        entry['value_usd'] += value or 0.0
+        entry['quantity'] += quantity or 0.0
+        entry['records'] += count
+    return list(rollups.values())
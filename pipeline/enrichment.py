@@ -0,0 +1,96 @@
+"""
+상세 정보 생성(enrichment) 단계
+수집 레코드마다 상세 정보를 한 번만 붙이는 명시적 파이프라인 단계.
+상세 정보는 레코드 지문을 시드로 한 순수 함수이므로, eager 모드는 값을 detailed_info에 저장하고
+lazy 모드는 출처 표시만 저장한 뒤 조회 시 저장된 지문에서 같은 상세 정보를 다시 만듦
+"""
+from typing import Dict, List, Optional
+import logging
+import threading
+
+from company_database import thaw
+
+logger = logging.getLogger(__name__)
+
+EAGER = 'eager'
+LAZY = 'lazy'
+OFF = 'off'
+ENRICHMENT_MODES = (EAGER, LAZY, OFF)
+
+# 이전 lazy 모드 행의 detailed_info 시드 키 (현재는 지문을 시드로 사용)
+SEED_KEY = 'enrichment_seed'
+LAZY_SOURCE = 'TradeDetailGenerator:lazy'
+
+_generator = None
+_generator_lock = threading.Lock()
+
+
+def _get_generator():
+    """조회 시 상세 정보 복원용 생성기 (최초 사용 시 생성)"""
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                from trade_detail_generator import TradeDetailGenerator
+                _generator = TradeDetailGenerator()
+    return _generator
+
+
+def is_enriched(record: Dict) -> bool:
+    """이미 상세 정보 단계를 거친 레코드인지"""
+    return 'enhancement_source' in record or SEED_KEY in record
+
+
+class EnrichmentStage:
+    """레코드 배치에 상세 정보 열을 붙이는 단계 (레코드당 최대 한 번)"""
+
+    def __init__(self, generator=None, mode: str = EAGER):
+        if mode not in ENRICHMENT_MODES:
+            logger.warning(f"알 수 없는 상세 정보 모드 '{mode}' - {EAGER} 사용")
+            mode = EAGER
+        self.mode = mode
+        self._generator = generator
+
+    @property
+    def generator(self):
+        return self._generator or _get_generator()
+
+    def apply(self, records: List[Dict], columns: Dict[str, list] = None) -> Optional[Dict[str, list]]:
+        """레코드와 같은 순서의 상세 정보 열 (붙일 것이 없으면 None)
+
+        columns는 표준화된 열(지문/국가)이며 없으면 생성기가 직접 표준화함.
+        이미 상세 정보가 있는 레코드와 기본 정보(품목 코드/출발국)가 없는 레코드는 건너뜀.
+        """
+        if self.mode == OFF or not records:
+            return None
+        pending = [
+            bool(record) and not is_enriched(record)
+            and bool(record.get('product_code')) and bool(record.get('country_origin'))
+            for record in records
+        ]
+        if not any(pending):
+            return None
+
+        if self.mode == LAZY:
+            return {'enhancement_source': [LAZY_SOURCE if todo else None for todo in pending]}
+
+        enriched = self.generator.enhance_trade_records(records, columns)
+        if not all(pending):
+            for values in enriched.values():
+                for index, todo in enumerate(pending):
+                    if not todo:
+                        values[index] = None
+        return enriched
+
+
+def expand_enrichment(record: Dict, detailed_info: Dict) -> Dict:
+    """lazy 모드로 저장된 레코드의 상세 정보를 지문에서 복원 (저장된 값이 우선)"""
+    seed = detailed_info.get(SEED_KEY)
+    if seed is None:
+        if detailed_info.get('enhancement_source') != LAZY_SOURCE or not record.get('fingerprint'):
+            return detailed_info
+        seed = int(record['fingerprint'], 16)
+    derived = _get_generator().enrichment_from_seed(
+        seed, record.get('country_origin', ''), record.get('country_destination', '')
+    )
+    return {**thaw(derived), **detailed_info}
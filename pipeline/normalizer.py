@@ -0,0 +1,334 @@
+"""
+수집 레코드 표준화 단계
+스크래퍼가 만든 dict 목록(trade_value/period/year/source)을
+TradeRecord 스키마(value_usd/date/unit)의 열 기반 배치로 한 번에 변환
+"""
+from array import array
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional
+import json
+import logging
+import math
+import operator
+
+from company_database import json_default
+from hs_index import normalize_hs_code
+
+from .countries import CountryIndex, get_country_index
+from .dedupe import batch_fingerprints
+
+# 숫자 열 변환/유효성 검사/단위 환산을 배열 연산으로 (requirements.txt에 포함, 없으면 값별 변환)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# TradeRecord 기본 컬럼 (나머지 키는 detailed_info JSON으로 저장)
+BASE_COLUMNS = (
+    'date', 'country_origin', 'country_destination', 'company_exporter',
+    'company_importer', 'product_code', 'product_description', 'quantity',
+    'unit', 'value_usd', 'trade_type', 'origin_code', 'destination_code', 'fingerprint'
+)
+
+# 입력에서 기본 컬럼으로 흡수되는 별칭 키
+_CONSUMED_KEYS = frozenset(BASE_COLUMNS) | {'trade_value', 'detailed_info'}
+
+# 수량 단위 → kg 환산 계수
+UNIT_FACTORS = {
+    'kg': 1.0, 'kgs': 1.0, 'kilogram': 1.0, 'kilograms': 1.0, 'kgm': 1.0,
+    'g': 0.001, 'gram': 0.001, 'grams': 0.001,
+    't': 1000.0, 'ton': 1000.0, 'tons': 1000.0, 'tonne': 1000.0, 'tonnes': 1000.0, 'mt': 1000.0,
+    '톤': 1000.0,
+    'lb': 0.45359237, 'lbs': 0.45359237, 'pound': 0.45359237, 'pounds': 0.45359237
+}
+
+# 거래 유형 표기 통일
+TRADE_TYPES = {
+    'import': 'import', 'imports': 'import', 'm': 'import', '수입': 'import',
+    'export': 'export', 'exports': 'export', 'x': 'export', '수출': 'export',
+    're-export': 'export', 're-exports': 'export', 're-import': 'import', 're-imports': 'import'
+}
+
+# 상품 코드가 HS 코드인 출처 - 이 출처의 코드만 표준형으로 통일
+# (FAOSTAT 품목 코드, USDA 상품군 코드 등 다른 체계의 숫자 코드를 HS 코드로 바꾸지 않도록)
+HS_CODE_SOURCES = frozenset({
+    'UN_Comtrade', 'UN_Comtrade_Bulk', 'Korea_Customs', 'KITA', 'KATI', 'SARS', 'Australian_Bureau',
+    'NZ_Stats', 'Canada_Stats', 'UK_Trade', 'Japan_Customs', 'Singapore_Trade', 'ITC_TradeMap',
+    'Trade_Data_Online', 'Global_Trade_Atlas', 'WorldBank_OpenData_Enhanced', 'Sample_Data'
+})
+
+_NUMBER_STRIP_TABLE = str.maketrans('', '', ', \xa0')
+
+
+class TradeBatch:
+    """TradeRecord 스키마에 맞춘 열 기반 배치"""
+
+    def __init__(self, columns: Dict[str, list]):
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns['date'])
+
+    def __getitem__(self, name: str) -> list:
+        return self.columns[name]
+
+    def to_mappings(self) -> List[Dict]:
+        """대량 삽입용 행 dict 목록으로 변환"""
+        names = list(self.columns)
+        return [dict(zip(names, row)) for row in zip(*(self.columns[name] for name in names))]
+
+    def select(self, mask: Iterable[bool]) -> 'TradeBatch':
+        """mask가 참인 행만 남긴 새 배치"""
+        keep = [index for index, flag in enumerate(mask) if flag]
+        selected = {}
+        for name, values in self.columns.items():
+            picked = [values[index] for index in keep]
+            selected[name] = array(values.typecode, picked) if isinstance(values, array) else picked
+        return TradeBatch(selected)
+
+    @classmethod
+    def concat(cls, batches: List['TradeBatch']) -> 'TradeBatch':
+        """여러 배치를 하나로 합침"""
+        if not batches:
+            return TradeRecordNormalizer().normalize([])
+        merged = {}
+        for name, values in batches[0].columns.items():
+            merged[name] = array(values.typecode) if isinstance(values, array) else []
+            for batch in batches:
+                merged[name].extend(batch.columns[name])
+        return cls(merged)
+
+
+class TradeRecordNormalizer:
+    """원시 무역 레코드 목록을 TradeBatch로 변환하는 표준화 단계
+
+    변환은 열 단위로 한 번에 수행하며, 날짜/국가/단위처럼 값의 종류가 적은 열은
+    서로 다른 값마다 한 번만 변환하고 결과를 재사용함.
+    """
+
+    def __init__(self, default_source: str = None, countries: CountryIndex = None, enrichment=None):
+        self.default_source = default_source
+        self.countries = countries or get_country_index()
+        self.enrichment = enrichment  # 지문 계산 후 적용할 상세 정보 단계 (EnrichmentStage, 선택)
+        self.today = date.today()
+
+    def normalize(self, records: List[Dict], extra_columns: Dict[str, list] = None) -> TradeBatch:
+        """레코드 목록을 한 번에 표준화
+
+        extra_columns는 레코드와 같은 순서의 추가 열 (예: 배치 상세 정보)로, None이 아닌 값만
+        detailed_info에 합쳐짐. 상세 정보 단계가 있으면 지문을 계산한 뒤 그 결과 열도 합침.
+        """
+        if extra_columns and not all(records):
+            keep = [index for index, record in enumerate(records) if record]
+            extra_columns = {name: [values[index] for index in keep] for name, values in extra_columns.items()}
+        records = [record for record in records if record]
+
+        def col(key, default=None):
+            return [record.get(key, default) for record in records]
+
+        # 금액: value_usd 우선, 없으면 스크래퍼의 trade_value
+        values = [
+            record['value_usd'] if record.get('value_usd') not in (None, '') else record.get('trade_value')
+            for record in records
+        ]
+
+        units, factors = self._normalize_units(col('unit'))
+        quantities = self._to_floats(col('quantity'), factors)
+
+        # 국가: 표기별로 한 번만 (표시명, alpha-3 코드)로 변환
+        origins = self._map_distinct(col('country_origin', ''), self.countries.resolve)
+        destinations = self._map_distinct(col('country_destination', ''), self.countries.resolve)
+
+        columns = {
+            'date': self._parse_dates(records),
+            'country_origin': [name for name, _ in origins],
+            'country_destination': [name for name, _ in destinations],
+            'company_exporter': [_text(value, 200) for value in col('company_exporter')],
+            'company_importer': [_text(value, 200) for value in col('company_importer')],
+            'product_code': self._map_distinct(
+                list(zip(col('product_code', ''), self._sources(records))), lambda pair: clean_product_code(*pair)
+            ),
+            'product_description': [_text(value, 500) for value in col('product_description', '')],
+            'quantity': quantities,
+            'unit': units,
+            'value_usd': self._to_floats(values),
+            'trade_type': self._map_distinct(col('trade_type', ''), _clean_trade_type),
+            'origin_code': [code for _, code in origins],
+            'destination_code': [code for _, code in destinations]
+        }
+        # 중복 판별용 레코드 지문 (상세 정보 시드로도 사용)
+        columns['fingerprint'] = batch_fingerprints(columns)
+
+        if self.enrichment is not None:
+            enriched = self.enrichment.apply(records, columns)
+            if enriched:
+                extra_columns = {**(extra_columns or {}), **enriched}
+        extras = self._extra_rows(extra_columns, len(records))
+        columns['detailed_info'] = [self._detailed_info(record, extra) for record, extra in zip(records, extras)]
+        return TradeBatch(columns)
+
+    def _parse_dates(self, records: List[Dict]) -> List[date]:
+        """date 값 또는 period/year 문자열에서 날짜 열 생성"""
+        cache = {}
+        dates = []
+        for record in records:
+            value = record.get('date')
+            if isinstance(value, datetime):
+                dates.append(value.date())
+                continue
+            if isinstance(value, date):
+                dates.append(value)
+                continue
+
+            key = (value or record.get('period') or '', record.get('year'))
+            parsed = cache.get(key)
+            if parsed is None:
+                parsed = cache[key] = self._parse_period(*key)
+            dates.append(parsed)
+        return dates
+
+    def _parse_period(self, period, year) -> date:
+        """기간 문자열(YYYY, YYYYMM, YYYY-MM, YYYYMMDD, YYYY-MM-DD)을 날짜로 변환"""
+        digits = ''.join(ch for ch in str(period) if ch.isdigit())
+        try:
+            if len(digits) >= 8:
+                return date(int(digits[:4]), int(digits[4:6]), int(digits[6:8]))
+            if len(digits) == 6:
+                return date(int(digits[:4]), int(digits[4:6]), 1)
+            if len(digits) == 4:
+                return date(int(digits), 1, 1)
+        except ValueError:
+            pass
+
+        try:
+            if year not in (None, ''):
+                return date(int(year), 1, 1)
+        except (ValueError, TypeError):
+            pass
+        return self.today
+
+    def _to_floats(self, values: List, factors: array = None) -> array:
+        """숫자 열 변환 (쉼표 포함 문자열 허용, 변환 불가/비유한 값은 0.0, factors가 있으면 행별 계수 적용)
+
+        numpy가 있으면 열 전체를 한 번에 변환하고 유효성 검사와 계수 적용도 배열 연산으로 처리.
+        쉼표/빈 문자열 등이 섞여 한 번에 변환되지 않는 열만 값별로 변환함.
+        """
+        if np is None:
+            numbers = array('d', map(_parse_number, values))
+            if factors is not None:
+                numbers = array('d', map(operator.mul, numbers, factors))
+            return numbers
+
+        try:
+            column = np.array(values, dtype=np.float64)
+        except (ValueError, TypeError):
+            column = np.fromiter(map(_parse_number, values), dtype=np.float64, count=len(values))
+        column[~np.isfinite(column)] = 0.0  # None(NaN)/inf 포함
+        if factors is not None:
+            column *= np.frombuffer(factors, dtype=np.float64)
+        numbers = array('d')
+        numbers.frombytes(column.tobytes())
+        return numbers
+
+    def _normalize_units(self, units: List):
+        """단위 열을 kg 기준으로 통일하고 행별 환산 계수 열을 반환"""
+        normalized = []
+        factors = array('d')
+        for unit, factor in zip(units, self._map_distinct(units, _unit_factor)):
+            if factor is None:
+                # 환산할 수 없는 단위 (개수 등)는 그대로 유지
+                normalized.append(_unit_key(unit)[:20])
+                factors.append(1.0)
+                continue
+            normalized.append('kg')
+            factors.append(factor)
+        return normalized, factors
+
+    def _sources(self, records: List[Dict]) -> List[Optional[str]]:
+        return [record.get('source') or self.default_source for record in records]
+
+    def _map_distinct(self, values: List, func: Callable) -> List:
+        """서로 다른 값마다 한 번만 func을 적용"""
+        cache = {}
+        result = []
+        for value in values:
+            key = value if value is not None else ''
+            mapped = cache.get(key)
+            if mapped is None:
+                mapped = cache[key] = func(key)
+            result.append(mapped)
+        return result
+
+    def _extra_rows(self, extra_columns: Optional[Dict[str, list]], count: int) -> List[Optional[Dict]]:
+        """추가 열을 행별 dict로 (값이 모두 None인 행은 None)"""
+        if not extra_columns:
+            return [None] * count
+        names = list(extra_columns)
+        return [
+            {name: value for name, value in zip(names, row) if value is not None} or None
+            for row in zip(*(extra_columns[name] for name in names))
+        ]
+
+    def _detailed_info(self, record: Dict, additions: Dict = None) -> Optional[str]:
+        """기본 컬럼 외 필드를 detailed_info JSON 문자열로 직렬화"""
+        extra = dict(record.get('detailed_info') or {})
+        for key, value in record.items():
+            if key not in _CONSUMED_KEYS:
+                extra[key] = value
+        if additions:
+            extra.update(additions)
+        if self.default_source and not extra.get('source'):
+            extra['source'] = self.default_source
+        if not extra:
+            return None
+        return json.dumps(extra, ensure_ascii=False, default=json_default)
+
+
+def _parse_number(value) -> float:
+    """숫자 값 하나를 변환 (쉼표 포함 문자열 허용, 변환 불가/비유한 값은 0.0)"""
+    if isinstance(value, (int, float)):
+        number = float(value)
+    elif value in (None, ''):
+        return 0.0
+    else:
+        try:
+            number = float(str(value).translate(_NUMBER_STRIP_TABLE))
+        except ValueError:
+            return 0.0
+    return number if math.isfinite(number) else 0.0
+
+
+def _unit_key(unit) -> str:
+    return str(unit).strip().lower() if unit else 'kg'
+
+
+def _unit_factor(unit) -> Optional[float]:
+    return UNIT_FACTORS.get(_unit_key(unit))
+
+
+def _text(value, max_length: int) -> Optional[str]:
+    if value is None:
+        return None
+    return str(value).strip()[:max_length]
+
+
+def clean_product_code(value, source: str = None) -> str:
+    """상품 코드 정리 - HS 코드 출처면 표준형으로 통일 (0802.50 / 80250 → 080250), 그 외 출처는 그대로"""
+    code = str(value if value is not None else '').strip()[:20]
+    if source in HS_CODE_SOURCES:
+        return normalize_hs_code(code) or code
+    return code
+
+
+def _clean_trade_type(value) -> str:
+    key = str(value).strip().lower()
+    return TRADE_TYPES.get(key, key[:10] or 'import')
+
+
+def normalize_records(records: List[Dict], default_source: str = None) -> TradeBatch:
+    """레코드 목록 표준화 단축 함수"""
+    return TradeRecordNormalizer(default_source=default_source).normalize(records)
@@ -0,0 +1,213 @@
+"""
+수집/상세 정보/저장 단계 분리 실행
+수집 스레드가 넘긴 원시 레코드 배치를 제한된 큐로 받아 프로세스 풀에서 표준화(지문 기반 상세 정보 포함)하고,
+결과를 제출 순서대로 단일 저장 스레드에 넘겨 세 단계가 겹쳐 실행되도록 함.
+큐가 가득 차면 submit()이 대기하여 수집 속도를 뒤 단계에 맞춤 (backpressure)
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+
+from .normalizer import TradeBatch, TradeRecordNormalizer
+from .enrichment import EAGER, EnrichmentStage
+
+logger = logging.getLogger(__name__)
+
+# 단계 사이 큐에 대기할 수 있는 배치 수
+DEFAULT_QUEUE_SIZE = 4
+
+_STOP = object()
+
+# 작업 프로세스별 표준화 단계 ((모드, 기본 출처)별 한 번 생성, 상세 정보 캐시 유지)
+_worker_normalizers = {}
+
+
+def normalize_batch(records: List[Dict], mode: str = EAGER, default_source: str = None) -> TradeBatch:
+    """작업 프로세스에서 레코드 배치를 상세 정보 포함 표준화
+
+    상세 정보는 레코드 지문의 순수 함수이므로 어느 프로세스에서 만들어도 같은 값이 나옴.
+    """
+    normalizer = _worker_normalizers.get((mode, default_source))
+    if normalizer is None:
+        normalizer = _worker_normalizers[(mode, default_source)] = TradeRecordNormalizer(
+            default_source=default_source, enrichment=EnrichmentStage(mode=mode)
+        )
+    return normalizer.normalize(records)
+
+
+class EnrichmentWorkers:
+    """상세 정보 생성용 프로세스 풀 (수집기 수명 동안 재사용)
+
+    processes가 0이거나 프로세스 풀을 쓸 수 없으면 파이프라인 스레드에서 직접 처리.
+    """
+
+    def __init__(self, processes: int = 2, mode: str = EAGER, default_source: str = None):
+        self.processes = max(0, processes)
+        self.mode = mode
+        self.default_source = default_source
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, records: List[Dict]) -> Future:
+        """배치 표준화 시작 (완료된 Future 또는 프로세스 풀 작업)"""
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                return executor.submit(normalize_batch, records, self.mode, self.default_source)
+            except (BrokenProcessPool, RuntimeError) as e:
+                logger.warning(f"상세 정보 프로세스 풀 사용 불가 - 스레드에서 처리: {e}")
+                self._disable()
+
+        future = Future()
+        try:
+            future.set_result(normalize_batch(records, self.mode, self.default_source))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _get_executor(self):
+        if self.processes == 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # 스레드가 있는 프로세스(gunicorn 등)에서 fork하지 않도록 forkserver/spawn 사용
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=context)
+            return self._executor
+
+    def _disable(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self.processes = 0
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+class StagedPipeline:
+    """수집 → 상세 정보/표준화 → 저장을 겹쳐 실행하는 한 번의 수집 실행
+
+    사용:
+        with StagedPipeline(workers, persist) as pipeline:
+            pipeline.submit(records)   # 수집 스레드
+        pipeline.stats                 # 종료 후 처리 통계
+
+    persist(batch)는 저장 스레드 하나에서 제출 순서대로 호출됨. 저장 스레드는 수집/요청 스레드와 동시에
+    실행되므로 DB 세션은 스레드별 세션(DatabaseManager.session)을 써야 하며, 저장 스레드가 끝날 때
+    release()를 호출하여 그 스레드의 세션을 반납함.
+    """
+
+    def __init__(self, workers: EnrichmentWorkers, persist: Callable[[TradeBatch], int],
+                 queue_size: int = DEFAULT_QUEUE_SIZE, release: Callable[[], None] = None):
+        self.workers = workers
+        self.persist = persist
+        self.release = release
+        self._raw = queue.Queue(maxsize=max(1, queue_size))
+        # 진행 중인 표준화 작업 (제출 순서 유지, 크기 제한으로 동시 작업 수도 제한)
+        self._ready = queue.Queue(maxsize=max(1, queue_size))
+        self._threads = []
+        self._lock = threading.Lock()
+        self.stats = {
+            'batches': 0,
+            'records_in': 0,
+            'records_out': 0,
+            'saved': 0,
+            'errors': [],
+            'backpressure_seconds': 0.0,
+            'persist_seconds': 0.0
+        }
+
+    def start(self) -> 'StagedPipeline':
+        for name, target in (('enrich', self._dispatch_loop), ('persist', self._persist_loop)):
+            thread = threading.Thread(target=target, name=f'pipeline-{name}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def submit(self, records: List[Dict]):
+        """원시 레코드 배치 투입 (큐가 가득 차면 자리가 날 때까지 대기)"""
+        if not records:
+            return
+        with self._lock:
+            self.stats['batches'] += 1
+            self.stats['records_in'] += len(records)
+        started = time.monotonic()
+        self._raw.put(records)
+        waited = time.monotonic() - started
+        if waited > 0.01:
+            with self._lock:
+                self.stats['backpressure_seconds'] += waited
+
+    def close(self) -> Dict:
+        """남은 배치를 모두 저장할 때까지 기다린 뒤 처리 통계 반환"""
+        self._raw.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self.stats['backpressure_seconds'] = round(self.stats['backpressure_seconds'], 3)
+        self.stats['persist_seconds'] = round(self.stats['persist_seconds'], 3)
+        return self.stats
+
+    def __enter__(self) -> 'StagedPipeline':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _dispatch_loop(self):
+        # 원시 배치를 프로세스 풀에 넘기고 작업을 순서대로 저장 단계 큐에 넣음
+        while True:
+            records = self._raw.get()
+            if records is _STOP:
+                self._ready.put(_STOP)
+                return
+            self._ready.put((len(records), self.workers.submit(records)))
+
+    def _persist_loop(self):
+        try:
+            self._persist_batches()
+        finally:
+            if self.release is not None:
+                try:
+                    self.release()
+                except Exception as e:
+                    logger.warning(f"저장 스레드 자원 반납 오류: {e}")
+
+    def _persist_batches(self):
+        while True:
+            item = self._ready.get()
+            if item is _STOP:
+                return
+            count, future = item
+            try:
+                batch = future.result()
+            except Exception as e:
+                logger.error(f"상세 정보/표준화 단계 오류 ({count}건): {e}")
+                self._record_error(str(e))
+                continue
+
+            started = time.monotonic()
+            try:
+                saved = self.persist(batch)
+            except Exception as e:
+                logger.error(f"저장 단계 오류 ({len(batch)}건): {e}")
+                self._record_error(str(e))
+                saved = 0
+            with self._lock:
+                self.stats['records_out'] += len(batch)
+                self.stats['saved'] += saved
+                self.stats['persist_seconds'] += time.monotonic() - started
+
+    def _record_error(self, message: str):
+        with self._lock:
+            self.stats['errors'].append(message)
@@ -0,0 +1,227 @@
+"""
+제품 카탈로그 팩 파일
+data/product_catalog.json(원본)을 키 정렬 색인 + 레코드별 압축 JSON 블록의 팩 파일로 만들고,
+실행 시에는 팩 파일을 메모리 매핑하여 처음 접근하는 레코드만 디코딩함.
+매핑된 페이지는 같은 서버의 모든 워커 프로세스가 공유
+
+팩 파일 재생성:
+    python product_catalog.py build
+"""
+from collections.abc import Mapping
+from typing import Dict, Iterator, Optional, Tuple
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SOURCE_PATH = os.path.join(DATA_DIR, 'product_catalog.json')
+PACK_PATH = os.path.join(DATA_DIR, 'product_catalog.pack')
+
+# 원본 JSON의 섹션 (팩 파일에 같은 이름으로 저장)
+SECTIONS = ('products', 'hs_code_info', 'categories')
+
+MAGIC = b'PCATPK01'
+_HEADER_LENGTH = struct.Struct('<I')
+# 색인 항목: 키 위치, 키 길이, 값 위치, 값 길이 (키 바이트 정렬 순)
+_ENTRY = struct.Struct('<IHII')
+_ORDER = struct.Struct('<I')
+
+
+class PackedSection(Mapping):
+    """팩 파일 한 섹션의 읽기 전용 매핑
+
+    키 조회는 정렬 색인의 이진 탐색, 값은 처음 접근할 때 디코딩하여 보관.
+    순회 순서는 원본 JSON의 순서.
+    """
+
+    def __init__(self, buffer, meta: Dict):
+        self._buffer = buffer
+        self._count = meta['count']
+        self._index = meta['index']
+        self._order = meta['order']
+        self._decoded = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, position: int) -> Tuple[int, int, int, int]:
+        return _ENTRY.unpack_from(self._buffer, self._index + position * _ENTRY.size)
+
+    def _key_at(self, position: int) -> bytes:
+        key_offset, key_length, _, _ = self._entry(position)
+        return self._buffer[key_offset:key_offset + key_length]
+
+    def _find(self, key: str) -> Optional[int]:
+        target = key.encode('utf-8')
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._key_at(low) == target:
+            return low
+        return None
+
+    def __getitem__(self, key):
+        value = self._decoded.get(key)
+        if value is not None:
+            return value
+        position = self._find(key) if isinstance(key, str) else None
+        if position is None:
+            raise KeyError(key)
+        _, _, value_offset, value_length = self._entry(position)
+        value = json.loads(self._buffer[value_offset:value_offset + value_length].decode('utf-8'))
+        with self._lock:
+            return self._decoded.setdefault(key, value)
+
+    def __contains__(self, key) -> bool:
+        return key in self._decoded or (isinstance(key, str) and self._find(key) is not None)
+
+    def __iter__(self) -> Iterator[str]:
+        for rank in range(self._count):
+            (position,) = _ORDER.unpack_from(self._buffer, self._order + rank * _ORDER.size)
+            yield self._key_at(position).decode('utf-8')
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class ProductCatalog:
+    """메모리 매핑된 제품 카탈로그 (섹션별 PackedSection)"""
+
+    def __init__(self, path: str = PACK_PATH):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'제품 카탈로그 팩 파일 형식 오류: {path}')
+        (header_length,) = _HEADER_LENGTH.unpack_from(self._mmap, len(MAGIC))
+        start = len(MAGIC) + _HEADER_LENGTH.size
+        self.header = json.loads(self._mmap[start:start + header_length].decode('utf-8'))
+        self.sections = {name: PackedSection(self._mmap, meta) for name, meta in self.header['sections'].items()}
+
+    def section(self, name: str) -> Mapping:
+        return self.sections[name]
+
+
+def build_pack(source_path: str = SOURCE_PATH, pack_path: str = PACK_PATH) -> Dict:
+    """원본 JSON에서 팩 파일 생성 (임시 파일에 쓴 뒤 교체)"""
+    with open(source_path, 'rb') as f:
+        raw = f.read()
+    data = json.loads(raw)
+
+    tables = {}
+    for name in SECTIONS:
+        items = list(data.get(name, {}).items())
+        encoded = []
+        for key, value in items:
+            key_bytes = key.encode('utf-8')
+            value_bytes = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            encoded.append((key_bytes, value_bytes))
+        ranked = sorted(range(len(encoded)), key=lambda index: encoded[index][0])
+        tables[name] = (encoded, ranked)
+
+    # 섹션 위치가 헤더 길이에 따라 달라지므로 헤더가 자리에 들어갈 때까지 다시 배치
+    def layout(header_length: int) -> Tuple[Dict, bytes]:
+        offset = len(MAGIC) + _HEADER_LENGTH.size + header_length
+        sections = {}
+        body = bytearray()
+        for name in SECTIONS:
+            encoded, ranked = tables[name]
+            index_offset = offset + len(body)
+            order_offset = index_offset + len(ranked) * _ENTRY.size
+            data_offset = order_offset + len(ranked) * _ORDER.size
+            index = bytearray()
+            payload = bytearray()
+            for original in ranked:
+                key_bytes, value_bytes = encoded[original]
+                key_offset = data_offset + len(payload)
+                payload += key_bytes
+                value_offset = data_offset + len(payload)
+                payload += value_bytes
+                index += _ENTRY.pack(key_offset, len(key_bytes), value_offset, len(value_bytes))
+            position_of = {original: position for position, original in enumerate(ranked)}
+            order = b''.join(_ORDER.pack(position_of[original]) for original in range(len(encoded)))
+            body += index + order + payload
+            sections[name] = {'count': len(ranked), 'index': index_offset, 'order': order_offset}
+        header = {
+            'source_digest': hashlib.blake2b(raw, digest_size=16).hexdigest(),
+            'sections': sections
+        }
+        return header, bytes(body)
+
+    header_length = 0
+    while True:
+        header, body = layout(header_length)
+        header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+        if len(header_bytes) <= header_length:
+            header_bytes = header_bytes.ljust(header_length)
+            break
+        header_length = len(header_bytes) + 16
+
+    temp_path = f'{pack_path}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(MAGIC + _HEADER_LENGTH.pack(header_length) + header_bytes + body)
+    os.replace(temp_path, pack_path)
+    counts = {name: meta['count'] for name, meta in header['sections'].items()}
+    logger.info(f"제품 카탈로그 팩 생성: {pack_path} ({os.path.getsize(pack_path)} bytes, {counts})")
+    return counts
+
+
+def is_pack_current(source_path: str = SOURCE_PATH, pack_path: str = PACK_PATH) -> bool:
+    """팩 파일이 원본 JSON과 같은 내용으로 만들어졌는지 (배포 전 확인용)"""
+    try:
+        with open(source_path, 'rb') as f:
+            digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        return ProductCatalog(pack_path).header.get('source_digest') == digest
+    except (OSError, ValueError):
+        return False
+
+
+class _JsonCatalog:
+    """팩 파일이 없을 때 원본 JSON을 그대로 읽는 대체 카탈로그"""
+
+    def __init__(self, path: str = SOURCE_PATH):
+        with open(path, encoding='utf-8') as f:
+            self.sections = json.load(f)
+
+    def section(self, name: str) -> Mapping:
+        return self.sections.get(name, {})
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_product_catalog():
+    """프로세스 전체에서 공유하는 제품 카탈로그 (최초 접근 시 팩 파일 매핑)"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                try:
+                    _catalog = ProductCatalog()
+                except (OSError, ValueError) as e:
+                    logger.warning(f"제품 카탈로그 팩 파일을 사용할 수 없어 원본 JSON 사용: {e}")
+                    _catalog = _JsonCatalog()
+    return _catalog
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    command = sys.argv[1] if len(sys.argv) > 1 else 'build'
+    if command == 'build':
+        build_pack()
+    elif command == 'check':
+        current = is_pack_current()
+        print('팩 파일 최신' if current else '팩 파일 재생성 필요: python product_catalog.py build')
+        sys.exit(0 if current else 1)
+    else:
+        print('사용법: python product_catalog.py [build|check]')
+        sys.exit(2)
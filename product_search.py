@@ -0,0 +1,246 @@
+"""
+제품/HS 코드 검색 색인
+제품 키/이름/HS 코드/코드 설명을 토큰 역색인과 접두어 트라이로 한 번만 색인하고,
+필드 가중치(제품명 > HS 코드 > 설명)와 일치 종류(완전/접두어/부분)로 순위를 매김.
+오타/부분 입력은 용어 3-gram 색인의 자카드 유사도로 찾음 (fuzzy 검색)
+"""
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+import heapq
+import logging
+import math
+import re
+import threading
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+# 필드 가중치
+FIELD_WEIGHTS = {
+    'key': 3.0,
+    'name': 3.0,
+    'code': 2.0,
+    'description': 1.0
+}
+
+# 일치 종류별 가중치 (토큰 전체 / 접두어 / 한글 합성어 안쪽)
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.6
+INFIX_MATCH = 0.4
+
+# 검색 결과 캐시 크기 (정규화된 질의 기준)
+QUERY_CACHE_SIZE = 1024
+
+# fuzzy 검색 기본 유사도 하한 (3-gram 자카드)과 결과 수
+FUZZY_THRESHOLD = 0.3
+FUZZY_LIMIT = 10
+
+_TOKEN_PATTERN = re.compile(r'[가-힣]+|[^\W_]+')
+
+
+def _is_hangul(token: str) -> bool:
+    return '가' <= token[0] <= '힣'
+
+
+def _stem(token: str) -> str:
+    """영어 복수형 정리 (nuts → nut, cherries → cherry, tomatoes → tomato)"""
+    if len(token) <= 3 or not token.isascii() or not token.isalpha():
+        return token
+    if token.endswith('ies'):
+        return token[:-3] + 'y'
+    if token.endswith(('oes', 'ches', 'shes', 'xes', 'sses')):
+        return token[:-2]
+    if token.endswith('s') and not token.endswith(('ss', 'us')):
+        return token[:-1]
+    return token
+
+
+def trigrams(term: str) -> FrozenSet[str]:
+    """용어 경계 표시('$')를 붙인 문자 3-gram 집합 (한글은 음절 단위)"""
+    padded = f'${term}$'
+    return frozenset(padded[index:index + 3] for index in range(len(padded) - 2))
+
+
+def tokenize(text) -> List[str]:
+    """검색용 토큰 목록 (NFKC 정규화, 대소문자 무시, 영어 복수형 정리, HS 코드의 점 제거)"""
+    text = unicodedata.normalize('NFKC', str(text or '')).casefold()
+    text = re.sub(r'(?<=\d)\.(?=\d)', '', text)
+    return [_stem(token) for token in _TOKEN_PATTERN.findall(text)]
+
+
+class PrefixTrie:
+    """용어 접두어 트라이 - 노드마다 그 아래의 용어 목록을 미리 모아 두어 접두어 조회를 한 번의 순회로 끝냄"""
+
+    def __init__(self, terms: Iterable[str]):
+        self.root = {}
+        for term in sorted(set(terms)):
+            node = self.root
+            for char in term:
+                node = node.setdefault(char, {})
+                node.setdefault('', []).append(term)
+
+    def complete(self, prefix: str) -> Tuple[str, ...]:
+        """prefix로 시작하는 용어"""
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return ()
+        return tuple(node.get('', ()))
+
+
+class ProductSearchIndex:
+    """제품 검색 역색인
+
+    용어마다 (제품 번호 → 가장 높은 필드 가중치) 게시 목록을 두고, 한글 토큰은
+    합성어 안쪽 검색('고기' → 쇠고기/돼지고기)을 위해 접미어도 색인함.
+    """
+
+    def __init__(self, products: Dict[str, Dict]):
+        self.products = []
+        postings = {}   # 용어 → {제품 번호: 필드 가중치}
+        infixes = {}    # 한글 접미어 → {제품 번호: 필드 가중치}
+
+        for doc_id, (key, product) in enumerate(products.items()):
+            self.products.append({'key': key, 'name': product['name'], 'codes': product['codes']})
+            fields = [('key', key), ('name', product['name'])]
+            for code in product['codes']:
+                fields.append(('code', code['code']))
+                fields.append(('description', code['description']))
+
+            for field, text in fields:
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenize(text):
+                    self._post(postings, token, doc_id, weight)
+                    if _is_hangul(token):
+                        for start in range(1, len(token)):
+                            self._post(infixes, token[start:], doc_id, weight)
+
+        self.postings = postings
+        self.infixes = infixes
+        self.trie = PrefixTrie(postings)
+        self.infix_trie = PrefixTrie(infixes)
+        self._build_trigrams()
+        self._cached_search = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._search)
+        self._cached_fuzzy = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._fuzzy_search)
+        logger.debug(f"제품 검색 색인: 제품 {len(self.products)}개, 용어 {len(postings)}개, 한글 접미어 {len(infixes)}개")
+
+    def _build_trigrams(self):
+        """용어별 3-gram 집합과 3-gram → 용어 번호 게시 목록 (목록 길이 = 3-gram 빈도)"""
+        self.terms = tuple(self.postings)
+        self.term_grams = tuple(trigrams(term) for term in self.terms)
+        gram_postings = {}
+        for term_id, grams in enumerate(self.term_grams):
+            for gram in grams:
+                gram_postings.setdefault(gram, []).append(term_id)
+        self.gram_postings = {gram: tuple(term_ids) for gram, term_ids in gram_postings.items()}
+
+    @staticmethod
+    def _post(postings: Dict, term: str, doc_id: int, weight: float):
+        docs = postings.setdefault(term, {})
+        if docs.get(doc_id, 0.0) < weight:
+            docs[doc_id] = weight
+
+    def search(self, query: str, limit: int = None) -> List[Dict]:
+        """질의의 모든 토큰과 일치하는 제품을 점수 순으로 반환 (결과 dict는 공유되므로 수정 금지)"""
+        tokens = tuple(tokenize(query))
+        if not tokens:
+            return []
+        results = self._cached_search(tokens)
+        return list(results[:limit] if limit else results)
+
+    def _search(self, tokens: Tuple[str, ...]) -> Tuple[Dict, ...]:
+        scores = None
+        for token in tokens:
+            token_scores = self._match(token)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {doc_id: score + token_scores[doc_id] for doc_id, score in scores.items() if doc_id in token_scores}
+            if not scores:
+                return ()
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.products[item[0]]['key']))
+        return tuple({**self.products[doc_id], 'score': round(score, 3)} for doc_id, score in ranked)
+
+    def fuzzy_search(self, query: str, limit: int = FUZZY_LIMIT, threshold: float = FUZZY_THRESHOLD) -> List[Dict]:
+        """오타/부분 입력 허용 검색 - 질의 토큰마다 3-gram 유사도가 가장 높은 용어로 점수를 매겨 상위 limit개 반환
+
+        일부 토큰만 일치해도 결과에 포함되며 점수는 토큰별 (유사도 × 필드 가중치)의 합.
+        """
+        tokens = tuple(tokenize(query))
+        if not tokens:
+            return []
+        return list(self._cached_fuzzy(tokens, limit, threshold))
+
+    def _fuzzy_search(self, tokens: Tuple[str, ...], limit: int, threshold: float) -> Tuple[Dict, ...]:
+        scores = {}
+        for token in tokens:
+            best = {}
+            for term_id, similarity in self._similar_terms(token, threshold):
+                for doc_id, weight in self.postings[self.terms[term_id]].items():
+                    score = similarity * weight
+                    if best.get(doc_id, 0.0) < score:
+                        best[doc_id] = score
+            for doc_id, score in best.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return tuple({**self.products[doc_id], 'score': round(score, 3)} for doc_id, score in top)
+
+    def _similar_terms(self, token: str, threshold: float) -> List[Tuple[int, float]]:
+        """자카드 유사도가 threshold 이상인 (용어 번호, 유사도)
+
+        유사도 θ 이상인 용어는 질의 3-gram 중 최소 ceil(θ·|q|)개를 공유해야 하므로, 문서 빈도가 낮은
+        3-gram부터 |q| - ceil(θ·|q|) + 1개의 게시 목록만 후보로 모은 뒤 길이 조건과 정확한 유사도로 확인.
+        """
+        grams = trigrams(token)
+        size = len(grams)
+        probe = size - math.ceil(threshold * size) + 1
+        rare_first = sorted(grams, key=lambda gram: len(self.gram_postings.get(gram, ())))
+        candidates = set()
+        for gram in rare_first[:probe]:
+            candidates.update(self.gram_postings.get(gram, ()))
+
+        similar = []
+        min_size, max_size = threshold * size, size / threshold if threshold > 0 else math.inf
+        for term_id in candidates:
+            term_grams = self.term_grams[term_id]
+            if not min_size <= len(term_grams) <= max_size:
+                continue
+            shared = len(grams & term_grams)
+            similarity = shared / (size + len(term_grams) - shared)
+            if similarity >= threshold:
+                similar.append((term_id, similarity))
+        return similar
+
+    def _match(self, token: str) -> Dict[int, float]:
+        """토큰 하나의 제품별 점수 (용어/필드 조합 중 가장 높은 값)"""
+        scores = {}
+        sources = (
+            (self.trie.complete(token), self.postings, PREFIX_MATCH),
+            (self.infix_trie.complete(token), self.infixes, INFIX_MATCH)
+        )
+        for terms, postings, factor in sources:
+            for term in terms:
+                match = EXACT_MATCH if term == token and postings is self.postings else factor
+                for doc_id, weight in postings[term].items():
+                    score = match * weight
+                    if scores.get(doc_id, 0.0) < score:
+                        scores[doc_id] = score
+        return scores
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_product_search_index() -> ProductSearchIndex:
+    """프로세스 전체에서 공유하는 제품 검색 색인 (최초 검색 시 생성)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from product_database import PRODUCT_HS_MAPPING
+                _index = ProductSearchIndex(PRODUCT_HS_MAPPING)
+    return _index
@@ -0,0 +1,238 @@
+"""
+선적 항구/운송 경로 매트릭스
+항구/공항 목록과 항로 정보를 data/shipping_routes.json에서 한 번만 적재하여
+출발/도착 항구 쌍별 거리, 운송 일수, 취항 선사(항공편은 항공사)를 배열 색인 표로 미리 계산.
+경로는 같은 운송 수단끼리만 있음 (항구 ↔ 항구, 공항 ↔ 공항)
+"""
+from array import array
+from collections import namedtuple
+from types import MappingProxyType
+from typing import Dict, Optional, Tuple
+import json
+import logging
+import math
+import os
+import threading
+
+from pipeline.countries import canonical_country_code
+
+logger = logging.getLogger(__name__)
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'shipping_routes.json')
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_NM = 1.852
+
+# 운송 수단 (데이터 파일의 항구 mode 값)
+MODES = ('sea', 'air')
+
+# 경로가 없는 항구 쌍의 운송 일수 자리 값
+NO_ROUTE = 0xFFFF
+
+# 항구 쌍 경로 (origin/destination은 항구 상세 정보)
+Route = namedtuple('Route', ['origin', 'destination', 'mode', 'distance_nm', 'transit_days', 'carriers'])
+
+
+def _great_circle_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+def _carrier_table(entries) -> Tuple[list, Dict[str, set], set]:
+    """운송사 선언 [이름, 취항국 목록 또는 '*'] → (선언 순서, 국가별 운송사, 전 구간 운송사)"""
+    by_country = {}
+    everywhere = set()
+    for name, served in entries:
+        if served == '*':
+            everywhere.add(name)
+        else:
+            for country in served:
+                by_country.setdefault(country, set()).add(name)
+    return [name for name, _ in entries], by_country, everywhere
+
+
+class RouteMatrix:
+    """항구 쌍별 경로 표 (조회는 색인 계산 한 번)
+
+    항구 i → j 경로는 routes[i * 항구 수 + j] (운송 수단이 다른 쌍은 None), 국가 쌍별 경로 목록은
+    lanes[국가 i * 국가 수 + 국가 j], 운송 수단별 최단 경로는 fastest[수단][국가 i * 국가 수 + 국가 j]에
+    항구 쌍 색인으로 저장 (-1은 경로 없음). 반환 값은 모든 호출자가 공유하는 읽기 전용 객체.
+    """
+
+    def __init__(self, path: str = DATA_PATH):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+
+        columns = data['port_columns']
+        rows = [dict(zip(columns, row)) for row in data['ports']]
+        # 항구 상세 정보 (port_name/port_code는 기존 항구 정보 형식과 같은 키)
+        self.ports = tuple(
+            MappingProxyType({
+                'port_name': row['name'], 'port_code': row['code'], 'country': row['country'], 'mode': row['mode'],
+                'location': row['location'], 'facilities': row['facilities'],
+                'operating_hours': row['operating_hours'], 'contact': row['contact']
+            })
+            for row in rows
+        )
+        self.port_index = {port['port_code']: index for index, port in enumerate(self.ports)}
+        self._port_by_name = {port['port_name'].casefold(): index for index, port in enumerate(self.ports)}
+
+        # 국가별 선적/하역 항구 (데이터 파일 순서 = 대표 항구 우선)
+        self.countries = tuple(dict.fromkeys(row['country'] for row in rows))
+        self.country_index = {code: index for index, code in enumerate(self.countries)}
+        loading = [[] for _ in self.countries]
+        discharge = [[] for _ in self.countries]
+        for index, row in enumerate(rows):
+            target = loading if row['role'] == 'loading' else discharge
+            target[self.country_index[row['country']]].append(index)
+        self.loading_by_country = tuple(tuple(indexes) for indexes in loading)
+        self.discharge_by_country = tuple(tuple(indexes) for indexes in discharge)
+        self._loading_ports = tuple(tuple(self.ports[port] for port in ports) for ports in self.loading_by_country)
+        self._discharge_ports = tuple(tuple(self.ports[port] for port in ports) for ports in self.discharge_by_country)
+        self._country_slots = {}  # 국가 표기 → 국가 색인 (표기별로 한 번만 변환)
+
+        self.routes, self.transit_days = self._build_routes(data, rows)
+        self.lanes = self._build_lanes()
+        self.fastest = {mode: self._build_fastest(mode) for mode in MODES}
+        self._fallback_ports = {}
+        self._fallback_lock = threading.Lock()
+        logger.debug(f"항로 매트릭스 적재: 항구 {len(self.ports)}개, 경로 {len(self.ports) ** 2}개")
+
+    def _build_routes(self, data: Dict, rows) -> Tuple[tuple, array]:
+        """같은 운송 수단 항구 쌍별 거리/운송 일수/운송사 계산 (항구 ↔ 공항 쌍은 경로 없음)"""
+        speed_nm_per_day = data['speed_knots'] * 24
+        air_km_per_day = data['air_speed_kmh'] * 24
+        lane_distances = data['lane_distances_nm']
+        carrier_tables = {'sea': _carrier_table(data['carriers']), 'air': _carrier_table(data.get('air_carriers', []))}
+        lane_carriers = {}
+
+        routes = []
+        transit_days = array('H')
+        for origin_index, origin in enumerate(rows):
+            for destination_index, destination in enumerate(rows):
+                mode = origin['mode']
+                if destination['mode'] != mode:
+                    routes.append(None)
+                    transit_days.append(NO_ROUTE)
+                    continue
+
+                km = _great_circle_km(origin['lat'], origin['lon'], destination['lat'], destination['lon'])
+                lane = (origin['country'], destination['country'])
+                if mode == 'air':
+                    distance_nm = km / KM_PER_NM
+                    days = math.ceil(km / air_km_per_day) + data['air_handling_days']
+                else:
+                    distance_nm = lane_distances.get('-'.join(lane)) or lane_distances.get('-'.join(reversed(lane))) \
+                        or km / KM_PER_NM * data['sea_route_factor']
+                    days = math.ceil(distance_nm / speed_nm_per_day) + data['port_days']
+
+                carriers = lane_carriers.get((mode, lane))
+                if carriers is None:
+                    order, by_country, everywhere = carrier_tables[mode]
+                    served = by_country.get(lane[0], set()) & by_country.get(lane[1], set())
+                    carriers = lane_carriers[(mode, lane)] = tuple(
+                        name for name in order if name in served or name in everywhere
+                    )
+                routes.append(Route(self.ports[origin_index], self.ports[destination_index],
+                                    mode, round(distance_nm), days, carriers))
+                transit_days.append(days)
+        return tuple(routes), transit_days
+
+    def _build_lanes(self) -> tuple:
+        """국가 쌍별 경로가 있는 (선적 항구, 하역 항구) 쌍 색인 목록"""
+        size = len(self.ports)
+        return tuple(
+            tuple(a * size + b for a in origins for b in destinations if self.routes[a * size + b] is not None)
+            for origins in self.loading_by_country
+            for destinations in self.discharge_by_country
+        )
+
+    def _build_fastest(self, mode: str) -> array:
+        """국가 쌍별 해당 운송 수단 경로 중 운송 일수가 가장 짧은 항구 쌍 색인"""
+        fastest = array('i', [-1] * len(self.lanes))
+        for slot, pairs in enumerate(self.lanes):
+            pairs = [pair for pair in pairs if self.routes[pair].mode == mode]
+            if pairs:
+                fastest[slot] = min(pairs, key=self.transit_days.__getitem__)
+        return fastest
+
+    def _country(self, country: str) -> Optional[int]:
+        try:
+            return self._country_slots[country]
+        except KeyError:
+            code = canonical_country_code(country)
+            slot = self._country_slots[country] = self.country_index.get(code) if code else None
+            return slot
+
+    def loading_ports(self, country: str) -> Tuple[MappingProxyType, ...]:
+        """출발국 선적 항구 (대표 항구 우선)"""
+        index = self._country(country)
+        return self._loading_ports[index] if index is not None else ()
+
+    def discharge_ports(self, country: str) -> Tuple[MappingProxyType, ...]:
+        """도착국 하역 항구 (대표 항구 우선)"""
+        index = self._country(country)
+        return self._discharge_ports[index] if index is not None else ()
+
+    def route(self, origin_port: str, destination_port: str) -> Optional[Route]:
+        """항구 코드 또는 항구명 쌍의 경로"""
+        origin = self._port(origin_port)
+        destination = self._port(destination_port)
+        if origin is None or destination is None:
+            return None
+        return self.routes[origin * len(self.ports) + destination]
+
+    def _port(self, port: str) -> Optional[int]:
+        index = self.port_index.get(port)
+        if index is None and port:
+            index = self._port_by_name.get(port.casefold())
+        return index
+
+    def routes_between(self, origin_country: str, destination_country: str) -> Tuple[Route, ...]:
+        """국가 쌍의 모든 경로 (선적 항구 × 하역 항구 중 운송 수단이 같은 쌍)"""
+        origin = self._country(origin_country)
+        destination = self._country(destination_country)
+        if origin is None or destination is None:
+            return ()
+        return tuple(self.routes[pair] for pair in self.lanes[origin * len(self.countries) + destination])
+
+    def fastest_route(self, origin_country: str, destination_country: str, mode: str = 'sea') -> Optional[Route]:
+        """국가 쌍의 운송 수단별 최단 경로 (물류 분석용, 해상과 항공은 따로 비교)"""
+        origin = self._country(origin_country)
+        destination = self._country(destination_country)
+        if origin is None or destination is None or mode not in self.fastest:
+            return None
+        pair = self.fastest[mode][origin * len(self.countries) + destination]
+        return self.routes[pair] if pair >= 0 else None
+
+    def port_details(self, country: str) -> MappingProxyType:
+        """국가 대표 항구 상세 정보 (등록되지 않은 국가는 기본 정보)"""
+        index = self._country(country)
+        if index is not None:
+            ports = self.loading_by_country[index] or self.discharge_by_country[index]
+            if ports:
+                return self.ports[ports[0]]
+        fallback = self._fallback_ports.get(country)
+        if fallback is None:
+            with self._fallback_lock:
+                fallback = self._fallback_ports.setdefault(country, MappingProxyType({
+                    'port_name': f'{country} International Port',
+                    'port_code': f'{country[:2].upper()}XXX',
+                    'facilities': 'Standard port facilities'
+                }))
+        return fallback
+
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+def get_route_matrix() -> RouteMatrix:
+    """프로세스 전체에서 공유하는 항로 매트릭스 (최초 호출 시 적재)"""
+    global _matrix
+    if _matrix is None:
+        with _matrix_lock:
+            if _matrix is None:
+                _matrix = RouteMatrix()
+    return _matrix
@@ -5,7 +5,7 @@ from datetime import datetime
 from data_scraper import MacadamiaTradeDataScraper
 from ai_agent import MacadamiaTradeAIAgent
 from config import Config
-from telegram_notifier import send_daily_summary, send_system_alert
+from telegram_notifier import send_daily_summary, send_new_data_alert, send_system_alert
 
 # Excel reporting is optional (requires pandas)
 try:
@@ -20,8 +20,9 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class MacadamiaTradeScheduler:
-    def __init__(self):
-        self.scraper = MacadamiaTradeDataScraper()
+    def __init__(self, scraper: MacadamiaTradeDataScraper = None):
+        # 앱 컴포넌트의 수집기를 넘겨받으면 공유 (DB 연결/세션 중복 생성 방지)
+        self.scraper = scraper or MacadamiaTradeDataScraper()
         self.ai_agent = MacadamiaTradeAIAgent()
         self.excel_reporter = MacadamiaTradeExcelReporter() if EXCEL_AVAILABLE else None
         self.config = Config()
@@ -31,16 +32,19 @@ class MacadamiaTradeScheduler:
         logger.info("일일 마카다미아 무역 데이터 수집 시작 (과거 1년간 데이터 확인)...")
         
         try:
-            # 과거 1년간 데이터 수집 및 중복 제거 (알림 포함)
-            result = self.scraper.collect_historical_data_and_notify()
+            # 현재/과거 소스 수집 및 중복 제거 (직전 스냅샷 대비 델타 포함)
+            result = self.scraper.collect_daily_update()
             
             if result['success']:
                 logger.info(f"전체 확인: {result['total_checked']}건, 신규 발견: {result['new_found']}건, 저장: {result['saved']}건")
+                delta = result['delta']
                 
-                # 신규 데이터가 있는 경우에만 AI 분석 수행
-                if result['saved'] > 0:
+                # 신규 데이터가 있는 경우에만 AI 분석 수행 (델타만 사용)
+                if delta['records'] > 0:
+                    send_new_data_alert(delta)
+                    
                     # AI 분석 및 보고서 생성
-                    report = self.ai_agent.generate_daily_report()
+                    report = self.ai_agent.generate_delta_report(delta)
                     
                     # 마크다운 보고서 저장
                     self.save_daily_report(report)
@@ -86,36 +90,33 @@ class MacadamiaTradeScheduler:
     def _generate_daily_summary(self, collection_result: dict = None) -> dict:
         """일일 요약 데이터 생성"""
         try:
-            # 오늘 새로 추가된 데이터 정보
-            if collection_result:
-                new_records_count = collection_result.get('saved', 0)
-                total_checked = collection_result.get('total_checked', 0)
-            else:
-                new_records_count = 0
-                total_checked = 0
-            
-            # 최근 1일 데이터 가져오기
-            records = self.scraper.db.get_latest_records(1)
-            
-            total_value = sum(record.value_usd or 0 for record in records)
+            # 오늘 새로 추가된 데이터 정보 (수집 델타 기준, DB 재조회 없음)
+            collection_result = collection_result or {}
+            delta = collection_result.get('delta') or {}
+            new_records_count = collection_result.get('saved', 0)
+            total_checked = collection_result.get('total_checked', 0)
             
-            # 국가별 집계
+            # 국가별 집계 (신규 경로/기간/수정 기간의 추가분)
             country_stats = {}
-            for record in records:
-                country = record.country_origin
-                if country not in country_stats:
-                    country_stats[country] = {'value': 0, 'count': 0}
-                country_stats[country]['value'] += record.value_usd or 0
-                country_stats[country]['count'] += 1
+            additions = [(entry['origin'], entry['value_usd'], entry['records']) for entry in delta.get('new_routes', [])]
+            additions += [(entry['origin'], entry['value_usd'], entry['records']) for entry in delta.get('new_periods', [])]
+            additions += [
+                (entry['origin'], entry['value_usd'] - entry['previous_value'], entry['added_records'])
+                for entry in delta.get('revised_periods', [])
+            ]
+            for country, value, count in additions:
+                stats = country_stats.setdefault(country, {'value': 0, 'count': 0})
+                stats['value'] += value
+                stats['count'] += count
             
             # 상위 국가
             top_countries = sorted(country_stats.items(), key=lambda x: x[1]['value'], reverse=True)[:5]
             
             return {
-                'total_records': len(records),
+                'total_records': delta.get('records', 0),
                 'new_records_today': new_records_count,
                 'total_checked': total_checked,
-                'total_value': total_value,
+                'total_value': delta.get('value_usd', 0),
                 'top_countries': top_countries,
                 'date': datetime.now().strftime('%Y-%m-%d')
             }
@@ -1,11 +1,12 @@
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
-import time
+from typing import List, Dict, Iterator
 import logging
 import os
 import random
 from datetime import datetime, timedelta
+from .table_extractor import iter_table_rows, parse_numbers, column
+from .json_stream import iter_json_items, iter_mapped_batches, DEFAULT_BATCH_SIZE
+from .source_registry import SourceSpec, SourceRegistry, SourceOrchestrator
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,28 +18,32 @@ class AdditionalSourcesScraper:
         self.session = session
         self.is_railway = os.getenv('RAILWAY_ENVIRONMENT') is not None
         
+    def source_specs(self) -> List[SourceSpec]:
+        """수집 소스 선언"""
+        return [
+            SourceSpec('KITA', self._scrape_kita_data, host='stat.kita.net', cost=2),
+            SourceSpec('FAOSTAT', self.iter_faostat_batches, host='fenixservices.fao.org',
+                       cost=2, freshness=timedelta(hours=24), streaming=True),
+            SourceSpec('World_Bank', self._scrape_worldbank_data, host='api.worldbank.org',
+                       freshness=timedelta(hours=24)),
+            SourceSpec('Trading_Economics', self._scrape_trading_economics_data, host='tradingeconomics.com'),
+            SourceSpec('USDA', self._scrape_usda_data, host='apps.fas.usda.gov',
+                       freshness=timedelta(hours=24)),
+            SourceSpec('Eurostat', self._scrape_eurostat_data, host='ec.europa.eu',
+                       freshness=timedelta(hours=24))
+        ]
+    
     def scrape_additional_real_sources(self) -> List[Dict]:
         """추가 실제 데이터 소스들에서 무역 데이터 수집"""
         all_trade_data = []
         
-        # 각 소스별로 데이터 수집
-        sources = [
-            self._scrape_kita_data,
-            self._scrape_faostat_data, 
-            self._scrape_worldbank_data,
-            self._scrape_trading_economics_data,
-            self._scrape_usda_data,
-            self._scrape_eurostat_data
-        ]
+        # 등록된 소스를 병렬로 수집
+        registry = SourceRegistry()
+        registry.register_all(self.source_specs())
+        result = SourceOrchestrator(registry).run(force=True)
         
-        for scraper_func in sources:
-            try:
-                data = scraper_func()
-                all_trade_data.extend(data)
-                time.sleep(2)  # 소스간 간격
-            except Exception as e:
-                logger.error(f"{scraper_func.__name__} 데이터 수집 오류: {e}")
-                continue
+        for records in result['records'].values():
+            all_trade_data.extend(records)
                 
         logger.info(f"추가 소스에서 총 {len(all_trade_data)}건 수집")
         return all_trade_data
@@ -61,27 +66,26 @@ class AdditionalSourcesScraper:
                     response = self.session.get(url, timeout=30)
                     
                     if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
+                        # KITA 통계 테이블 찾기 (테이블 하위 트리만 파싱)
+                        rows = list(iter_table_rows(response.content, table_class='table', min_cells=4))
+                        values = parse_numbers(column(rows, 2))
+                        quantities = parse_numbers(column(rows, 3))
+                        period = datetime.now().strftime('%Y%m')
+                        year = datetime.now().year
                         
-                        # KITA 통계 테이블 찾기
-                        tables = soup.find_all('table', class_='table')
-                        for table in tables:
-                            rows = table.find_all('tr')
-                            for row in rows[1:]:  # 헤더 제외
-                                cells = row.find_all(['td', 'th'])
-                                if len(cells) >= 4:
-                                    trade_data.append({
-                                        'country_origin': cells[0].get_text(strip=True),
-                                        'country_destination': 'Korea',
-                                        'product_code': '080250',
-                                        'product_description': '견과류(마카다미아)',
-                                        'trade_value': self._parse_number(cells[2].get_text(strip=True)),
-                                        'quantity': self._parse_number(cells[3].get_text(strip=True)),
-                                        'trade_type': 'import',
-                                        'period': datetime.now().strftime('%Y%m'),
-                                        'year': datetime.now().year,
-                                        'source': 'KITA'
-                                    })
+                        for cells, value, quantity in zip(rows, values, quantities):
+                            trade_data.append({
+                                'country_origin': cells[0],
+                                'country_destination': 'Korea',
+                                'product_code': '080250',
+                                'product_description': '견과류(마카다미아)',
+                                'trade_value': value,
+                                'quantity': quantity,
+                                'trade_type': 'import',
+                                'period': period,
+                                'year': year,
+                                'source': 'KITA'
+                            })
                         
                         if trade_data:
                             break
@@ -98,7 +102,12 @@ class AdditionalSourcesScraper:
     def _scrape_faostat_data(self) -> List[Dict]:
         """FAOSTAT 농업 무역 데이터 수집"""
         trade_data = []
-        
+        for batch in self.iter_faostat_batches():
+            trade_data.extend(batch)
+        return trade_data
+    
+    def iter_faostat_batches(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict]]:
+        """FAOSTAT 농업 무역 데이터를 배치 단위로 스트리밍 수집"""
         try:
             logger.info("FAOSTAT 농업 무역 데이터 수집 시도...")
             
@@ -113,33 +122,36 @@ class AdditionalSourcesScraper:
                 'format': 'json'
             }
             
-            response = self.session.get(url, params=params, timeout=30)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if 'data' in data:
-                    for record in data['data']:
-                        trade_data.append({
-                            'country_origin': record.get('ReporterCountry', ''),
-                            'country_destination': 'Korea',
-                            'product_code': record.get('ItemCode', ''),
-                            'product_description': record.get('Item', '견과류'),
-                            'trade_value': record.get('Value', 0),
-                            'quantity': 0,  # FAOSTAT에서는 별도 필드
-                            'trade_type': 'import',
-                            'period': record.get('Year', ''),
-                            'year': int(record.get('Year', datetime.now().year)),
-                            'source': 'FAOSTAT'
-                        })
+            # 대용량 응답을 소켓에서 바로 요소 단위로 디코딩
+            with self.session.get(url, params=params, timeout=30, stream=True) as response:
+                if response.status_code == 200:
+                    count = 0
+                    for batch in iter_mapped_batches(iter_json_items(response, 'data.item'),
+                                                     self._map_faostat_record, batch_size):
+                        count += len(batch)
+                        yield batch
                     
-                    logger.info(f"FAOSTAT에서 {len(trade_data)}건 수집")
-            else:
-                logger.warning(f"FAOSTAT API 호출 실패: {response.status_code}")
+                    logger.info(f"FAOSTAT에서 {count}건 수집")
+                else:
+                    logger.warning(f"FAOSTAT API 호출 실패: {response.status_code}")
                 
         except Exception as e:
             logger.error(f"FAOSTAT 데이터 수집 오류: {e}")
-            
-        return trade_data
+    
+    def _map_faostat_record(self, record: Dict) -> Dict:
+        """FAOSTAT 레코드를 표준 무역 레코드로 변환"""
+        return {
+            'country_origin': record.get('ReporterCountry', ''),
+            'country_destination': 'Korea',
+            'product_code': record.get('ItemCode', ''),
+            'product_description': record.get('Item', '견과류'),
+            'trade_value': record.get('Value', 0),
+            'quantity': 0,  # FAOSTAT에서는 별도 필드
+            'trade_type': 'import',
+            'period': record.get('Year', ''),
+            'year': int(record.get('Year', datetime.now().year)),
+            'source': 'FAOSTAT'
+        }
     
     def _scrape_worldbank_data(self) -> List[Dict]:
         """World Bank 무역 데이터 수집"""
@@ -199,27 +211,24 @@ class AdditionalSourcesScraper:
             response = self.session.get(url, timeout=30)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
+                # 수입 통계 테이블 찾기 (테이블 하위 트리만 파싱)
+                rows = list(iter_table_rows(response.content, min_cells=3))
+                values = parse_numbers(column(rows, 1))
+                year = datetime.now().year
                 
-                # 수입 통계 테이블 찾기
-                tables = soup.find_all('table')
-                for table in tables:
-                    rows = table.find_all('tr')
-                    for row in rows[1:]:
-                        cells = row.find_all(['td', 'th'])
-                        if len(cells) >= 3:
-                            trade_data.append({
-                                'country_origin': 'Global',
-                                'country_destination': 'Korea',
-                                'product_code': 'TOTAL',
-                                'product_description': '전체 수입',
-                                'trade_value': self._parse_number(cells[1].get_text(strip=True)),
-                                'quantity': 0,
-                                'trade_type': 'import',
-                                'period': cells[0].get_text(strip=True),
-                                'year': datetime.now().year,
-                                'source': 'Trading_Economics'
-                            })
+                for cells, value in zip(rows, values):
+                    trade_data.append({
+                        'country_origin': 'Global',
+                        'country_destination': 'Korea',
+                        'product_code': 'TOTAL',
+                        'product_description': '전체 수입',
+                        'trade_value': value,
+                        'quantity': 0,
+                        'trade_type': 'import',
+                        'period': cells[0],
+                        'year': year,
+                        'source': 'Trading_Economics'
+                    })
                 
                 logger.info(f"Trading Economics에서 {len(trade_data)}건 수집")
                 
@@ -312,12 +321,3 @@ class AdditionalSourcesScraper:
             logger.error(f"Eurostat 데이터 수집 오류: {e}")
             
         return trade_data
-    
-    def _parse_number(self, text: str) -> float:
-        """텍스트에서 숫자 추출"""
-        try:
-            # 쉼표, 공백 제거 후 숫자 변환
-            cleaned = text.replace(',', '').replace(' ', '').strip()
-            return float(cleaned) if cleaned else 0.0
-        except (ValueError, AttributeError):
-            return 0.0
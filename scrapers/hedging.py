@@ -0,0 +1,149 @@
+"""
+대체 엔드포인트 동시 요청 (hedged request) 도구
+같은 데이터를 제공하는 여러 엔드포인트에 동시에 요청하여 처음 유효한 결과를 사용하고,
+엔드포인트별 지연/성공률 통계로 다음 요청 순서를 정함
+"""
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class EndpointStats:
+    """엔드포인트별 지연(EWMA)과 성공/실패 통계"""
+
+    def __init__(self, alpha: float = 0.3, default_latency: float = 5.0):
+        self.alpha = alpha                      # 지연 이동평균 가중치
+        self.default_latency = default_latency  # 측정 이력이 없는 엔드포인트의 예상 지연 (초)
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _entry(self, endpoint: str) -> Dict:
+        return self._stats.setdefault(endpoint, {
+            'ewma_latency': None,
+            'successes': 0,
+            'failures': 0,
+            'last_error': None
+        })
+
+    def record_success(self, endpoint: str, latency: float):
+        with self._lock:
+            entry = self._entry(endpoint)
+            entry['successes'] += 1
+            self._update_latency(entry, latency)
+
+    def record_failure(self, endpoint: str, latency: float, error: str = None):
+        with self._lock:
+            entry = self._entry(endpoint)
+            entry['failures'] += 1
+            entry['last_error'] = error
+            self._update_latency(entry, latency)
+
+    def _update_latency(self, entry: Dict, latency: float):
+        previous = entry['ewma_latency']
+        entry['ewma_latency'] = latency if previous is None else self.alpha * latency + (1 - self.alpha) * previous
+
+    def expected_cost(self, endpoint: str) -> float:
+        """성공까지의 기대 소요 시간 = 평균 지연 / 성공률 (성공률은 라플라스 보정)"""
+        with self._lock:
+            entry = self._stats.get(endpoint)
+            if entry is None:
+                return self.default_latency / 0.5
+            latency = entry['ewma_latency'] if entry['ewma_latency'] is not None else self.default_latency
+            success_rate = (entry['successes'] + 1) / (entry['successes'] + entry['failures'] + 2)
+            return latency / success_rate
+
+    def order(self, endpoints: List[str]) -> List[str]:
+        """기대 소요 시간이 짧은 순서 (동률이면 원래 순서 유지)"""
+        return sorted(endpoints, key=self.expected_cost)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                endpoint: {**entry, 'ewma_latency': round(entry['ewma_latency'], 3)
+                           if entry['ewma_latency'] is not None else None}
+                for endpoint, entry in self._stats.items()
+            }
+
+
+def race_first_success(endpoints: List[str], fetch: Callable[[str, threading.Event], List[Dict]],
+                       stats: EndpointStats = None, timeout: float = 30.0, hedge_delay: float = 0.0,
+                       is_valid: Callable[[List[Dict]], bool] = bool) -> Tuple[Optional[str], List[Dict]]:
+    """엔드포인트를 순서대로 시작하여 처음 유효한 결과를 반환
+
+    Args:
+        endpoints: 시도할 엔드포인트 (앞쪽이 먼저 시작)
+        fetch: (엔드포인트, 취소 이벤트) → 결과. 취소 이벤트가 설정되면 본문을 읽지 말고 종료
+        stats: 결과를 기록할 엔드포인트 통계
+        timeout: 전체 대기 제한 (초)
+        hedge_delay: 다음 엔드포인트를 추가로 시작하기 전 대기 (0이면 모두 동시에,
+                     inf면 앞 엔드포인트가 실패했을 때만 다음을 시작하는 순차 모드)
+        is_valid: 결과 유효성 판정
+
+    Returns:
+        (결과를 낸 엔드포인트, 결과) - 모두 실패하면 (None, [])
+    """
+    if not endpoints:
+        return None, []
+
+    cancelled = threading.Event()
+    queue = list(endpoints)
+    futures = {}
+    deadline = time.monotonic() + timeout
+    executor = ThreadPoolExecutor(max_workers=len(endpoints), thread_name_prefix='hedge')
+
+    def launch():
+        endpoint = queue.pop(0)
+        future = executor.submit(fetch, endpoint, cancelled)
+        futures[future] = (endpoint, time.monotonic())
+        return future
+
+    try:
+        pending = {launch()}
+        while queue and hedge_delay <= 0:
+            pending.add(launch())
+
+        while pending or queue:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"대체 엔드포인트 대기 시간 초과 ({timeout:g}초)")
+                break
+            if not pending:
+                # 시작한 엔드포인트가 모두 실패하면 다음 엔드포인트를 바로 시작
+                pending.add(launch())
+                continue
+
+            wait_for = min(remaining, hedge_delay) if queue else remaining
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                endpoint, started = futures[future]
+                latency = time.monotonic() - started
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"엔드포인트 실패: {endpoint} ({e})")
+                    if stats:
+                        stats.record_failure(endpoint, latency, str(e))
+                    continue
+
+                if is_valid(result):
+                    if stats:
+                        stats.record_success(endpoint, latency)
+                    logger.info(f"가장 빠른 유효 응답: {endpoint} ({latency:.2f}초)")
+                    return endpoint, result
+                if stats:
+                    stats.record_failure(endpoint, latency, 'no data')
+
+            # 대기 중 응답이 없으면 다음 엔드포인트를 추가로 시작 (hedge)
+            if not done and queue and time.monotonic() < deadline:
+                pending.add(launch())
+
+        return None, []
+    finally:
+        # 남은 요청은 취소 이벤트를 보고 본문을 읽지 않고 종료
+        cancelled.set()
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -1,11 +1,12 @@
 import requests
 from bs4 import BeautifulSoup
 from typing import List, Dict
-import time
 import logging
 import os
 import random
 from datetime import datetime, timedelta
+from .source_registry import SourceSpec
+from .table_extractor import iter_table_rows, parse_numbers, column
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,10 +14,37 @@ logger = logging.getLogger(__name__)
 class HistoricalDataScraper:
     """과거 데이터 전용 스크래퍼"""
     
+    # 수집 대상 연도
+    YEARS = (2019, 2020, 2021, 2022, 2023)
+    
     def __init__(self, session):
         self.session = session
         self.is_railway = os.getenv('RAILWAY_ENVIRONMENT') is not None
         
+    def source_specs(self) -> List[SourceSpec]:
+        """수집 소스 선언 (과거 무역 통계 - 실제 호출 호스트별로 호출 간격/서킷 브레이커 적용)"""
+        sources = [
+            ('ITC_TradeMap', self._scrape_itc_data, 'www.trademap.org'),
+            ('Trade_Data_Online', self._scrape_trade_data_online, 'www.tradedataonline.com'),
+            ('Global_Trade_Atlas', self._scrape_global_trade_atlas, 'www.gtis.com')
+        ]
+        return [
+            SourceSpec(f'{name}_Historical', lambda scrape=scrape: self._scrape_years(scrape),
+                       host=host, rate_limit=1.0, cost=4, timeout=300,
+                       freshness=timedelta(days=7), group='historical')
+            for name, scrape, host in sources
+        ]
+    
+    def _scrape_years(self, scrape) -> List[Dict]:
+        """한 소스의 연도별 데이터 수집"""
+        trade_data = []
+        for year in self.YEARS:
+            try:
+                trade_data.extend(scrape(year))
+            except Exception as e:
+                logger.error(f"{year}년 데이터 수집 오류: {e}")
+        return trade_data
+    
     def scrape_historical_trade_statistics(self) -> List[Dict]:
         """과거 무역 통계 데이터 수집"""
         trade_data = []
@@ -25,12 +53,9 @@ class HistoricalDataScraper:
             logger.info("과거 무역 통계 데이터 수집 시작...")
             
             # 각 연도별로 다양한 소스에서 수집
-            years = [2019, 2020, 2021, 2022, 2023]
-            
-            for year in years:
+            for year in self.YEARS:
                 year_data = self._scrape_year_data(year)
                 trade_data.extend(year_data)
-                time.sleep(1)  # 년도간 간격
                 
         except Exception as e:
             logger.error(f"과거 데이터 수집 중 오류: {e}")
@@ -71,27 +96,24 @@ class HistoricalDataScraper:
             response = self.session.get(url, timeout=30)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
+                # 무역 통계 테이블 찾기 (테이블 하위 트리만 파싱)
+                rows = list(iter_table_rows(response.content, table_class='table', min_cells=4))
+                values = parse_numbers(column(rows, 2))
+                quantities = parse_numbers(column(rows, 3))
                 
-                # 무역 통계 테이블 찾기
-                tables = soup.find_all('table', class_='table')
-                for table in tables:
-                    rows = table.find_all('tr')
-                    for row in rows[1:]:  # 헤더 제외
-                        cells = row.find_all(['td', 'th'])
-                        if len(cells) >= 4:
-                            trade_data.append({
-                                'country_origin': cells[0].get_text(strip=True),
-                                'country_destination': 'Korea',
-                                'product_code': '080250',
-                                'product_description': '견과류',
-                                'trade_value': self._parse_number(cells[2].get_text(strip=True)),
-                                'quantity': self._parse_number(cells[3].get_text(strip=True)),
-                                'trade_type': 'import',
-                                'period': f'{year}',
-                                'year': year,
-                                'source': 'ITC_TradeMap'
-                            })
+                for cells, value, quantity in zip(rows, values, quantities):
+                    trade_data.append({
+                        'country_origin': cells[0],
+                        'country_destination': 'Korea',
+                        'product_code': '080250',
+                        'product_description': '견과류',
+                        'trade_value': value,
+                        'quantity': quantity,
+                        'trade_type': 'import',
+                        'period': f'{year}',
+                        'year': year,
+                        'source': 'ITC_TradeMap'
+                    })
                             
         except Exception as e:
             logger.error(f"ITC {year}년 데이터 수집 오류: {e}")
@@ -172,12 +194,3 @@ class HistoricalDataScraper:
             logger.error(f"Global Trade Atlas {year}년 데이터 수집 오류: {e}")
             
         return trade_data
-    
-    def _parse_number(self, text: str) -> float:
-        """텍스트에서 숫자 추출"""
-        try:
-            # 쉼표, 공백 제거 후 숫자 변환
-            cleaned = text.replace(',', '').replace(' ', '').strip()
-            return float(cleaned) if cleaned else 0.0
-        except (ValueError, AttributeError):
-            return 0.0
@@ -0,0 +1,103 @@
+"""
+프로세스 전체 공유 HTTP 클라이언트
+모든 스크래퍼가 하나의 requests.Session을 공유하여 호스트별 연결 풀과
+keep-alive 연결(TCP/TLS 핸드셰이크)을 수집 실행 간에 재사용
+"""
+from typing import Dict
+import logging
+import os
+import threading
+
+import requests
+from urllib3.util.request import ACCEPT_ENCODING
+
+from .resilience import ResilientAdapter, get_circuit_breakers, get_host_rate_limiter
+
+# h2는 선택 사항 (텔레그램 httpx 클라이언트의 HTTP/2 사용 여부)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 호스트별 연결 풀 크기 (동시에 여러 요청을 보내는 호스트만 크게)
+HOST_POOL_SIZES = {
+    'comtradeapi.un.org': 4,
+    'unipass.customs.go.kr': 4,
+    'www.customs.go.kr': 4,
+    'fenixservices.fao.org': 2,
+    'api.worldbank.org': 2,
+    'www.tradedataonline.com': 4,
+    'www.gtis.com': 4,
+    'www.trademap.org': 4
+}
+DEFAULT_POOL_SIZE = 4
+
+# 풀을 유지할 최대 호스트 수 (등록된 수집 소스 호스트 수보다 크게)
+MAX_POOLED_HOSTS = 32
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _default_headers() -> Dict[str, str]:
+    is_railway = os.getenv('RAILWAY_ENVIRONMENT') is not None
+    return {
+        'User-Agent': 'MacadamiaTradeBot/1.0 (Railway Cloud Environment)' if is_railway else 'MacadamiaTradeBot/1.0',
+        'Accept': 'application/json',
+        'Accept-Language': 'en-US,en;q=0.9',
+        # urllib3가 해제할 수 있는 인코딩만 요청 (brotli 설치 시 br 포함)
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'Connection': 'keep-alive'
+    }
+
+
+def create_http_session() -> requests.Session:
+    """호스트별 연결 풀 어댑터(호출 간격 + 백오프 재시도 + 서킷 브레이커)를 장착한 새 세션 생성"""
+    session = requests.Session()
+    session.headers.update(_default_headers())
+    breakers = get_circuit_breakers()
+    rate_limiter = get_host_rate_limiter()
+
+    default_adapter = ResilientAdapter(breakers, rate_limiter=rate_limiter,
+                                       pool_connections=MAX_POOLED_HOSTS, pool_maxsize=DEFAULT_POOL_SIZE)
+    session.mount('https://', default_adapter)
+    session.mount('http://', default_adapter)
+
+    for host, pool_size in HOST_POOL_SIZES.items():
+        adapter = ResilientAdapter(breakers, rate_limiter=rate_limiter, pool_connections=1, pool_maxsize=pool_size)
+        session.mount(f'https://{host}', adapter)
+        session.mount(f'http://{host}', adapter)
+
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """프로세스 전체에서 공유하는 세션 (최초 호출 시 생성)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_http_session()
+                logger.info(f"공유 HTTP 세션 생성 (Accept-Encoding: {ACCEPT_ENCODING})")
+    return _session
+
+
+def close_http_session():
+    """공유 세션의 연결 풀 정리 (프로세스 종료 시)"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def create_telegram_request(connection_pool_size: int = 8):
+    """텔레그램 Bot용 httpx 요청 객체 (h2 설치 시 HTTP/2)"""
+    from telegram.request import HTTPXRequest
+    return HTTPXRequest(
+        connection_pool_size=connection_pool_size,
+        http_version='2' if HTTP2_AVAILABLE else '1.1'
+    )
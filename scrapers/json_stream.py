@@ -0,0 +1,65 @@
+"""
+대용량 JSON API 응답 스트리밍 디코딩 유틸리티
+응답 본문 전체를 메모리에 올리지 않고 배열 요소를 하나씩 디코딩
+"""
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import logging
+
+# ijson은 선택 사항 (없으면 response.json()으로 대체)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    ijson = None
+    IJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 하위 단계로 전달하는 기본 배치 크기
+DEFAULT_BATCH_SIZE = 1000
+
+
+def iter_json_items(response, prefix: str = 'data.item') -> Iterator:
+    """응답 본문에서 prefix 경로의 배열 요소를 하나씩 생성
+
+    prefix는 ijson 표기법을 따름 ('data.item' = 최상위 'data' 배열의 각 요소).
+    stream=True로 요청한 응답이어야 소켓에서 바로 디코딩됨.
+
+    Raises:
+        ValueError: JSON 형식이 올바르지 않은 경우
+    """
+    if IJSON_AVAILABLE:
+        # gzip/deflate 전송 인코딩 해제 후 디코딩
+        response.raw.decode_content = True
+        try:
+            yield from ijson.items(response.raw, prefix, use_float=True)
+        except ijson.JSONError as e:
+            raise ValueError(f"JSON 스트림 디코딩 오류: {e}") from e
+        return
+
+    # 대체 경로: 전체 본문 디코딩 후 경로 탐색
+    node = response.json()
+    for key in prefix.split('.'):
+        if key == 'item':
+            break
+        node = node.get(key) if isinstance(node, dict) else None
+        if node is None:
+            return
+    if isinstance(node, list):
+        yield from node
+
+
+def iter_mapped_batches(items: Iterable, mapper: Callable[[Dict], Optional[Dict]],
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict]]:
+    """요소를 즉시 변환하여 batch_size 단위 목록으로 생성 (None 결과는 제외)"""
+    batch = []
+    for item in items:
+        mapped = mapper(item)
+        if mapped is None:
+            continue
+        batch.append(mapped)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -1,11 +1,13 @@
 import requests
-from bs4 import BeautifulSoup
 from typing import List, Dict
-import time
 import logging
 import os
 import random
+import threading
 from datetime import datetime, timedelta
+from .source_registry import SourceSpec
+from .table_extractor import iter_table_rows, parse_numbers, column
+from .hedging import EndpointStats, race_first_success
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,10 +15,31 @@ logger = logging.getLogger(__name__)
 class KoreaCustomsScraper:
     """한국 관세청 데이터 스크래퍼"""
     
-    def __init__(self, session):
+    # 관세청 수출입무역통계 대체 엔드포인트 (같은 데이터를 제공)
+    API_ENDPOINTS = [
+        "https://unipass.customs.go.kr:38010/ext/rest/expDclrNtceQry/expDclrNtceQry",
+        "https://www.customs.go.kr/kcs/na/ntt/selectNttList.do",
+        "https://unipass.customs.go.kr:38010/ext/rest/expImpDclrQry/expImpDclrQry"
+    ]
+    REQUEST_TIMEOUT = 30
+    HEDGE_DELAY = 0.0  # 0이면 모든 엔드포인트를 동시에 시작
+    
+    def __init__(self, session, hedged: bool = True):
         self.session = session
         self.is_railway = os.getenv('RAILWAY_ENVIRONMENT') is not None
+        self.hedged = hedged  # False면 빠른 순서대로 하나씩 시도
+        self.endpoint_stats = EndpointStats()
         
+    def source_specs(self) -> List[SourceSpec]:
+        """수집 소스 선언 (현재 데이터는 unipass와 www 엔드포인트를 함께 사용, 과거 데이터는 unipass만)"""
+        return [
+            SourceSpec('Korea_Customs', self.scrape_current_data, host='unipass.customs.go.kr',
+                       fallback_hosts=('www.customs.go.kr',), rate_limit=1.0, cost=3, timeout=120,
+                       freshness=timedelta(hours=12)),
+            SourceSpec('Korea_Customs_Historical', self.scrape_historical_data, host='unipass.customs.go.kr',
+                       rate_limit=2.0, cost=4, timeout=180, freshness=timedelta(days=7), group='historical')
+        ]
+    
     def scrape_current_data(self) -> List[Dict]:
         """한국 관세청 데이터 수집 (실제 데이터)"""
         trade_data = []
@@ -24,98 +47,32 @@ class KoreaCustomsScraper:
         try:
             logger.info("한국 관세청 공개 API 호출 시도...")
             
-            # 관세청 수출입무역통계 API 시도
-            apis_to_try = [
-                "https://unipass.customs.go.kr:38010/ext/rest/expDclrNtceQry/expDclrNtceQry",
-                "https://www.customs.go.kr/kcs/na/ntt/selectNttList.do",
-                "https://unipass.customs.go.kr:38010/ext/rest/expImpDclrQry/expImpDclrQry"
-            ]
+            # 마카다미아 관련 파라미터
+            params = {
+                'hsSgn': '080250',  # 마카다미아 HS 코드
+                'expDclYy': '2024',
+                'stYm': '202401',
+                'edYm': '202412',
+                'cntyCd': '036',  # 호주
+                'format': 'json'
+            }
             
-            for api_url in apis_to_try:
-                try:
-                    logger.info(f"API 시도: {api_url}")
-                    
-                    # 마카다미아 관련 파라미터
-                    params = {
-                        'hsSgn': '080250',  # 마카다미아 HS 코드
-                        'expDclYy': '2024',
-                        'stYm': '202401',
-                        'edYm': '202412',
-                        'cntyCd': '036',  # 호주
-                        'format': 'json'
-                    }
-                    
-                    response = self.session.get(api_url, params=params, timeout=30)
-                    
-                    if response.status_code == 200:
-                        # 다양한 형태의 응답 처리
-                        content_type = response.headers.get('content-type', '').lower()
-                        
-                        if 'json' in content_type:
-                            try:
-                                data = response.json()
-                                if isinstance(data, dict) and ('expDclrNtceQryRtnVo' in data or 'data' in data):
-                                    # 관세청 API 응답 구조에 맞게 파싱
-                                    items = data.get('expDclrNtceQryRtnVo', {}).get('ntceQryRsltList', [])
-                                    if not items:
-                                        items = data.get('data', [])
-                                    
-                                    for item in items:
-                                        trade_data.append({
-                                            'country_origin': item.get('expCntyCd', ''),
-                                            'country_destination': 'Korea',
-                                            'product_code': item.get('hsSgn', ''),
-                                            'product_description': item.get('prdlstNm', '마카다미아'),
-                                            'trade_value': item.get('expUsdAmt', 0),
-                                            'quantity': item.get('expKg', 0),
-                                            'trade_type': 'import',
-                                            'period': item.get('expDclYy', ''),
-                                            'year': int(item.get('expDclYy', datetime.now().year)),
-                                            'source': 'Korea_Customs'
-                                        })
-                                    
-                                    if trade_data:
-                                        logger.info(f"관세청에서 {len(trade_data)}건 데이터 수집")
-                                        break
-                                else:
-                                    logger.warning("관세청 API 응답에 예상 데이터 없음")
-                            except ValueError as e:
-                                logger.error(f"관세청 JSON 파싱 오류: {e}")
-                        else:
-                            # HTML 응답인 경우 웹 스크래핑 시도
-                            soup = BeautifulSoup(response.content, 'html.parser')
-                            
-                            # 관세청 웹사이트에서 무역통계 테이블 찾기
-                            tables = soup.find_all('table')
-                            for table in tables:
-                                rows = table.find_all('tr')
-                                for row in rows[1:]:  # 헤더 제외
-                                    cells = row.find_all(['td', 'th'])
-                                    if len(cells) >= 5:
-                                        trade_data.append({
-                                            'country_origin': cells[0].get_text(strip=True),
-                                            'country_destination': 'Korea',
-                                            'product_code': '080250',
-                                            'product_description': '마카다미아',
-                                            'trade_value': self._parse_number(cells[2].get_text(strip=True)),
-                                            'quantity': self._parse_number(cells[3].get_text(strip=True)),
-                                            'trade_type': 'import',
-                                            'period': datetime.now().strftime('%Y%m'),
-                                            'year': datetime.now().year,
-                                            'source': 'Korea_Customs'
-                                        })
-                            
-                            if trade_data:
-                                logger.info(f"관세청 웹사이트에서 {len(trade_data)}건 데이터 수집")
-                                break
-                    else:
-                        logger.warning(f"관세청 API 호출 실패: {response.status_code}")
-                    
-                    time.sleep(1)  # API 호출 제한 준수
-                    
-                except Exception as e:
-                    logger.error(f"관세청 API {api_url} 호출 오류: {e}")
-                    continue
+            # 과거 지연/성공률 기준으로 빠른 엔드포인트부터 시작
+            endpoints = self.endpoint_stats.order(self.API_ENDPOINTS)
+            if self.hedged:
+                # 대체 엔드포인트를 동시에 요청하고 처음 유효한 결과 사용
+                timeout, hedge_delay = self.REQUEST_TIMEOUT, self.HEDGE_DELAY
+            else:
+                # 앞 엔드포인트가 실패했을 때만 다음 엔드포인트 시도
+                timeout, hedge_delay = self.REQUEST_TIMEOUT * len(endpoints), float('inf')
+            
+            endpoint, trade_data = race_first_success(
+                endpoints, lambda url, cancelled: self._fetch_current_data(url, params, cancelled),
+                self.endpoint_stats, timeout=timeout, hedge_delay=hedge_delay
+            )
+            
+            if trade_data:
+                logger.info(f"관세청 {endpoint}에서 {len(trade_data)}건 데이터 수집")
                     
         except Exception as e:
             logger.error(f"관세청 데이터 수집 중 오류: {e}")
@@ -123,6 +80,74 @@ class KoreaCustomsScraper:
         logger.info(f"관세청에서 총 {len(trade_data)}건 수집")
         return trade_data
     
+    def _fetch_current_data(self, api_url: str, params: Dict, cancelled: threading.Event) -> List[Dict]:
+        """엔드포인트 하나를 호출하여 표준 레코드로 변환 (다른 엔드포인트가 먼저 끝나면 본문을 읽지 않음)"""
+        logger.info(f"API 시도: {api_url}")
+        
+        with self.session.get(api_url, params=params, timeout=self.REQUEST_TIMEOUT, stream=True) as response:
+            if cancelled.is_set():
+                return []
+            
+            if response.status_code != 200:
+                logger.warning(f"관세청 API 호출 실패: {response.status_code}")
+                return []
+            
+            # 다양한 형태의 응답 처리
+            content_type = response.headers.get('content-type', '').lower()
+            if 'json' in content_type:
+                try:
+                    return self._parse_api_items(response.json())
+                except ValueError as e:
+                    logger.error(f"관세청 JSON 파싱 오류: {e}")
+                    return []
+            
+            # HTML 응답인 경우 웹 스크래핑 시도 (테이블 하위 트리만 파싱)
+            return self._parse_statistics_table(response.content)
+    
+    def _parse_api_items(self, data) -> List[Dict]:
+        """관세청 API 응답 구조에 맞게 파싱"""
+        if not isinstance(data, dict) or not ('expDclrNtceQryRtnVo' in data or 'data' in data):
+            logger.warning("관세청 API 응답에 예상 데이터 없음")
+            return []
+        
+        items = data.get('expDclrNtceQryRtnVo', {}).get('ntceQryRsltList', [])
+        if not items:
+            items = data.get('data', [])
+        
+        return [{
+            'country_origin': item.get('expCntyCd', ''),
+            'country_destination': 'Korea',
+            'product_code': item.get('hsSgn', ''),
+            'product_description': item.get('prdlstNm', '마카다미아'),
+            'trade_value': item.get('expUsdAmt', 0),
+            'quantity': item.get('expKg', 0),
+            'trade_type': 'import',
+            'period': item.get('expDclYy', ''),
+            'year': int(item.get('expDclYy', datetime.now().year)),
+            'source': 'Korea_Customs'
+        } for item in items]
+    
+    def _parse_statistics_table(self, content: bytes) -> List[Dict]:
+        """관세청 웹사이트 무역통계 테이블 행 변환"""
+        rows = list(iter_table_rows(content, min_cells=5))
+        values = parse_numbers(column(rows, 2))
+        quantities = parse_numbers(column(rows, 3))
+        period = datetime.now().strftime('%Y%m')
+        year = datetime.now().year
+        
+        return [{
+            'country_origin': cells[0],
+            'country_destination': 'Korea',
+            'product_code': '080250',
+            'product_description': '마카다미아',
+            'trade_value': value,
+            'quantity': quantity,
+            'trade_type': 'import',
+            'period': period,
+            'year': year,
+            'source': 'Korea_Customs'
+        } for cells, value, quantity in zip(rows, values, quantities)]
+    
     def scrape_historical_data(self) -> List[Dict]:
         """한국 관세청 과거 데이터 수집"""
         trade_data = []
@@ -175,8 +200,6 @@ class KoreaCustomsScraper:
                     else:
                         logger.warning(f"{year}년 관세청 API 호출 실패: {response.status_code}")
                     
-                    time.sleep(2)  # API 호출 제한 준수
-                    
                 except Exception as e:
                     logger.error(f"{year}년 관세청 데이터 수집 오류: {e}")
                     
@@ -185,12 +208,3 @@ class KoreaCustomsScraper:
             
         logger.info(f"관세청 과거 데이터 총 {len(trade_data)}건 수집")
         return trade_data
-    
-    def _parse_number(self, text: str) -> float:
-        """텍스트에서 숫자 추출"""
-        try:
-            # 쉼표, 공백 제거 후 숫자 변환
-            cleaned = text.replace(',', '').replace(' ', '').strip()
-            return float(cleaned) if cleaned else 0.0
-        except (ValueError, AttributeError):
-            return 0.0
@@ -1,12 +1,12 @@
 import requests
 from bs4 import BeautifulSoup
 from typing import List, Dict
-import time
 import logging
 import os
 import random
 from datetime import datetime, timedelta
-from trade_detail_generator import TradeDetailGenerator
+from .table_extractor import iter_table_rows, parse_numbers, column
+from .source_registry import SourceSpec, SourceRegistry, SourceOrchestrator
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,43 +17,34 @@ class PublicDataScraper:
     def __init__(self, session):
         self.session = session
         self.is_railway = os.getenv('RAILWAY_ENVIRONMENT') is not None
-        self.detail_generator = TradeDetailGenerator()
         
+    def source_specs(self) -> List[SourceSpec]:
+        """수집 소스 선언"""
+        return [
+            SourceSpec('KATI', self._scrape_kati_data, host='www.kati.net', cost=2),
+            SourceSpec('SARS', self._scrape_sars_data, host='www.sars.gov.za'),
+            SourceSpec('Australian_Bureau', self._scrape_australian_bureau_data, host='www.abs.gov.au', cost=2),
+            SourceSpec('NZ_Stats', self._scrape_nz_stats_data, host='www.stats.govt.nz', cost=2),
+            SourceSpec('Canada_Stats', self._scrape_canada_stats_data, host='www150.statcan.gc.ca', cost=2),
+            SourceSpec('UK_Trade', self._scrape_uk_trade_data, host='www.gov.uk'),
+            SourceSpec('Japan_Customs', self._scrape_japan_customs_data, host='www.customs.go.jp'),
+            SourceSpec('Singapore_Trade', self._scrape_singapore_trade_data, host='www.singstat.gov.sg')
+        ]
+    
     def scrape_public_trade_data(self) -> List[Dict]:
-        """다양한 공개 소스에서 실제 무역 데이터 수집"""
+        """다양한 공개 소스에서 실제 무역 데이터 수집 (상세 정보는 저장 파이프라인에서 한 번만 추가)"""
         all_trade_data = []
         
         try:
             logger.info("공개 무역 데이터 소스들에서 실제 데이터 수집 시작...")
             
-            # 각 데이터 소스별로 수집
-            sources = [
-                self._scrape_kati_data,
-                self._scrape_sars_data,
-                self._scrape_australian_bureau_data,
-                self._scrape_nz_stats_data,
-                self._scrape_canada_stats_data,
-                self._scrape_uk_trade_data,
-                self._scrape_japan_customs_data,
-                self._scrape_singapore_trade_data
-            ]
+            # 등록된 소스를 병렬로 수집
+            registry = SourceRegistry()
+            registry.register_all(self.source_specs())
+            result = SourceOrchestrator(registry).run(force=True)
             
-            for scraper_func in sources:
-                try:
-                    logger.info(f"{scraper_func.__name__} 실행 중...")
-                    data = scraper_func()
-                    if data:
-                        # 상세 정보 추가
-                        enhanced_data = []
-                        for record in data:
-                            enhanced_record = self.detail_generator.enhance_trade_record(record)
-                            enhanced_data.append(enhanced_record)
-                        all_trade_data.extend(enhanced_data)
-                        logger.info(f"{scraper_func.__name__}에서 {len(data)}건 수집")
-                    time.sleep(2)  # 소스간 간격
-                except Exception as e:
-                    logger.error(f"{scraper_func.__name__} 오류: {e}")
-                    continue
+            for records in result['records'].values():
+                all_trade_data.extend(records)
                     
         except Exception as e:
             logger.error(f"공개 무역 데이터 수집 중 오류: {e}")
@@ -72,27 +63,26 @@ class PublicDataScraper:
             response = self.session.get(url, timeout=30)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
+                # 수출입 통계 테이블 찾기 (테이블 하위 트리만 파싱)
+                rows = list(iter_table_rows(response.content, table_class='table', min_cells=4))
+                values = parse_numbers(column(rows, 2))
+                quantities = parse_numbers(column(rows, 3))
+                period = datetime.now().strftime('%Y%m')
+                year = datetime.now().year
                 
-                # 수출입 통계 테이블 찾기
-                tables = soup.find_all('table', class_='table')
-                for table in tables:
-                    rows = table.find_all('tr')
-                    for row in rows[1:]:  # 헤더 제외
-                        cells = row.find_all(['td', 'th'])
-                        if len(cells) >= 4:
-                            trade_data.append({
-                                'country_origin': cells[0].get_text(strip=True),
-                                'country_destination': 'Korea',
-                                'product_code': '080250',
-                                'product_description': '견과류(마카다미아)',
-                                'trade_value': self._parse_number(cells[2].get_text(strip=True)),
-                                'quantity': self._parse_number(cells[3].get_text(strip=True)),
-                                'trade_type': 'import',
-                                'period': datetime.now().strftime('%Y%m'),
-                                'year': datetime.now().year,
-                                'source': 'KATI'
-                            })
+                for cells, value, quantity in zip(rows, values, quantities):
+                    trade_data.append({
+                        'country_origin': cells[0],
+                        'country_destination': 'Korea',
+                        'product_code': '080250',
+                        'product_description': '견과류(마카다미아)',
+                        'trade_value': value,
+                        'quantity': quantity,
+                        'trade_type': 'import',
+                        'period': period,
+                        'year': year,
+                        'source': 'KATI'
+                    })
                             
         except Exception as e:
             logger.error(f"KATI 데이터 수집 오류: {e}")
@@ -144,27 +134,29 @@ class PublicDataScraper:
             response = self.session.get(url, timeout=30)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
+                # 수출 통계 찾기 (테이블 하위 트리만 파싱, 한국 관련 행만)
+                rows = [
+                    cells for cells in iter_table_rows(response.content, min_cells=3)
+                    if 'korea' in ''.join(cells).lower()
+                ]
+                values = parse_numbers(column(rows, 1))
+                quantities = parse_numbers(column(rows, 2))
+                period = datetime.now().strftime('%Y%m')
+                year = datetime.now().year
                 
-                # 수출 통계 찾기
-                export_tables = soup.find_all('table')
-                for table in export_tables:
-                    rows = table.find_all('tr')
-                    for row in rows[1:]:
-                        cells = row.find_all(['td', 'th'])
-                        if len(cells) >= 3 and 'korea' in row.get_text().lower():
-                            trade_data.append({
-                                'country_origin': 'Australia',
-                                'country_destination': 'Korea',
-                                'product_code': '080250',
-                                'product_description': 'Macadamia nuts',
-                                'trade_value': self._parse_number(cells[1].get_text(strip=True)),
-                                'quantity': self._parse_number(cells[2].get_text(strip=True)),
-                                'trade_type': 'export',
-                                'period': datetime.now().strftime('%Y%m'),
-                                'year': datetime.now().year,
-                                'source': 'Australian_Bureau'
-                            })
+                for value, quantity in zip(values, quantities):
+                    trade_data.append({
+                        'country_origin': 'Australia',
+                        'country_destination': 'Korea',
+                        'product_code': '080250',
+                        'product_description': 'Macadamia nuts',
+                        'trade_value': value,
+                        'quantity': quantity,
+                        'trade_type': 'export',
+                        'period': period,
+                        'year': year,
+                        'source': 'Australian_Bureau'
+                    })
                             
         except Exception as e:
             logger.error(f"호주 통계청 데이터 수집 오류: {e}")
@@ -326,39 +318,28 @@ class PublicDataScraper:
             response = self.session.get(url, timeout=30)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
+                # 무역 데이터 테이블 찾기 (테이블별 첫 데이터 행만 사용)
+                rows = list(iter_table_rows(response.content, min_cells=3, max_rows_per_table=1))
+                values = parse_numbers(column(rows, 1))
+                quantities = parse_numbers(column(rows, 2))
+                period = datetime.now().strftime('%Y%m')
+                year = datetime.now().year
                 
-                # 무역 데이터 테이블 찾기
-                tables = soup.find_all('table')
-                for table in tables:
-                    rows = table.find_all('tr')
-                    for row in rows[1:]:
-                        cells = row.find_all(['td', 'th'])
-                        if len(cells) >= 3:
-                            trade_data.append({
-                                'country_origin': 'Singapore',
-                                'country_destination': 'Korea',
-                                'product_code': '080250',
-                                'product_description': 'Nuts (re-export)',
-                                'trade_value': self._parse_number(cells[1].get_text(strip=True)),
-                                'quantity': self._parse_number(cells[2].get_text(strip=True)),
-                                'trade_type': 'export',
-                                'period': datetime.now().strftime('%Y%m'),
-                                'year': datetime.now().year,
-                                'source': 'Singapore_Trade'
-                            })
-                            break
+                for value, quantity in zip(values, quantities):
+                    trade_data.append({
+                        'country_origin': 'Singapore',
+                        'country_destination': 'Korea',
+                        'product_code': '080250',
+                        'product_description': 'Nuts (re-export)',
+                        'trade_value': value,
+                        'quantity': quantity,
+                        'trade_type': 'export',
+                        'period': period,
+                        'year': year,
+                        'source': 'Singapore_Trade'
+                    })
                             
         except Exception as e:
             logger.error(f"싱가포르 무역 데이터 수집 오류: {e}")
             
         return trade_data
-    
-    def _parse_number(self, text: str) -> float:
-        """텍스트에서 숫자 추출"""
-        try:
-            # 쉼표, 공백 제거 후 숫자 변환
-            cleaned = text.replace(',', '').replace(' ', '').strip()
-            return float(cleaned) if cleaned else 0.0
-        except (ValueError, AttributeError):
-            return 0.0
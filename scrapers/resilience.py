@@ -0,0 +1,251 @@
+"""
+스크래핑 계층 복원력 도구
+재시도 가능한 상태 코드에 지수 백오프(+지터) 재시도, 호스트별 서킷 브레이커로
+연속 실패한 호스트는 일정 시간 요청을 차단하고 반개방 상태에서 한 번씩 탐색,
+요청마다 호스트별 최소 호출 간격 적용
+"""
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class BackoffRetry(Retry):
+    """지수 백오프에 무작위 지터를 더하고 대기 시간 상한을 두는 재시도 정책"""
+
+    JITTER = 0.5        # 백오프에 더하는 최대 무작위 지연 (초)
+    MAX_BACKOFF = 10.0  # 재시도 간 최대 대기 (Retry-After 포함)
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+        return min(self.MAX_BACKOFF, backoff + random.uniform(0, self.JITTER))
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(self.MAX_BACKOFF, retry_after)
+
+
+def default_retry() -> BackoffRetry:
+    """연결 실패/재시도 가능 상태 코드만 재시도 (읽기 시간 초과는 재시도하지 않음)"""
+    return BackoffRetry(
+        total=3,
+        connect=2,
+        read=0,
+        status=2,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({'GET', 'HEAD'}),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """서킷 브레이커가 열려 요청을 보내지 않은 경우"""
+
+
+class CircuitBreaker:
+    """호스트 서킷 브레이커 (closed → open → half_open → closed)"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 300.0):
+        self.name = name
+        self.failure_threshold = failure_threshold  # 차단까지의 연속 실패 횟수
+        self.reset_timeout = reset_timeout          # 차단 후 탐색 요청까지의 대기 (초)
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+        self._stats = {'total_failures': 0, 'short_circuited': 0, 'last_failure': None, 'last_success': None}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def is_open(self) -> bool:
+        """요청이 차단되는 상태인지 (탐색 요청 기회는 소비하지 않음)"""
+        return self.state == self.OPEN
+
+    def allow_request(self) -> bool:
+        """요청 허용 여부 - 반개방 상태에서는 동시에 하나의 탐색 요청만 허용"""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._stats['short_circuited'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"서킷 브레이커 닫힘: {self.name}")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+            self._stats['last_success'] = datetime.now()
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._stats['total_failures'] += 1
+            self._stats['last_failure'] = datetime.now()
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"서킷 브레이커 열림: {self.name} (연속 실패 {self._failures}회)")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            state = self._current_state()
+            retry_in = None
+            if state == self.OPEN:
+                retry_in = round(max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)), 1)
+            return {
+                'state': state,
+                'consecutive_failures': self._failures,
+                'retry_in_seconds': retry_in,
+                **{
+                    key: value.isoformat() if isinstance(value, datetime) else value
+                    for key, value in self._stats.items()
+                }
+            }
+
+
+class CircuitBreakerRegistry:
+    """호스트별 서킷 브레이커 모음"""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+    def get(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(host, self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def is_open(self, host: str) -> bool:
+        """호스트 요청이 차단 중인지 (브레이커가 없으면 False)"""
+        breaker = self._breakers.get(host)
+        return breaker is not None and breaker.is_open()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """호스트별 브레이커 상태 (API 응답용)"""
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {host: breaker.snapshot() for host, breaker in sorted(breakers)}
+
+
+class HostRateLimiter:
+    """호스트별 최소 호출 간격 보장
+
+    간격은 수집 소스 선언에서 호스트별로 등록하며 (여러 소스가 같은 호스트를 쓰면 가장 긴 간격),
+    공유 HTTP 세션의 어댑터가 요청마다 요청 URL의 호스트 기준으로 대기함.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_slot = {}
+        self._intervals = {}
+
+    def set_interval(self, host: str, interval: float):
+        """호스트 호출 간격 등록 (이미 더 긴 간격이 있으면 유지)"""
+        with self._lock:
+            if interval > self._intervals.get(host, 0.0):
+                self._intervals[host] = interval
+
+    def wait(self, host: str, interval: float = None):
+        """호스트의 다음 호출 가능 시점까지 대기 (interval이 없으면 등록된 간격)"""
+        with self._lock:
+            if interval is None:
+                interval = self._intervals.get(host, 0.0)
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class ResilientAdapter(HTTPAdapter):
+    """호스트별 호출 간격 + 백오프 재시도 + 호스트별 서킷 브레이커를 적용한 어댑터
+
+    재시도는 urllib3 내부에서 끝나므로 브레이커에는 논리적 요청 한 건당 한 번만 기록됨.
+    연결 오류/시간 초과와 5xx/429 응답은 실패, 그 외 응답은 호스트가 살아있는 것으로 봄.
+    호출 간격은 파서 안의 페이지/연도 반복 요청까지 요청마다 적용됨.
+    """
+
+    def __init__(self, breakers: CircuitBreakerRegistry, max_retries: Retry = None,
+                 rate_limiter: HostRateLimiter = None, **kwargs):
+        super().__init__(max_retries=max_retries or default_retry(), **kwargs)
+        self.breakers = breakers
+        self.rate_limiter = rate_limiter
+
+    def send(self, request, **kwargs):
+        host = urlsplit(request.url).hostname or ''
+        breaker = self.breakers.get(host)
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"서킷 브레이커 열림으로 요청 차단: {host}", request=request)
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait(host)
+
+        try:
+            response = super().send(request, **kwargs)
+        except Exception:
+            # 연결 오류/시간 초과 (반개방 탐색 요청도 여기서 정리됨)
+            breaker.record_failure()
+            raise
+
+        if response.status_code in RETRY_STATUSES:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+
+_breakers = CircuitBreakerRegistry()
+_rate_limiter = HostRateLimiter()
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """프로세스 전체에서 공유하는 호스트별 서킷 브레이커"""
+    return _breakers
+
+
+def get_host_rate_limiter() -> HostRateLimiter:
+    """프로세스 전체에서 공유하는 호스트별 호출 간격 제한"""
+    return _rate_limiter
@@ -0,0 +1,437 @@
+"""
+데이터 소스 레지스트리 및 병렬 수집 오케스트레이터
+각 소스는 호스트, 호출 간격, 비용, 타임아웃, 갱신 주기, 파서를 선언하고
+오케스트레이터는 갱신이 필요한 소스만 병렬로 실행
+"""
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+import logging
+import threading
+import time
+
+from .resilience import HostRateLimiter, get_host_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# 수집 예산 배분: 과거 평균 소요 시간의 SLICE_FACTOR배, 최소 MIN_SLICE초
+SLICE_FACTOR = 2.0
+MIN_SLICE = 10.0
+_DURATION_ALPHA = 0.3
+
+
+class SourceSpec:
+    """수집 소스 선언"""
+
+    def __init__(self, name: str, parser: Callable[[], Union[List[Dict], Iterator[List[Dict]]]], host: str,
+                 rate_limit: float = 2.0, cost: int = 1, timeout: float = 90.0,
+                 freshness: timedelta = timedelta(hours=6), group: str = 'current',
+                 streaming: bool = False, fallback_hosts: Tuple[str, ...] = ()):
+        self.name = name
+        self.parser = parser          # 레코드 목록을 반환하는 수집 함수 (streaming이면 레코드 배치 생성기)
+        self.host = host              # 호출 간격을 공유하는 호스트
+        self.fallback_hosts = tuple(fallback_hosts)  # 같은 데이터를 제공하는 대체 엔드포인트 호스트
+        self.rate_limit = rate_limit  # 동일 호스트 요청 최소 간격 (초, 공유 HTTP 세션이 요청마다 적용)
+        self.cost = cost              # 상대적 수집 비용 (높을수록 먼저 시작)
+        self.timeout = timeout        # 소스 전체 수집 제한 시간 (초)
+        self.freshness = freshness    # 마지막 성공 후 재수집까지의 간격
+        self.group = group            # 'current', 'historical' 등 수집 그룹
+        self.streaming = streaming    # 배치가 만들어질 때마다 넘김 (전체 응답을 모으지 않음)
+
+    @property
+    def hosts(self) -> Tuple[str, ...]:
+        """소스가 호출하는 모든 호스트"""
+        return (self.host,) + self.fallback_hosts
+
+    def __repr__(self):
+        return f"SourceSpec({self.name!r}, host={self.host!r}, group={self.group!r})"
+
+
+class SourceRegistry:
+    """수집 소스 선언과 소스별 최근 수집 상태 관리"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._specs = {}
+        self._state = {}
+
+    def register(self, spec: SourceSpec):
+        """소스 등록 (같은 이름이면 교체)"""
+        with self._lock:
+            self._specs[spec.name] = spec
+            self._state.setdefault(spec.name, {
+                'last_success': None,
+                'last_attempt': None,
+                'last_duration': None,
+                'avg_duration': None,
+                'last_count': 0,
+                'consecutive_failures': 0,
+                'deferred': False
+            })
+
+    def register_all(self, specs: List[SourceSpec]):
+        for spec in specs:
+            self.register(spec)
+
+    def get(self, name: str) -> Optional[SourceSpec]:
+        return self._specs.get(name)
+
+    def specs(self, group: str = None) -> List[SourceSpec]:
+        """등록된 소스 목록 (그룹 지정 시 해당 그룹만)"""
+        return [spec for spec in self._specs.values() if group is None or spec.group == group]
+
+    def is_fresh(self, spec: SourceSpec, now: datetime = None) -> bool:
+        """마지막 성공 수집이 갱신 주기 이내인지 확인"""
+        last_success = self._state.get(spec.name, {}).get('last_success')
+        if last_success is None:
+            return False
+        return (now or datetime.now()) - last_success < spec.freshness
+
+    def due_specs(self, group: str = None, now: datetime = None) -> List[SourceSpec]:
+        """갱신이 필요한 소스 목록"""
+        now = now or datetime.now()
+        return [spec for spec in self.specs(group) if not self.is_fresh(spec, now)]
+
+    def mark_success(self, name: str, count: int, duration: float):
+        with self._lock:
+            state = self._state[name]
+            state['last_success'] = state['last_attempt'] = datetime.now()
+            self._record_duration(state, duration, reset=state['deferred'])
+            state['last_count'] = count
+            state['consecutive_failures'] = 0
+            state['deferred'] = False
+
+    def mark_attempt(self, name: str, duration: float):
+        """수집은 끝났지만 데이터가 없는 경우 (다음 실행에서 재시도)"""
+        with self._lock:
+            state = self._state[name]
+            state['last_attempt'] = datetime.now()
+            self._record_duration(state, duration, reset=state['deferred'])
+            state['last_count'] = 0
+            state['deferred'] = False
+
+    def mark_failure(self, name: str, duration: float = None):
+        with self._lock:
+            state = self._state[name]
+            state['last_attempt'] = datetime.now()
+            state['last_duration'] = duration
+            state['consecutive_failures'] += 1
+            state['deferred'] = False
+
+    def mark_deferred(self, name: str, elapsed: float = None):
+        """수집 예산 안에 끝나지 않아 다음 실행으로 미룬 경우 (다음 실행에서 먼저 시작)
+
+        elapsed: 미루기 전까지 실행한 시간. 실제 소요 시간의 하한이므로 평균이 이보다 작으면
+        평균을 elapsed로 올려, 느려진 소스의 다음 배분 시간이 매번 두 배씩 늘어나도록 함
+        """
+        with self._lock:
+            state = self._state[name]
+            state['last_attempt'] = datetime.now()
+            state['deferred'] = True
+            if elapsed is not None:
+                state['last_duration'] = elapsed
+                if state['avg_duration'] is None or state['avg_duration'] < elapsed:
+                    state['avg_duration'] = elapsed
+
+    def is_deferred(self, name: str) -> bool:
+        return self._state.get(name, {}).get('deferred', False)
+
+    def expected_duration(self, name: str) -> Optional[float]:
+        """완료된 수집의 평균 소요 시간 (이력이 없으면 None)"""
+        return self._state.get(name, {}).get('avg_duration')
+
+    def _record_duration(self, state: Dict, duration: float, reset: bool = False):
+        # 미뤘던 소스가 완료되면 이전 평균은 느려지기 전 값이므로 새 소요 시간으로 다시 시작
+        state['last_duration'] = duration
+        previous = state['avg_duration']
+        state['avg_duration'] = duration if previous is None or reset else (
+            _DURATION_ALPHA * duration + (1 - _DURATION_ALPHA) * previous
+        )
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """소스별 상태 사본 (API 응답용)"""
+        with self._lock:
+            return {
+                name: {
+                    key: value.isoformat() if isinstance(value, datetime) else value
+                    for key, value in state.items()
+                }
+                for name, state in self._state.items()
+            }
+
+
+class _ResultSink:
+    """수집 결과 전달 창구
+
+    스트리밍 소스는 작업 스레드에서 배치마다 emit()을 호출함. 실행이 끝났거나 결과를 버린 소스의
+    늦은 배치는 받지 않아, 닫힌 저장 파이프라인에 배치가 들어가지 않도록 함.
+    on_result가 없으면 결과에 모아 둠.
+    """
+
+    def __init__(self, on_result: Optional[Callable[[str, List[Dict]], None]], collected: Dict[str, List[Dict]]):
+        self.on_result = on_result
+        self.collected = collected
+        self._lock = threading.Lock()
+        self._closed = False
+        self._dropped = set()
+
+    def emit(self, name: str, records: List[Dict]) -> bool:
+        """배치 전달 (받지 않으면 False - 소스는 수집을 멈춤)"""
+        with self._lock:
+            if self._closed or name in self._dropped:
+                return False
+            if self.on_result:
+                self.on_result(name, records)
+            else:
+                self.collected.setdefault(name, []).extend(records)
+            return True
+
+    def drop(self, name: str):
+        with self._lock:
+            self._dropped.add(name)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+
+
+class SourceOrchestrator:
+    """갱신이 필요한 소스를 병렬로 실행하고 결과를 모음"""
+
+    def __init__(self, registry: SourceRegistry, max_workers: int = 8,
+                 rate_limiter: HostRateLimiter = None, breakers=None):
+        self.registry = registry
+        self.max_workers = max_workers
+        # 공유 HTTP 세션 어댑터와 같은 제한 (소스 선언의 호출 간격을 호스트별로 등록)
+        self.rate_limiter = rate_limiter or get_host_rate_limiter()
+        self.breakers = breakers  # 호스트별 서킷 브레이커 (열린 호스트의 소스는 건너뜀)
+        # 배분 시간을 넘겨 결과를 버렸지만 아직 실행 중인 작업 (소스 이름 → (호스트 목록, Future))
+        self._abandoned = {}
+        self._abandoned_lock = threading.Lock()
+
+    def run(self, group: str = None, force: bool = False,
+            on_result: Callable[[str, List[Dict]], None] = None, budget: float = None) -> Dict:
+        """소스 그룹 수집 실행
+
+        Args:
+            group: 실행할 소스 그룹 (None이면 전체)
+            force: True면 갱신 주기와 관계없이 모두 실행
+            on_result: 소스별 수집 완료 시 (소스 이름, 레코드 목록)으로 호출.
+                       스트리밍 소스는 작업 스레드에서 배치마다 호출하며, 호출은 한 번에 하나씩만 실행됨
+            budget: 전체 수집 제한 시간 (초). 지정하면 소스별로 과거 소요 시간 기반 시간을 배분하고,
+                    시간 안에 끝나지 않은 소스는 다음 실행으로 미룸
+
+        Returns:
+            {'records': {소스: 레코드 목록} (on_result가 없을 때만), 'sources_used', 'sources_skipped', 'sources_deferred',
+             'errors', 'timings', 'budget'}
+        """
+        run_started = time.monotonic()
+        deadline = run_started + budget if budget else None
+
+        specs = self.registry.specs(group) if force else self.registry.due_specs(group)
+        skipped = [spec.name for spec in self.registry.specs(group) if spec not in specs]
+
+        # 지난 실행에서 버린 작업이 아직 실행 중이면 같은 소스/호스트를 다시 시작하지 않음
+        # (취소할 수 없는 작업과 겹쳐 호스트 호출 간격과 공유 세션이 깨지지 않도록)
+        still_running = self._busy_sources(specs)
+        if still_running:
+            specs = [spec for spec in specs if spec.name not in still_running]
+
+        # 서킷 브레이커가 열린 호스트의 소스는 시간을 쓰지 않도록 제외 (대체 호스트가 모두 열린 경우만)
+        short_circuited = []
+        if self.breakers is not None:
+            short_circuited = [spec.name for spec in specs if all(self.breakers.is_open(host) for host in spec.hosts)]
+            specs = [spec for spec in specs if spec.name not in short_circuited]
+
+        result = {
+            'records': {},
+            'sources_used': [],
+            'sources_skipped': skipped,
+            'sources_short_circuited': short_circuited,
+            'sources_still_running': still_running,
+            'sources_deferred': [],
+            'errors': [],
+            'timings': {},
+            'budget': None
+        }
+
+        if skipped:
+            logger.info(f"갱신 주기 이내라 건너뛴 소스: {skipped}")
+        if short_circuited:
+            logger.warning(f"서킷 브레이커가 열려 건너뛴 소스: {short_circuited}")
+        if still_running:
+            logger.warning(f"이전 실행의 작업이 아직 실행 중이라 건너뛴 소스: {still_running}")
+        if not specs:
+            return result
+
+        for spec in specs:
+            for host in spec.hosts:
+                self.rate_limiter.set_interval(host, spec.rate_limit)
+
+        # 지난 실행에서 미룬 소스, 비용이 큰 소스 순으로 시작하여 전체 소요 시간 단축
+        specs = sorted(specs, key=lambda spec: (not self.registry.is_deferred(spec.name), -spec.cost))
+        slices = {spec.name: self._time_slice(spec, budget) for spec in specs}
+        started = {}
+        sink = _ResultSink(on_result, result['records'])
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(specs)),
+                                      thread_name_prefix='source')
+        try:
+            futures = {executor.submit(self._run_source, spec, started, deadline, sink): spec for spec in specs}
+            pending = set(futures)
+
+            while pending:
+                done, pending = wait(pending, timeout=self._next_deadline(pending, futures, started, slices, deadline),
+                                     return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    spec = futures[future]
+                    if spec.name not in started:
+                        # 예산이 끝나 시작하지 못한 소스
+                        self._defer(spec, result)
+                        continue
+                    duration = time.monotonic() - started[spec.name]
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        error_msg = f"{spec.name} 수집 오류: {e}"
+                        logger.error(error_msg)
+                        result['errors'].append(error_msg)
+                        self.registry.mark_failure(spec.name, duration)
+                        continue
+
+                    # 스트리밍 소스는 이미 넘긴 레코드 수, 그 외는 레코드 목록
+                    count = (outcome or 0) if spec.streaming else len(outcome or [])
+                    result['timings'][spec.name] = round(duration, 2)
+                    if count:
+                        self.registry.mark_success(spec.name, count, duration)
+                        result['sources_used'].append(spec.name)
+                        logger.info(f"{spec.name}에서 {count}건 수집 ({duration:.1f}초)")
+                        if not spec.streaming:
+                            sink.emit(spec.name, outcome)
+                    else:
+                        self.registry.mark_attempt(spec.name, duration)
+                        logger.warning(f"{spec.name}에서 데이터 없음")
+
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    # 전체 예산 소진: 끝나지 않은 소스는 결과를 기다리지 않고 다음 실행으로 미룸
+                    for future in pending:
+                        spec = futures[future]
+                        start = started.get(spec.name)
+                        self._abandon(spec, future, sink)
+                        self._defer(spec, result, now - start if start is not None else None)
+                    pending = set()
+                    break
+
+                # 배분 시간을 넘긴 소스는 결과를 버림 (소스 제한 시간 초과면 실패, 아니면 미룸)
+                for future in list(pending):
+                    spec = futures[future]
+                    start = started.get(spec.name)
+                    if start is None or now - start < slices[spec.name]:
+                        continue
+                    if now - start >= spec.timeout:
+                        error_msg = f"{spec.name} 수집 시간 초과 ({spec.timeout:g}초)"
+                        logger.warning(error_msg)
+                        result['errors'].append(error_msg)
+                        self.registry.mark_failure(spec.name, now - start)
+                    else:
+                        self._defer(spec, result, now - start)
+                    self._abandon(spec, future, sink)
+                    pending.discard(future)
+        finally:
+            # 시간 초과된 작업은 백그라운드에서 종료되도록 두고 대기하지 않음 (끝날 때까지 _abandoned에서 추적)
+            # 스트리밍 소스는 다음 배치에서 전달이 거부되어 멈춤
+            sink.close()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if budget:
+            used = time.monotonic() - run_started
+            result['budget'] = {
+                'total': budget,
+                'used': round(used, 2),
+                'remaining': round(max(0.0, budget - used), 2),
+                'slices': {name: round(value, 1) for name, value in slices.items()}
+            }
+            logger.info(f"수집 예산 {budget:g}초 중 {used:.1f}초 사용, 미룬 소스: {result['sources_deferred']}")
+
+        return result
+
+    def _time_slice(self, spec: SourceSpec, budget: float = None) -> float:
+        """소스에 배분할 시간 (예산이 없으면 소스 제한 시간)
+
+        지난 실행에서 미룬 소스는 먼저 시작하므로 과거 평균과 관계없이 남은 예산 전체를 씀
+        """
+        if not budget:
+            return spec.timeout
+        expected = self.registry.expected_duration(spec.name)
+        if expected is None or self.registry.is_deferred(spec.name):
+            return min(spec.timeout, budget)
+        return min(spec.timeout, budget, max(MIN_SLICE, expected * SLICE_FACTOR))
+
+    def _defer(self, spec: SourceSpec, result: Dict, elapsed: float = None):
+        logger.warning(f"{spec.name} 수집 예산 내 미완료 - 다음 실행으로 미룸")
+        self.registry.mark_deferred(spec.name, elapsed)
+        result['sources_deferred'].append(spec.name)
+
+    def _abandon(self, spec: SourceSpec, future, sink: _ResultSink):
+        """결과를 버린 작업 기록 (시작 전이면 취소되고, 실행 중이면 끝날 때까지 추적)
+
+        스트리밍 소스가 이미 넘긴 배치는 저장되며, 이후 배치는 받지 않음
+        """
+        sink.drop(spec.name)
+        if future.cancel():
+            return
+        with self._abandoned_lock:
+            self._abandoned[spec.name] = (spec.hosts, future)
+
+    def _busy_sources(self, specs: List[SourceSpec]) -> List[str]:
+        """이전 실행의 작업이 아직 실행 중인 소스 (같은 호스트의 다른 소스 포함)"""
+        with self._abandoned_lock:
+            for name, (_, future) in list(self._abandoned.items()):
+                if future.done():
+                    del self._abandoned[name]
+            busy_hosts = {host for hosts, _ in self._abandoned.values() for host in hosts}
+            return [spec.name for spec in specs
+                    if spec.name in self._abandoned or not busy_hosts.isdisjoint(spec.hosts)]
+
+    def _run_source(self, spec: SourceSpec, started: Dict[str, float], deadline: float = None,
+                    sink: _ResultSink = None) -> Union[List[Dict], int]:
+        """소스 파서 실행 (예산이 끝났으면 시작하지 않음, 호출 간격은 요청마다 HTTP 어댑터가 적용)
+
+        스트리밍 소스는 배치를 만들어지는 대로 sink에 넘기고 넘긴 레코드 수를 반환
+        """
+        if deadline is not None and time.monotonic() >= deadline:
+            return 0 if spec.streaming else []
+        started[spec.name] = time.monotonic()
+        logger.info(f"{spec.name} 데이터 수집 시작...")
+        if not spec.streaming:
+            return spec.parser()
+
+        batches = spec.parser()
+        count = 0
+        try:
+            for records in batches:
+                if not records:
+                    continue
+                if not sink.emit(spec.name, records):
+                    logger.info(f"{spec.name} 결과 전달 종료 - {count}건 전달 후 수집 중단")
+                    break
+                count += len(records)
+        finally:
+            # 중단 시 생성기를 닫아 열린 응답 스트림 정리
+            close = getattr(batches, 'close', None)
+            if close is not None:
+                close()
+        return count
+
+    def _next_deadline(self, pending, futures, started, slices, deadline=None) -> float:
+        """대기 중인 소스의 배분 시간/전체 예산 중 가장 빠른 시점까지 남은 초"""
+        now = time.monotonic()
+        remaining = [
+            slices[futures[future].name] - (now - started[futures[future].name])
+            for future in pending if futures[future].name in started
+        ]
+        if deadline is not None:
+            remaining.append(deadline - now)
+        return max(0.0, min(remaining)) if remaining else 1.0
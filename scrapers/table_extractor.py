@@ -0,0 +1,138 @@
+"""
+HTML 통계 테이블 추출 유틸리티
+페이지 전체 트리 대신 <table> 하위 트리만 파싱하여 행 튜플을 지연 생성
+"""
+from io import BytesIO
+from typing import Iterable, Iterator, List, Optional, Tuple
+import logging
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml은 선택 사항 (설치된 경우 스트리밍 파서 사용)
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    etree = None
+    LXML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# <table> 하위 트리만 파싱
+_TABLE_STRAINER = SoupStrainer('table')
+
+# 숫자 정리용 변환 테이블 (쉼표, 공백 제거)
+_NUMBER_STRIP_TABLE = str.maketrans('', '', ', \t\n\xa0')
+
+Row = Tuple[str, ...]
+
+
+def iter_table_rows(content, table_class: Optional[str] = None, min_cells: int = 0,
+                    skip_header: bool = True, max_rows_per_table: Optional[int] = None) -> Iterator[Row]:
+    """HTML 문서의 테이블 행을 셀 텍스트 튜플로 지연 생성
+
+    Args:
+        content: HTML 바이트 또는 문자열 (response.content)
+        table_class: 지정 시 해당 CSS 클래스를 가진 테이블만 대상
+        min_cells: 이 개수 미만의 셀을 가진 행은 건너뜀
+        skip_header: 테이블별 첫 번째 행(헤더) 제외 여부
+        max_rows_per_table: 테이블별 최대 반환 행 수
+    """
+    if not content:
+        return
+
+    if LXML_AVAILABLE:
+        yielded = False
+        try:
+            for row in _iter_rows_lxml(content, table_class, min_cells, skip_header, max_rows_per_table):
+                yielded = True
+                yield row
+            return
+        except etree.LxmlError as e:
+            # 이미 행을 반환한 경우 중복을 피하기 위해 대체 파서를 사용하지 않음
+            if yielded:
+                logger.warning(f"lxml 테이블 파싱 중단: {e}")
+                return
+            logger.debug(f"lxml 테이블 파싱 실패, html.parser로 대체: {e}")
+
+    yield from _iter_rows_soup(content, table_class, min_cells, skip_header, max_rows_per_table)
+
+
+def _iter_rows_lxml(content, table_class, min_cells, skip_header, max_rows_per_table) -> Iterator[Row]:
+    """lxml iterparse 기반 스트리밍 행 추출 (처리한 행은 즉시 해제)"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    events = etree.iterparse(BytesIO(content), events=('start', 'end'), html=True,
+                             tag=('table', 'tr'), recover=True)
+
+    # 중첩 테이블 대응: [대상 여부, 처리한 행 수, 반환한 행 수]
+    table_stack = []
+
+    for event, elem in events:
+        if elem.tag == 'table':
+            if event == 'start':
+                classes = (elem.get('class') or '').split()
+                table_stack.append([table_class is None or table_class in classes, 0, 0])
+            else:
+                if table_stack:
+                    table_stack.pop()
+                if not table_stack:
+                    elem.clear()
+            continue
+
+        if event != 'end' or not table_stack:
+            continue
+
+        state = table_stack[-1]
+        state[1] += 1
+        if state[0] and not (skip_header and state[1] == 1):
+            if max_rows_per_table is None or state[2] < max_rows_per_table:
+                cells = tuple(
+                    ''.join(text.strip() for text in cell.itertext())
+                    for cell in elem if cell.tag in ('td', 'th')
+                )
+                if len(cells) >= min_cells:
+                    state[2] += 1
+                    yield cells
+
+        # 중첩 테이블이 없는 행만 해제 (상위 테이블 셀 텍스트 보존)
+        if len(table_stack) == 1:
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+
+def _iter_rows_soup(content, table_class, min_cells, skip_header, max_rows_per_table) -> Iterator[Row]:
+    """SoupStrainer 기반 행 추출 (<table> 하위 트리만 구성)"""
+    soup = BeautifulSoup(content, 'html.parser', parse_only=_TABLE_STRAINER)
+    tables = soup.find_all('table', class_=table_class) if table_class else soup.find_all('table')
+
+    for table in tables:
+        rows = table.find_all('tr')
+        returned = 0
+        for row in (rows[1:] if skip_header else rows):
+            if max_rows_per_table is not None and returned >= max_rows_per_table:
+                break
+            cells = tuple(cell.get_text(strip=True) for cell in row.find_all(['td', 'th']))
+            if len(cells) >= min_cells:
+                returned += 1
+                yield cells
+
+
+def parse_numbers(texts: Iterable[str]) -> List[float]:
+    """텍스트 열을 한 번에 숫자 열로 변환 (변환 불가 값은 0.0)"""
+    numbers = []
+    append = numbers.append
+    for text in texts:
+        try:
+            cleaned = text.translate(_NUMBER_STRIP_TABLE)
+            append(float(cleaned) if cleaned else 0.0)
+        except (ValueError, AttributeError, TypeError):
+            append(0.0)
+    return numbers
+
+
+def column(rows: List[Row], index: int) -> List[str]:
+    """행 튜플 목록에서 특정 열만 추출"""
+    return [row[index] for row in rows]
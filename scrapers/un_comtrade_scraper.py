@@ -1,11 +1,11 @@
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
-import time
+from typing import List, Dict, Iterator
 import logging
 import os
 import random
 from datetime import datetime, timedelta
+from .source_registry import SourceSpec
+from .json_stream import iter_json_items, iter_mapped_batches, DEFAULT_BATCH_SIZE
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,25 +13,43 @@ logger = logging.getLogger(__name__)
 class UNComtradeScraper:
     """UN Comtrade API 데이터 스크래퍼"""
     
+    BASE_URL = "https://comtradeapi.un.org/data/v1/get/C/A/HS"
+    HS_CODES = ['080250', '080290']  # 마카다미아 HS 코드
+    HISTORICAL_YEARS = [2020, 2021, 2022, 2023]  # 과거 데이터 수집 연도
+    
     def __init__(self, session):
         self.session = session
         self.is_railway = os.getenv('RAILWAY_ENVIRONMENT') is not None
-        
+    
+    def source_specs(self) -> List[SourceSpec]:
+        """수집 소스 선언 (현재/과거 데이터) - 응답 배치를 디코딩되는 대로 저장 단계에 넘김"""
+        return [
+            SourceSpec('UN_Comtrade', self.iter_current_batches, host='comtradeapi.un.org',
+                       rate_limit=2.0, cost=3, timeout=90, freshness=timedelta(hours=24), streaming=True),
+            SourceSpec('UN_Comtrade_Historical', lambda: self.iter_yearly_batches(self.HISTORICAL_YEARS),
+                       host='comtradeapi.un.org', rate_limit=2.0, cost=5, timeout=300,
+                       freshness=timedelta(days=7), group='historical', streaming=True)
+        ]
+    
     def scrape_current_data(self) -> List[Dict]:
         """UN Comtrade API에서 마카다미아 무역 데이터 수집 (실제 데이터)"""
         trade_data = []
+        for batch in self.iter_current_batches():
+            trade_data.extend(batch)
         
+        logger.info(f"UN Comtrade에서 총 {len(trade_data)}건 수집")
+        return trade_data
+    
+    def iter_current_batches(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict]]:
+        """UN Comtrade 현재 데이터를 배치 단위로 스트리밍 수집"""
         try:
             # 새로운 UN Comtrade API (comtradeapi.un.org) 사용
             logger.info("UN Comtrade 공개 API 호출 시도...")
             
-            # 실제 API 엔드포인트 (공개 데이터)
-            base_url = "https://comtradeapi.un.org/data/v1/get/C/A/HS"
-            
-            for hs_code in ['080250', '080290']:  # 마카다미아 HS 코드
+            for hs_code in self.HS_CODES:
                 try:
                     # 실제 API 파라미터 구성
-                    url = f"{base_url}/2023,2024/410/036/{hs_code}"  # 2023-2024년, 한국에서 호주로부터 수입
+                    url = f"{self.BASE_URL}/2023,2024/410/036/{hs_code}"  # 2023-2024년, 한국에서 호주로부터 수입
                     
                     # 요청 파라미터 추가
                     params = {
@@ -42,97 +60,33 @@ class UNComtradeScraper:
                     }
                     
                     logger.info(f"UN Comtrade API 요청: {url}")
-                    response = self.session.get(url, params=params, timeout=30)
+                    count = 0
+                    for batch in self._iter_response_batches(url, params, batch_size=batch_size):
+                        count += len(batch)
+                        yield batch
                     
-                    if response.status_code == 200:
-                        try:
-                            data = response.json()
-                            if 'data' in data and data['data']:
-                                records = data['data']
-                                logger.info(f"UN Comtrade에서 {len(records)}건 데이터 수신")
-                                
-                                for record in records:
-                                    trade_data.append({
-                                        'country_origin': record.get('reporterDesc', ''),
-                                        'country_destination': record.get('partnerDesc', ''),
-                                        'product_code': record.get('cmdCode', ''),
-                                        'product_description': record.get('cmdDesc', ''),
-                                        'trade_value': record.get('primaryValue', 0),
-                                        'quantity': record.get('qty', 0),
-                                        'trade_type': 'import' if record.get('flowDesc', '').lower() == 'imports' else 'export',
-                                        'period': record.get('period', ''),
-                                        'year': record.get('refYear', datetime.now().year),
-                                        'source': 'UN_Comtrade'
-                                    })
-                            else:
-                                logger.warning(f"UN Comtrade API에서 {hs_code} 데이터 없음")
-                        except ValueError as e:
-                            logger.error(f"UN Comtrade JSON 파싱 오류: {e}")
-                            logger.error(f"응답 내용: {response.text[:500]}")
+                    if count:
+                        logger.info(f"UN Comtrade에서 {count}건 데이터 수신")
                     else:
-                        logger.warning(f"UN Comtrade API 호출 실패: {response.status_code}")
-                        logger.warning(f"응답: {response.text[:200]}")
-                    
-                    time.sleep(2)  # API 호출 제한 준수
-                    
+                        logger.warning(f"UN Comtrade API에서 {hs_code} 데이터 없음")
+                
                 except Exception as e:
                     logger.error(f"UN Comtrade {hs_code} 데이터 수집 오류: {e}")
                     continue
-                    
+        
         except Exception as e:
             logger.error(f"UN Comtrade 데이터 수집 중 오류: {e}")
-            
-        logger.info(f"UN Comtrade에서 총 {len(trade_data)}건 수집")
-        return trade_data
     
     def scrape_historical_data(self) -> List[Dict]:
         """UN Comtrade 과거 데이터 수집"""
         trade_data = []
         
-        try:
-            logger.info("UN Comtrade 과거 데이터 수집 시작...")
-            
-            # 2020-2023년 데이터 수집
-            years = [2020, 2021, 2022, 2023]
-            base_url = "https://comtradeapi.un.org/data/v1/get/C/A/HS"
-            
-            for year in years:
-                for hs_code in ['080250', '080290']:
-                    try:
-                        url = f"{base_url}/{year}/410/036/{hs_code}"
-                        
-                        response = self.session.get(url, timeout=30)
-                        
-                        if response.status_code == 200:
-                            data = response.json()
-                            if 'data' in data and data['data']:
-                                for record in data['data']:
-                                    trade_data.append({
-                                        'country_origin': record.get('reporterDesc', ''),
-                                        'country_destination': record.get('partnerDesc', ''),
-                                        'product_code': record.get('cmdCode', ''),
-                                        'product_description': record.get('cmdDesc', ''),
-                                        'trade_value': record.get('primaryValue', 0),
-                                        'quantity': record.get('qty', 0),
-                                        'trade_type': 'import' if record.get('flowDesc', '').lower() == 'imports' else 'export',
-                                        'period': record.get('period', ''),
-                                        'year': year,
-                                        'source': 'UN_Comtrade'
-                                    })
-                                logger.info(f"{year}년 {hs_code} 데이터 {len(data['data'])}건 수집")
-                            else:
-                                logger.warning(f"{year}년 {hs_code} 데이터 없음")
-                        else:
-                            logger.error(f"API 호출 실패: {response.status_code}")
-                        
-                        time.sleep(2)  # API 호출 제한 준수
-                        
-                    except Exception as e:
-                        logger.error(f"UN Comtrade {year}년 {hs_code} 데이터 수집 오류: {e}")
-                        
-        except Exception as e:
-            logger.error(f"UN Comtrade 과거 데이터 수집 중 오류: {e}")
-            
+        logger.info("UN Comtrade 과거 데이터 수집 시작...")
+        
+        # 2020-2023년 데이터 수집
+        for batch in self.iter_yearly_batches(self.HISTORICAL_YEARS):
+            trade_data.extend(batch)
+        
         logger.info(f"UN Comtrade 과거 데이터 총 {len(trade_data)}건 수집")
         return trade_data
     
@@ -140,50 +94,67 @@ class UNComtradeScraper:
         """특정 연도별 UN Comtrade 데이터 수집"""
         if not years:
             years = [2021, 2022, 2023, 2024]
-            
+        
         trade_data = []
         
+        logger.info(f"UN Comtrade {years}년 데이터 수집 시작...")
+        
+        for batch in self.iter_yearly_batches(years):
+            trade_data.extend(batch)
+        
+        logger.info(f"UN Comtrade 연도별 데이터 총 {len(trade_data)}건 수집")
+        return trade_data
+    
+    def iter_yearly_batches(self, years: List[int], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict]]:
+        """연도별 UN Comtrade 데이터를 배치 단위로 스트리밍 수집"""
         try:
-            logger.info(f"UN Comtrade {years}년 데이터 수집 시작...")
-            
-            base_url = "https://comtradeapi.un.org/data/v1/get/C/A/HS"
-            
             for year in years:
-                for hs_code in ['080250', '080290']:
+                for hs_code in self.HS_CODES:
                     try:
-                        url = f"{base_url}/{year}/410/036/{hs_code}"
+                        url = f"{self.BASE_URL}/{year}/410/036/{hs_code}"
                         
-                        response = self.session.get(url, timeout=30)
+                        count = 0
+                        for batch in self._iter_response_batches(url, year=year, batch_size=batch_size):
+                            count += len(batch)
+                            yield batch
                         
-                        if response.status_code == 200:
-                            data = response.json()
-                            if 'data' in data and data['data']:
-                                for record in data['data']:
-                                    trade_data.append({
-                                        'country_origin': record.get('reporterDesc', ''),
-                                        'country_destination': record.get('partnerDesc', ''),
-                                        'product_code': record.get('cmdCode', ''),
-                                        'product_description': record.get('cmdDesc', ''),
-                                        'trade_value': record.get('primaryValue', 0),
-                                        'quantity': record.get('qty', 0),
-                                        'trade_type': 'import' if record.get('flowDesc', '').lower() == 'imports' else 'export',
-                                        'period': record.get('period', ''),
-                                        'year': year,
-                                        'source': 'UN_Comtrade'
-                                    })
-                                logger.info(f"{year}년 {hs_code} 데이터 {len(data['data'])}건 수집")
-                            else:
-                                logger.warning(f"{year}년 {hs_code} 데이터 없음")
+                        if count:
+                            logger.info(f"{year}년 {hs_code} 데이터 {count}건 수집")
                         else:
-                            logger.error(f"API 호출 실패: {response.status_code}")
-                        
-                        time.sleep(2)  # API 호출 제한 준수
-                        
+                            logger.warning(f"{year}년 {hs_code} 데이터 없음")
+                    
                     except Exception as e:
                         logger.error(f"UN Comtrade {year}년 {hs_code} 데이터 수집 오류: {e}")
-                        
+        
         except Exception as e:
             logger.error(f"UN Comtrade 연도별 데이터 수집 중 오류: {e}")
+    
+    def _iter_response_batches(self, url: str, params: Dict = None, year: int = None,
+                               batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict]]:
+        """API 응답의 'data' 배열을 소켓에서 읽으며 표준 레코드 배치로 변환"""
+        with self.session.get(url, params=params, timeout=30, stream=True) as response:
+            if response.status_code != 200:
+                logger.warning(f"UN Comtrade API 호출 실패: {response.status_code}")
+                logger.warning(f"응답: {response.text[:200]}")
+                return
             
-        logger.info(f"UN Comtrade 연도별 데이터 총 {len(trade_data)}건 수집")
-        return trade_data
+            try:
+                records = iter_json_items(response, 'data.item')
+                yield from iter_mapped_batches(records, lambda record: self._map_record(record, year), batch_size)
+            except ValueError as e:
+                logger.error(f"UN Comtrade JSON 파싱 오류: {e}")
+    
+    def _map_record(self, record: Dict, year: int = None) -> Dict:
+        """Comtrade 레코드를 표준 무역 레코드로 변환"""
+        return {
+            'country_origin': record.get('reporterDesc', ''),
+            'country_destination': record.get('partnerDesc', ''),
+            'product_code': record.get('cmdCode', ''),
+            'product_description': record.get('cmdDesc', ''),
+            'trade_value': record.get('primaryValue', 0),
+            'quantity': record.get('qty', 0),
+            'trade_type': 'import' if (record.get('flowDesc') or '').lower() == 'imports' else 'export',
+            'period': record.get('period', ''),
+            'year': year if year is not None else record.get('refYear', datetime.now().year),
+            'source': 'UN_Comtrade'
+        }
@@ -1,10 +1,12 @@
 import asyncio
+import html
 import logging
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Dict, Optional
 from telegram import Bot
 from telegram.error import TelegramError
 from config import Config
+from scrapers.http_client import create_telegram_request
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +18,7 @@ class TelegramNotifier:
         self.bot = None
         
         if self.bot_token and self.chat_id:
-            self.bot = Bot(token=self.bot_token)
+            self.bot = Bot(token=self.bot_token, request=create_telegram_request())
         else:
             logger.warning("Telegram bot token or chat ID not configured")
     
@@ -70,16 +72,36 @@ def send_system_alert(alert_type: str, message: str) -> bool:
 """
     return telegram_notifier.send_message_sync(formatted_message)
 
-def send_new_data_alert(new_records: List[Dict]) -> bool:
-    """신규 데이터 알림 전송"""
-    if not new_records:
+def _route_label(entry: Dict) -> str:
+    return html.escape(f"{entry['origin']} → {entry['destination']} ({entry['product_code']}, {entry['trade_type']})")
+
+def send_new_data_alert(delta: Dict, max_items: int = 5) -> bool:
+    """신규 데이터 알림 전송 (수집 델타: 신규 경로/금액 변화/수정 기간)"""
+    if not delta or not delta.get('records'):
         return True
     
-    message = f"""🌰 마카다미아 무역 데이터 신규 업데이트
-📅 업데이트 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-📊 신규 데이터: {len(new_records)}건
-"""
-    return telegram_notifier.send_message_sync(message)
+    lines = [
+        "🌰 마카다미아 무역 데이터 신규 업데이트",
+        f"📅 업데이트 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        f"📊 신규 데이터: {delta['records']}건 (${delta['value_usd']:,.0f})"
+    ]
+    
+    if delta['new_routes']:
+        lines.append(f"\n🆕 신규 경로 {len(delta['new_routes'])}개")
+        for entry in delta['new_routes'][:max_items]:
+            lines.append(f"• {_route_label(entry)}: ${entry['value_usd']:,.0f} ({', '.join(entry['periods'])})")
+    
+    if delta['value_changes']:
+        lines.append(f"\n📈 금액 변화 {len(delta['value_changes'])}건")
+        for entry in delta['value_changes'][:max_items]:
+            basis = '수정' if entry['kind'] == 'revision' else f"{entry['previous_period']} 대비"
+            lines.append(f"• {_route_label(entry)} {entry['period']}: "
+                         f"${entry['previous_value']:,.0f} → ${entry['value_usd']:,.0f} ({entry['change_pct']:+.1f}%, {basis})")
+    
+    if delta['revised_periods']:
+        lines.append(f"\n✏️ 수정된 기간 {len(delta['revised_periods'])}건")
+    
+    return telegram_notifier.send_message_sync('\n'.join(lines))
 
 def send_analysis_summary(analysis_text: str, period_days: int = 7) -> bool:
     """AI 분석 요약 전송"""
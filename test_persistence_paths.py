@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+저장 경로별 일관성 테스트 스크립트
+수집(스트리밍 소스), CSV 업로드, 벌크 파일 적재가 같은 저장 경로를 거쳐
+중복 제외, 집계 테이블, 중복 필터 기준점이 재시작 후에도 원본 테이블과 맞는지 확인
+"""
+
+import sys
+import os
+import io
+import tempfile
+from contextlib import contextmanager
+from datetime import date
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from sqlalchemy import func
+
+from config import Config
+from data_scraper import MacadamiaTradeDataScraper
+from models import TradeRecord, TradeRollup
+from scrapers.source_registry import SourceRegistry, SourceOrchestrator, SourceSpec
+from web.data_api import DataAPIHandler
+
+
+def _records(count=5):
+    return [
+        {
+            'country_origin': 'Australia',
+            'country_destination': 'Korea',
+            'product_code': '080250',
+            'product_description': 'Macadamia nuts, in shell',
+            'trade_value': 10000 + index * 250,
+            'quantity': 1000 + index * 10,
+            'unit': 'kg',
+            'trade_type': 'import',
+            'period': f'2023{index + 1:02d}',
+            'source': 'UN_Comtrade'
+        }
+        for index in range(count)
+    ]
+
+
+@contextmanager
+def _workspace():
+    """임시 DB/중복 필터 파일을 쓰는 설정 (작업 프로세스 없이 파이프라인 스레드에서 처리)"""
+    overrides = ('DATABASE_URL', 'DEDUPE_FILTER_PATH', 'ENRICHMENT_WORKERS')
+    saved = {name: getattr(Config, name) for name in overrides}
+    with tempfile.TemporaryDirectory() as workdir:
+        Config.DATABASE_URL = f"sqlite:///{os.path.join(workdir, 'trade.db')}"
+        Config.DEDUPE_FILTER_PATH = os.path.join(workdir, 'trade_fingerprints.bloom')
+        Config.ENRICHMENT_WORKERS = 0
+        try:
+            yield
+        finally:
+            for name, value in saved.items():
+                setattr(Config, name, value)
+
+
+def _restart(scraper):
+    """수집기를 닫고 같은 DB/필터 파일로 새로 시작"""
+    scraper.close()
+    return MacadamiaTradeDataScraper()
+
+
+def _assert_consistent(scraper, expected_records):
+    """원본 행 수, 집계 테이블, 중복 필터 기준점이 서로 맞는지"""
+    session = scraper.db.session
+    record_count, record_value = session.query(
+        func.count(TradeRecord.id), func.coalesce(func.sum(TradeRecord.value_usd), 0)
+    ).one()
+    rollup_count, rollup_value = session.query(
+        func.coalesce(func.sum(TradeRollup.records), 0), func.coalesce(func.sum(TradeRollup.value_usd), 0)
+    ).one()
+    assert record_count == expected_records, (record_count, expected_records)
+    assert rollup_count == record_count, (rollup_count, record_count)
+    assert abs(rollup_value - record_value) < 1e-6, (rollup_value, record_value)
+    assert scraper.duplicate_filter.watermark == scraper.db.get_fingerprint_watermark()
+
+
+def _use_source(scraper, records):
+    """실제 소스 대신 배치 두 개를 내보내는 스트리밍 소스 하나로 수집"""
+    registry = SourceRegistry()
+    registry.register(SourceSpec('Fake_Stream', lambda: iter([records[:2], records[2:]]),
+                                 host='example.org', rate_limit=0, timeout=30.0, streaming=True))
+    scraper.source_registry = registry
+    scraper.source_orchestrator = SourceOrchestrator(registry)
+
+
+def test_scrape_path_consistent_after_restart():
+    """수집 경로: 재시작 후 같은 데이터는 저장되지 않고, 필터 밖에서 삽입된 행도 기준점/집계에 반영되는지"""
+    records = _records()
+    with _workspace():
+        scraper = MacadamiaTradeDataScraper()
+        _use_source(scraper, records)
+        stats = scraper.collect_all_real_data(budget=30)
+        assert stats['saved'] == len(records), stats
+        assert len(stats['delta']['new_routes']) == 1
+        _assert_consistent(scraper, len(records))
+
+        # 중복 필터/집계를 거치지 않는 기존 단건 저장 경로로 한 건 추가
+        scraper.db.add_record({
+            'date': date(2023, 6, 15), 'country_origin': 'Australia', 'country_destination': 'Korea',
+            'product_code': '080250', 'quantity': 500.0, 'unit': 'kg', 'value_usd': 7000.0, 'trade_type': 'import'
+        })
+        scraper = _restart(scraper)
+        _assert_consistent(scraper, len(records) + 1)
+
+        _use_source(scraper, records)
+        stats = scraper.collect_all_real_data(budget=30)
+        assert stats.get('saved', 0) == 0, stats
+        _assert_consistent(scraper, len(records) + 1)
+        scraper.close()
+
+
+def test_upload_path_consistent_after_restart():
+    """CSV 업로드 경로: 같은 파일을 재시작 후 다시 올려도 저장되지 않는지"""
+    csv_text = 'product_code,country_origin,trade_value,quantity,unit,period\n' + ''.join(
+        f"{record['product_code']},{record['country_origin']},{record['trade_value']},"
+        f"{record['quantity']},{record['unit']},{record['period']}\n"
+        for record in _records()
+    )
+
+    def upload(scraper):
+        app = Flask(__name__)
+        handler = DataAPIHandler({'db_manager': scraper.db, 'scraper': scraper, 'ai_agent': None})
+        app.add_url_rule('/api/upload-data', 'upload_data', handler.upload_data, methods=['POST'])
+        response = app.test_client().post(
+            '/api/upload-data', data={'file': (io.BytesIO(csv_text.encode('utf-8')), 'trade.csv')},
+            content_type='multipart/form-data'
+        )
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return response.get_json()
+
+    with _workspace():
+        scraper = MacadamiaTradeDataScraper()
+        assert upload(scraper)['saved_count'] == 5
+        _assert_consistent(scraper, 5)
+
+        scraper = _restart(scraper)
+        _assert_consistent(scraper, 5)
+        assert upload(scraper)['saved_count'] == 0
+        _assert_consistent(scraper, 5)
+        scraper.close()
+
+
+def test_bulk_ingest_path_consistent_after_restart():
+    """벌크 적재 경로: 여러 청크로 나눠 적재한 뒤 재시작 후 다시 적재해도 저장되지 않는지"""
+    header = 'cmdCode,reporterDesc,partnerDesc,flowDesc,period,primaryValue,netWgt\n'
+    rows = [
+        f"080250,Korea,Australia,Import,{record['period']},{record['trade_value']},{record['quantity']}\n"
+        for record in _records()
+    ]
+    rows.append('090111,Korea,Brazil,Import,202301,5000,800\n')  # 대상 HS 코드가 아닌 행
+
+    with _workspace(), tempfile.TemporaryDirectory() as data_dir:
+        path = os.path.join(data_dir, 'comtrade_bulk.csv')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(header + ''.join(rows))
+
+        scraper = MacadamiaTradeDataScraper()
+        stats = scraper.ingest_bulk_file(path, chunk_size=2)
+        assert stats['rows_matched'] == 5 and stats['rows_saved'] == 5, stats
+        assert len(stats['delta']['new_routes']) == 1
+        _assert_consistent(scraper, 5)
+
+        scraper = _restart(scraper)
+        _assert_consistent(scraper, 5)
+        stats = scraper.ingest_bulk_file(path, chunk_size=2)
+        assert stats['rows_saved'] == 0 and stats['rows_duplicate'] == 5, stats
+        _assert_consistent(scraper, 5)
+        scraper.close()
+
+
+if __name__ == "__main__":
+    print("🧪 저장 경로 일관성 테스트")
+    test_scrape_path_consistent_after_restart()
+    print("✅ 수집 경로")
+    test_upload_path_consistent_after_restart()
+    print("✅ 업로드 경로")
+    test_bulk_ingest_path_consistent_after_restart()
+    print("✅ 벌크 적재 경로")
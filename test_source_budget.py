@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+수집 예산 배분 테스트 스크립트
+느려진 소스가 여러 번의 실행에 걸쳐 예산 안에서 다시 완료되는지,
+버린 작업이 아직 실행 중이면 다음 실행에서 같은 소스를 건너뛰는지 확인
+"""
+
+import sys
+import os
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scrapers import source_registry
+from scrapers.source_registry import SourceRegistry, SourceOrchestrator, SourceSpec
+
+
+def _orchestrator(parser, name='slow_source'):
+    registry = SourceRegistry()
+    registry.register(SourceSpec(name, parser, host='example.org', rate_limit=0, timeout=5.0))
+    return registry, SourceOrchestrator(registry, max_workers=2)
+
+
+def test_slowed_source_recovers():
+    """과거 평균의 두 배보다 느려진 소스가 매번 미뤄지지 않고 남은 예산으로 완료되는지"""
+    original_min_slice = source_registry.MIN_SLICE
+    source_registry.MIN_SLICE = 0.05
+    try:
+        delay = {'seconds': 0.05}
+
+        def parser():
+            time.sleep(delay['seconds'])
+            return [{'value': 1}]
+
+        registry, orchestrator = _orchestrator(parser)
+        for _ in range(3):
+            result = orchestrator.run(force=True, budget=2.0)
+            assert result['sources_used'] == ['slow_source']
+
+        # 평균 0.05초 → 배분 0.1초, 실제 0.4초로 느려짐
+        delay['seconds'] = 0.4
+        outcomes = []
+        for _ in range(4):
+            # 버린 작업이 끝날 때까지 기다린 뒤 다음 실행
+            time.sleep(0.5)
+            result = orchestrator.run(force=True, budget=2.0)
+            outcomes.append('used' if result['sources_used'] else 'deferred')
+            print(f"   - 실행 결과: {outcomes[-1]}, 배분 {result['budget']['slices']}, "
+                  f"평균 {registry.expected_duration('slow_source'):.2f}초")
+
+        assert outcomes[0] == 'deferred', outcomes
+        assert outcomes[1:] == ['used', 'used', 'used'], outcomes
+        # 미룰 때 경과 시간이 평균에 반영되어 이후 배분 시간이 실제 소요 시간을 넘음
+        assert registry.expected_duration('slow_source') * source_registry.SLICE_FACTOR > 0.4
+    finally:
+        source_registry.MIN_SLICE = original_min_slice
+    print("✅ 느려진 소스 예산 회복 테스트 통과")
+
+
+def test_abandoned_source_not_restarted():
+    """배분 시간을 넘겨 버린 작업이 아직 실행 중이면 다음 실행에서 건너뛰는지"""
+    release = threading.Event()
+    calls = []
+
+    def parser():
+        calls.append(time.monotonic())
+        release.wait(5.0)
+        return [{'value': 1}]
+
+    registry, orchestrator = _orchestrator(parser, name='stuck_source')
+    result = orchestrator.run(force=True, budget=0.2)
+    assert result['sources_deferred'] == ['stuck_source']
+
+    result = orchestrator.run(force=True, budget=0.2)
+    assert result['sources_still_running'] == ['stuck_source']
+    assert len(calls) == 1
+
+    release.set()
+    time.sleep(0.1)
+    result = orchestrator.run(force=True, budget=2.0)
+    assert result['sources_used'] == ['stuck_source']
+    assert len(calls) == 2
+    print("✅ 실행 중인 작업 중복 방지 테스트 통과")
+
+
+if __name__ == "__main__":
+    print("🔍 수집 예산 배분 테스트 시작...")
+    test_slowed_source_recovers()
+    test_abandoned_source_not_restarted()
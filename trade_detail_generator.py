@@ -3,14 +3,96 @@
 실제 데이터를 기반으로 한 거래 세부사항 생성
 """
 
+import hashlib
 import random
-from typing import Dict, List
-from datetime import datetime, timedelta
-from company_database import CompanyDatabase
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+from company_database import get_company_database, thaw
+from route_matrix import get_route_matrix
+
+# numpy로 배치 생성 (requirements.txt에 포함, 설치되지 않은 환경에서는 레코드별 시드 생성기 + 캐시로 같은 값 생성)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# 배치 상세 정보 생성이 만드는 열
+ENRICHMENT_COLUMNS = (
+    'exporter_info', 'importer_info', 'shipping_line', 'container_type', 'incoterms',
+    'payment_method', 'inspection_company', 'insurance_company', 'financing_bank',
+    'enhanced_at', 'enhancement_source'
+)
+
+# 시드에서 추출하는 속성 순서 (순서를 바꾸면 같은 지문의 상세 정보가 달라짐)
+SEEDED_ATTRIBUTES = (
+    'exporter_info', 'importer_info', 'shipping_line', 'container_type', 'incoterms',
+    'payment_method', 'inspection_company', 'insurance_company', 'financing_bank'
+)
+
+# 시드별 상세 정보 캐시 크기
+ENRICHMENT_CACHE_SIZE = 65536
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+
+
+def fingerprint_seed(fingerprint: str) -> int:
+    """레코드 지문(16자리 16진수)을 상세 정보 시드로 변환"""
+    return int(fingerprint, 16)
+
+
+def seeded_draws(seed: int, count: int) -> List[int]:
+    """시드의 splitmix64 수열 앞 count개 (속성별 추출 값)"""
+    draws = []
+    for slot in range(1, count + 1):
+        value = (seed + slot * _GOLDEN_GAMMA) & _MASK64
+        value = ((value ^ (value >> 30)) * _MIX1) & _MASK64
+        value = ((value ^ (value >> 27)) * _MIX2) & _MASK64
+        draws.append(value ^ (value >> 31))
+    return draws
+
+
+def record_period(value) -> Tuple[Optional[date], int]:
+    """원본 레코드 날짜 값의 (기간 시작일, 기간 일수) - 연도만 있으면 그 해 전체, 연월이면 그 달 전체
+
+    날짜 객체나 YYYY, YYYYMM, YYYY-MM, YYYYMMDD, YYYY-MM-DD 형식이 아니면 (None, 0)
+    """
+    if isinstance(value, datetime):
+        return value.date(), 1
+    if isinstance(value, date):
+        return value, 1
+    digits = ''.join(ch for ch in str(value or '') if ch.isdigit())
+    try:
+        if len(digits) >= 8:
+            return date(int(digits[:4]), int(digits[4:6]), int(digits[6:8])), 1
+        if len(digits) == 6:
+            year, month = int(digits[:4]), int(digits[4:6])
+            return date(year, month, 1), monthrange(year, month)[1]
+        if len(digits) == 4:
+            year = int(digits)
+            return date(year, 1, 1), (date(year + 1, 1, 1) - date(year, 1, 1)).days
+    except ValueError:
+        pass
+    return None, 0
+
+
+def _seeded_draws_array(seeds, slot: int):
+    """seeded_draws의 slot번째 값을 시드 배열 전체에 대해 한 번에 계산 (uint64 자연 오버플로)"""
+    value = seeds + np.uint64((slot * _GOLDEN_GAMMA) & _MASK64)
+    value = (value ^ (value >> np.uint64(30))) * np.uint64(_MIX1)
+    value = (value ^ (value >> np.uint64(27))) * np.uint64(_MIX2)
+    return value ^ (value >> np.uint64(31))
 
 class TradeDetailGenerator:
     def __init__(self):
-        self.company_db = CompanyDatabase()
+        self.company_db = get_company_database()
+        self.route_matrix = get_route_matrix()
         self.shipping_lines = [
             'Maersk Line', 'MSC', 'CMA CGM', 'COSCO SHIPPING', 
             'Hapag-Lloyd', 'ONE', 'Evergreen', 'Yang Ming', 'HMM'
@@ -26,17 +108,41 @@ class TradeDetailGenerator:
             'HSBC', 'Standard Chartered', 'Deutsche Bank', 'Citibank',
             'BNP Paribas', 'ING Bank', 'Rabobank', 'JPMorgan Chase'
         ]
+        self.container_types = ['20ft', '40ft', '40ft HC']
+        self.incoterms = ['FOB', 'CIF', 'CFR', 'EXW']
+        self.payment_methods = ['L/C', 'T/T', 'D/P', 'D/A']
+        self._fixed_pools = {
+            'shipping_line': self.shipping_lines,
+            'container_type': self.container_types,
+            'incoterms': self.incoterms,
+            'payment_method': self.payment_methods,
+            'inspection_company': self.inspection_companies,
+            'insurance_company': self.insurance_companies,
+            'financing_bank': self.banks
+        }
+        self._normalizer = None
+        # 시드별 상세 정보 캐시 (반복 수집/보고서 재생성/조회 시 재사용)
+        self._cached_enrichment = lru_cache(maxsize=ENRICHMENT_CACHE_SIZE)(self._derive_enrichment)
     
     def generate_detailed_trade_from_wb_data(self, wb_record: Dict, origin_country: str) -> List[Dict]:
-        """World Bank 데이터를 기반으로 상세한 거래 정보 생성"""
+        """World Bank 데이터를 기반으로 상세한 거래 정보 생성 (같은 입력이면 같은 결과)"""
         detailed_trades = []
         
+        # 입력 레코드 내용으로 시드를 고정하여 재수집 시에도 같은 상세 거래 생성
+        seed_key = '|'.join((origin_country, str(wb_record.get('date', '')), str(wb_record.get('value', ''))))
+        rng = random.Random(hashlib.blake2b(seed_key.encode('utf-8'), digest_size=8).digest())
+        
+        # 거래 날짜는 원본 레코드의 기간 안에서 시드로 정함 (날짜가 없는 레코드만 오늘 기준)
+        period_start, period_days = record_period(wb_record.get('date'))
+        if period_start is None:
+            period_start, period_days = date.today(), 1
+        
         # 기본 거래 값
         base_value = float(wb_record.get('value', 0)) * 1000
-        num_trades = random.randint(2, 4)  # 하나의 WB 레코드당 2-4개의 상세 거래 생성
+        num_trades = rng.randint(2, 4)  # 하나의 WB 레코드당 2-4개의 상세 거래 생성
         
         # 수출업체 정보
-        exporter = self.company_db.get_exporter(origin_country)
+        exporter = self.company_db.get_exporter(origin_country, rng)
         if not exporter:
             return []
         
@@ -44,17 +150,19 @@ class TradeDetailGenerator:
         destinations = self.company_db.get_export_destinations(origin_country)
         
         for i in range(num_trades):
-            destination_country = random.choice(destinations)
-            importer = self.company_db.get_importer(destination_country)
+            destination_country = rng.choice(destinations)
+            importer = self.company_db.get_importer(destination_country, rng)
             
             # 거래 규모 계산
             trade_portion = base_value / num_trades
-            quantity = random.randint(2000, 8000)  # kg
+            quantity = rng.randint(2000, 8000)  # kg
             unit_price = trade_portion / quantity if quantity > 0 else 35
             
+            trade_date = period_start + timedelta(days=rng.randrange(period_days))
+            
             # 상세 거래 레코드 생성
             detailed_trade = {
-                'date': datetime.now().date(),
+                'date': trade_date,
                 'country_origin': origin_country,
                 'country_destination': destination_country,
                 
@@ -65,25 +173,25 @@ class TradeDetailGenerator:
                 **self._format_importer_info(importer),
                 
                 # 제품 정보 (상세)
-                **self._generate_product_details(exporter),
+                **self._generate_product_details(exporter, rng),
                 
                 # 거래 조건 (상세)
-                **self._generate_trade_terms(trade_portion, quantity, unit_price),
+                **self._generate_trade_terms(trade_portion, quantity, unit_price, rng, trade_date),
                 
                 # 물류 정보 (상세)
-                **self._generate_shipping_details(origin_country, destination_country),
+                **self._generate_shipping_details(origin_country, destination_country, rng, trade_date),
                 
                 # 검사 및 인증 (상세)
-                **self._generate_inspection_details(),
+                **self._generate_inspection_details(rng, trade_date),
                 
                 # 보험 및 금융 (상세)
-                **self._generate_financial_details(trade_portion),
+                **self._generate_financial_details(trade_portion, rng),
                 
                 # 기타 정보
                 'trade_type': 'export',
                 'source': 'WorldBank_OpenData_Enhanced',
                 'data_confidence': 'High',
-                'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                'last_updated': period_start.strftime('%Y-%m-%d %H:%M:%S')
             }
             
             detailed_trades.append(detailed_trade)
@@ -141,33 +249,35 @@ class TradeDetailGenerator:
             'importer_annual_turnover': importer.get('annual_turnover', '')
         }
     
-    def _generate_product_details(self, exporter: Dict) -> Dict:
+    def _generate_product_details(self, exporter: Dict, rng=random) -> Dict:
         """제품 상세 정보 생성"""
-        quality_grade = random.choice(exporter.get('quality_grades', ['Premium', 'Grade A']))
-        variety = random.choice(exporter.get('varieties_grown', ['A4', 'A16']))
+        quality_grade = rng.choice(exporter.get('quality_grades', ['Premium', 'Grade A']))
+        variety = rng.choice(exporter.get('varieties_grown', ['A4', 'A16']))
         
         return {
             'product_code': '0802.90',
             'product_description': f'Macadamia nuts, shelled - {quality_grade}',
             'product_variety': variety,
             'product_grade': quality_grade,
-            'product_origin_farm': random.choice(exporter.get('farm_locations', ['Farm Location'])),
-            'product_harvest_date': f"{random.choice(['March', 'April', 'May'])} 2024",
-            'product_processing_date': f"{random.choice(['June', 'July'])} 2024",
-            'product_moisture_content': f"{random.uniform(1.0, 1.5):.1f}%",
-            'product_size_range': random.choice(['16-18mm', '18-20mm', '20-22mm', 'Mixed sizes']),
-            'product_defect_rate': f"{random.uniform(0.5, 2.0):.1f}%",
+            'product_origin_farm': rng.choice(exporter.get('farm_locations', ['Farm Location'])),
+            'product_harvest_date': f"{rng.choice(['March', 'April', 'May'])} 2024",
+            'product_processing_date': f"{rng.choice(['June', 'July'])} 2024",
+            'product_moisture_content': f"{rng.uniform(1.0, 1.5):.1f}%",
+            'product_size_range': rng.choice(['16-18mm', '18-20mm', '20-22mm', 'Mixed sizes']),
+            'product_defect_rate': f"{rng.uniform(0.5, 2.0):.1f}%",
             'product_shelf_life': '24 months from processing date',
             'product_storage_conditions': 'Cool, dry place below 20°C, humidity <65%'
         }
     
-    def _generate_trade_terms(self, trade_value: float, quantity: int, unit_price: float) -> Dict:
-        """거래 조건 생성"""
-        payment_terms = random.choice([
+    def _generate_trade_terms(self, trade_value: float, quantity: int, unit_price: float, rng=random,
+                              trade_date: date = None) -> Dict:
+        """거래 조건 생성 (계약일은 거래일 기준)"""
+        trade_date = trade_date or date.today()
+        payment_terms = rng.choice([
             'L/C at sight', 'T/T 30 days', 'D/P at sight', 'CAD (Cash Against Documents)'
         ])
-        incoterms = random.choice(['FOB', 'CIF', 'CFR', 'EXW'])
-        packaging = random.choice(['25kg jute bags', '50kg poly bags', 'Bulk containers'])
+        incoterms = rng.choice(['FOB', 'CIF', 'CFR', 'EXW'])
+        packaging = rng.choice(['25kg jute bags', '50kg poly bags', 'Bulk containers'])
         
         return {
             'quantity': quantity,
@@ -179,88 +289,95 @@ class TradeDetailGenerator:
             'payment_terms': payment_terms,
             'incoterms': incoterms,
             'currency': 'USD',
-            'contract_number': f"MAC-{random.randint(100000, 999999)}",
-            'contract_date': (datetime.now() - timedelta(days=random.randint(30, 90))).date(),
+            'contract_number': f"MAC-{rng.randint(100000, 999999)}",
+            'contract_date': trade_date - timedelta(days=rng.randint(30, 90)),
             'delivery_terms': f"{incoterms} terms apply",
             'payment_method': 'Bank transfer' if 'T/T' in payment_terms else 'Letter of Credit'
         }
     
-    def _generate_shipping_details(self, origin_country: str, destination_country: str) -> Dict:
-        """물류 정보 생성"""
-        # 항구 정보
-        loading_ports = {
-            'Australia': ['Port of Brisbane', 'Port of Sydney', 'Port of Melbourne'],
-            'South Africa': ['Port of Durban', 'Port of Cape Town'],
-            'Kenya': ['Port of Mombasa', 'Jomo Kenyatta Airport']
-        }
+    def _generate_shipping_details(self, origin_country: str, destination_country: str, rng=random,
+                                   trade_date: date = None) -> Dict:
+        """물류 정보 생성 (항구/운송 일수/선사는 항로 매트릭스에서 조회, 도착일은 거래일)
         
-        discharge_ports = {
-            'China': ['Port of Shanghai', 'Port of Shenzhen', 'Port of Ningbo'],
-            'Germany': ['Port of Hamburg', 'Port of Bremen'],
-            'Japan': ['Port of Tokyo', 'Port of Yokohama', 'Port of Osaka'],
-            'South Korea': ['Port of Busan', 'Port of Incheon'],
-            'USA': ['Port of Los Angeles', 'Port of Long Beach', 'Port of New York']
-        }
+        선적/하역 항구는 같은 운송 수단의 경로가 있는 쌍에서 고르므로 항공 경로에는 항공사가 배정됨
+        """
+        routes = self.route_matrix.routes_between(origin_country, destination_country)
+        route = rng.choice(routes) if routes else None
+        if route:
+            loading_port = route.origin['port_name']
+            discharge_port = route.destination['port_name']
+        else:
+            loading_ports = self.route_matrix.loading_ports(origin_country)
+            discharge_ports = self.route_matrix.discharge_ports(destination_country)
+            loading_port = rng.choice(loading_ports)['port_name'] if loading_ports else 'International Port'
+            discharge_port = rng.choice(discharge_ports)['port_name'] if discharge_ports else 'International Port'
         
-        loading_port = random.choice(loading_ports.get(origin_country, ['International Port']))
-        discharge_port = random.choice(discharge_ports.get(destination_country, ['International Port']))
-        shipping_line = random.choice(self.shipping_lines)
+        by_air = route is not None and route.mode == 'air'
+        shipping_line = rng.choice(route.carriers if route and route.carriers else self.shipping_lines)
+        # 항로 운송 일수 + 지연 (경로를 모르면 기존 범위)
+        transit_days = route.transit_days + rng.randint(0, 3) if route else rng.randint(18, 35)
+        arrival_date = trade_date or date.today()
+        departure_date = arrival_date - timedelta(days=transit_days)
         
         return {
+            'transport_mode': route.mode if route else 'sea',
             'port_of_loading': loading_port,
             'port_of_discharge': discharge_port,
             'shipping_line': shipping_line,
-            'vessel_name': f"M/V {shipping_line.split()[0]} {random.randint(100, 999)}",
-            'voyage_number': f"{random.randint(100, 999)}W",
-            'container_type': random.choice(['20ft', '40ft', '40ft HC']),
-            'container_number': f"{random.choice(['TEMU', 'GESU', 'MSCU'])}{random.randint(1000000, 9999999)}",
-            'bill_of_lading': f"BL{random.randint(100000000, 999999999)}",
-            'loading_date': (datetime.now() - timedelta(days=random.randint(14, 28))).date(),
-            'departure_date': (datetime.now() - timedelta(days=random.randint(10, 25))).date(),
-            'arrival_date': datetime.now().date(),
-            'estimated_transit_time': f"{random.randint(18, 35)} days",
-            'freight_rate': f"USD {random.randint(1200, 2800)} per container",
-            'temperature_control': random.choice(['Ambient', 'Climate controlled', 'Reefer container'])
+            'vessel_name': f"{shipping_line.split()[0]} Flight {rng.randint(100, 999)}" if by_air
+                           else f"M/V {shipping_line.split()[0]} {rng.randint(100, 999)}",
+            'voyage_number': f"{rng.randint(100, 999)}W",
+            'container_type': rng.choice(['AKE ULD', 'PMC pallet'] if by_air else ['20ft', '40ft', '40ft HC']),
+            'container_number': f"{rng.choice(['TEMU', 'GESU', 'MSCU'])}{rng.randint(1000000, 9999999)}",
+            'bill_of_lading': f"BL{rng.randint(100000000, 999999999)}",
+            'loading_date': departure_date - timedelta(days=rng.randint(1, 4)),
+            'departure_date': departure_date,
+            'arrival_date': arrival_date,
+            'estimated_transit_time': f"{transit_days} days",
+            'route_distance_nm': route.distance_nm if route else None,
+            'freight_rate': f"USD {rng.randint(1200, 2800)} per container",
+            'temperature_control': rng.choice(['Ambient', 'Climate controlled', 'Reefer container'])
         }
     
-    def _generate_inspection_details(self) -> Dict:
-        """검사 및 인증 정보 생성"""
-        inspection_company = random.choice(self.inspection_companies)
+    def _generate_inspection_details(self, rng=random, trade_date: date = None) -> Dict:
+        """검사 및 인증 정보 생성 (검사일은 거래일 기준)"""
+        trade_date = trade_date or date.today()
+        inspection_company = rng.choice(self.inspection_companies)
         
         return {
             'pre_shipment_inspection': inspection_company,
-            'quality_certificate': f"QC-{random.randint(100000, 999999)}",
-            'phytosanitary_certificate': f"PC-{random.randint(100000, 999999)}",
-            'origin_certificate': f"COO-{random.randint(100000, 999999)}",
-            'health_certificate': f"HC-{random.randint(100000, 999999)}",
-            'inspection_date': (datetime.now() - timedelta(days=random.randint(5, 15))).date(),
-            'inspection_result': random.choice(['Pass', 'Pass with remarks', 'Conditional pass']),
-            'laboratory_tests': random.choice([
+            'quality_certificate': f"QC-{rng.randint(100000, 999999)}",
+            'phytosanitary_certificate': f"PC-{rng.randint(100000, 999999)}",
+            'origin_certificate': f"COO-{rng.randint(100000, 999999)}",
+            'health_certificate': f"HC-{rng.randint(100000, 999999)}",
+            'inspection_date': trade_date - timedelta(days=rng.randint(5, 15)),
+            'inspection_result': rng.choice(['Pass', 'Pass with remarks', 'Conditional pass']),
+            'laboratory_tests': rng.choice([
                 'Moisture content, Aflatoxin, Pesticide residue',
                 'Microbiological analysis, Heavy metals',
                 'Physical inspection, Chemical analysis'
             ]),
-            'inspector_name': f"{random.choice(['John', 'Sarah', 'Michael', 'Emma'])} {random.choice(['Smith', 'Johnson', 'Brown'])}",
-            'inspection_fee': f"USD {random.randint(800, 1500)}"
+            'inspector_name': f"{rng.choice(['John', 'Sarah', 'Michael', 'Emma'])} {rng.choice(['Smith', 'Johnson', 'Brown'])}",
+            'inspection_fee': f"USD {rng.randint(800, 1500)}"
         }
     
-    def _generate_financial_details(self, trade_value: float) -> Dict:
+    def _generate_financial_details(self, trade_value: float, rng=random) -> Dict:
         """보험 및 금융 정보 생성"""
-        insurance_company = random.choice(self.insurance_companies)
-        bank = random.choice(self.banks)
+        insurance_company = rng.choice(self.insurance_companies)
+        bank = rng.choice(self.banks)
         
         return {
             'marine_insurance': insurance_company,
             'insurance_value': round(trade_value * 1.1, 2),  # 110% of trade value
             'insurance_company': insurance_company,
             'insurance_premium': f"USD {round(trade_value * 0.002, 2)}",  # 0.2% of trade value
-            'letter_of_credit': f"LC{random.randint(100000, 999999)}",
+            'letter_of_credit': f"LC{rng.randint(100000, 999999)}",
             'issuing_bank': bank,
-            'advising_bank': random.choice(self.banks),
-            'credit_terms': random.choice(['Sight LC', '30 days LC', '60 days LC']),
-            'bank_charges': f"USD {random.randint(200, 800)}",
-            'exchange_rate': f"{random.uniform(1.30, 1.40):.4f}",
-            'hedging_strategy': random.choice(['Forward contract', 'Currency option', 'Natural hedge', 'No hedge'])
+            'advising_bank': rng.choice(self.banks),
+            'credit_terms': rng.choice(['Sight LC', '30 days LC', '60 days LC']),
+            'bank_charges': f"USD {rng.randint(200, 800)}",
+            'exchange_rate': f"{rng.uniform(1.30, 1.40):.4f}",
+            'hedging_strategy': rng.choice(['Forward contract', 'Currency option', 'Natural hedge', 'No hedge'])
         }
     
     def generate_shipping_port_info(self, origin_country: str, destination_country: str) -> Dict:
@@ -272,41 +389,106 @@ class TradeDetailGenerator:
         return port_info
     
     def _get_port_details(self, country: str) -> Dict:
-        """항구 상세 정보"""
-        port_database = {
-            'Australia': {
-                'port_name': 'Port of Brisbane',
-                'port_code': 'AUBNE',
-                'location': 'Brisbane, Queensland',
-                'facilities': 'Container terminals, Bulk cargo, Cold storage',
-                'operating_hours': '24/7',
-                'contact': '+61-7-3258-4888'
-            },
-            'China': {
-                'port_name': 'Port of Shanghai',
-                'port_code': 'CNSHA',
-                'location': 'Shanghai, China',
-                'facilities': 'World\'s busiest container port, Automated terminals',
-                'operating_hours': '24/7',
-                'contact': '+86-21-2858-1888'
-            },
-            'Germany': {
-                'port_name': 'Port of Hamburg',
-                'port_code': 'DEHAM',
-                'location': 'Hamburg, Germany',
-                'facilities': 'Europe\'s third-largest port, Rail connections',
-                'operating_hours': '24/7',
-                'contact': '+49-40-3788-0'
-            }
-        }
-        return port_database.get(country, {
-            'port_name': f'{country} International Port',
-            'port_code': f'{country[:2].upper()}XXX',
-            'facilities': 'Standard port facilities'
-        })
+        """항구 상세 정보 (항로 매트릭스의 공유 읽기 전용 정보)"""
+        return self.route_matrix.port_details(country)
+    
+    def enhance_trade_records(self, records: List[Dict], columns: Optional[Dict[str, list]] = None) -> Dict[str, list]:
+        """레코드 배치의 상세 정보를 열 단위로 한 번에 생성
+        
+        입력 레코드는 복사/수정하지 않고 ENRICHMENT_COLUMNS 열(레코드 순서, 대상이 아닌 행은 None)을 반환.
+        상세 정보는 레코드 지문을 시드로 한 순수 함수이므로 같은 레코드는 언제 다시 만들어도 같은 값이 나옴.
+        columns는 같은 레코드의 표준화 열(fingerprint/country_origin/country_destination)이며,
+        없으면 직접 표준화함.
+        """
+        count = len(records)
+        if columns is None:
+            columns = self._normalize(records)
+        eligible = [bool(record and record.get('product_code') and record.get('country_origin')) for record in records]
+        origins = columns['country_origin']
+        destinations = columns['country_destination']
+        seeds = [fingerprint_seed(fingerprint) for fingerprint in columns['fingerprint']]
+        
+        if NUMPY_AVAILABLE:
+            result = self._enrichment_columns_vectorized(seeds, origins, destinations, eligible)
+        else:
+            result = {name: [None] * count for name in SEEDED_ATTRIBUTES}
+            for index, ok in enumerate(eligible):
+                if ok:
+                    derived = self.enrichment_from_seed(seeds[index], origins[index], destinations[index])
+                    for name in SEEDED_ATTRIBUTES:
+                        result[name][index] = derived[name]
+        
+        enhanced_at = datetime.now().isoformat()
+        result['enhanced_at'] = [enhanced_at if ok else None for ok in eligible]
+        result['enhancement_source'] = ['TradeDetailGenerator' if ok else None for ok in eligible]
+        return result
+    
+    def _enrichment_columns_vectorized(self, seeds: List[int], origins: List[str], destinations: List[str],
+                                       eligible: List[bool]) -> Dict[str, list]:
+        """enrichment_from_seed와 같은 값을 시드 배열에 대해 속성마다 한 번의 벡터 연산으로 계산"""
+        count = len(seeds)
+        seed_array = np.array(seeds, dtype=np.uint64)
+        draws = {name: _seeded_draws_array(seed_array, slot) for slot, name in enumerate(SEEDED_ATTRIBUTES, 1)}
+        result = {}
+        for name, pool in self._fixed_pools.items():
+            picks = (draws[name] % np.uint64(len(pool))).tolist()
+            result[name] = [pool[pick] if ok else None for pick, ok in zip(picks, eligible)]
+        
+        # 수출/수입업체: 국가별 후보 목록이 다르므로 국가별로 모아서 추출
+        result['exporter_info'] = [None] * count
+        result['importer_info'] = [None] * count
+        rows_by_origin = {}
+        rows_by_destination = {}
+        for index, ok in enumerate(eligible):
+            if ok:
+                rows_by_origin.setdefault(origins[index], []).append(index)
+                rows_by_destination.setdefault(destinations[index], []).append(index)
+        for name, groups, pool_of in (('exporter_info', rows_by_origin, self.company_db.exporters.get),
+                                      ('importer_info', rows_by_destination, self._importer_pool)):
+            values = result[name]
+            for country, rows in groups.items():
+                pool = pool_of(country)
+                if not pool:
+                    continue
+                picks = (draws[name][rows] % np.uint64(len(pool))).tolist()
+                for index, pick in zip(rows, picks):
+                    values[index] = pool[pick]
+        return result
+    
+    def enrichment_from_seed(self, seed: int, origin_country: str, destination_country: str) -> Dict:
+        """레코드 시드에서 상세 정보 생성 (같은 시드면 항상 같은 결과, 조회 시 복원용)
+        
+        결과는 캐시에서 공유되므로 수정하지 말고 복사해서 사용.
+        """
+        return self._cached_enrichment(seed, origin_country or '', destination_country or '')
+    
+    def _derive_enrichment(self, seed: int, origin_country: str, destination_country: str) -> Dict:
+        draws = dict(zip(SEEDED_ATTRIBUTES, seeded_draws(seed, len(SEEDED_ATTRIBUTES))))
+        derived = {name: pool[draws[name] % len(pool)] for name, pool in self._fixed_pools.items()}
+        exporters = self.company_db.exporters.get(origin_country)
+        importers = self._importer_pool(destination_country)
+        derived['exporter_info'] = exporters[draws['exporter_info'] % len(exporters)] if exporters else None
+        derived['importer_info'] = importers[draws['importer_info'] % len(importers)] if importers else None
+        return derived
+    
+    def _importer_pool(self, destination_country: str) -> List[Dict]:
+        """도착국 수입업체 목록 (등록되지 않은 국가는 한국 수입업체)"""
+        return self.company_db.importers.get(destination_country) or self.company_db.importers.get('South Korea', [])
+    
+    def _normalize(self, records: List[Dict]) -> Dict[str, list]:
+        """지문/국가 열을 얻기 위한 표준화 (빈 레코드도 자리를 유지)"""
+        if self._normalizer is None:
+            from pipeline.normalizer import TradeRecordNormalizer
+            self._normalizer = TradeRecordNormalizer()
+        return self._normalizer.normalize([record or {'product_code': ''} for record in records]).columns
+    
+    def enrichment_cache_info(self) -> Dict:
+        """상세 정보 캐시 적중 통계"""
+        info = self._cached_enrichment.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'max_size': info.maxsize}
     
     def enhance_trade_record(self, record: Dict) -> Dict:
-        """기본 무역 레코드에 상세 정보 추가"""
+        """기본 무역 레코드에 상세 정보 추가 (enhance_trade_records와 같은 레코드면 같은 값)"""
         enhanced_record = record.copy()
         
         try:
@@ -314,25 +496,14 @@ class TradeDetailGenerator:
             if not record.get('product_code') or not record.get('country_origin'):
                 return enhanced_record
             
-            # 회사 정보 추가
-            origin_country = record.get('country_origin', '')
-            if origin_country in self.company_db.exporters:
-                exporter = random.choice(self.company_db.exporters[origin_country])
-                enhanced_record['exporter_info'] = exporter
-            
-            importer = random.choice(self.company_db.korean_importers)
-            enhanced_record['importer_info'] = importer
-            
-            # 물류 정보 추가
-            enhanced_record['shipping_line'] = random.choice(self.shipping_lines)
-            enhanced_record['container_type'] = random.choice(['20ft', '40ft', '40ft HC'])
-            enhanced_record['incoterms'] = random.choice(['FOB', 'CIF', 'CFR', 'EXW'])
-            enhanced_record['payment_method'] = random.choice(['L/C', 'T/T', 'D/P', 'D/A'])
-            
-            # 검사 및 인증 정보
-            enhanced_record['inspection_company'] = random.choice(self.inspection_companies)
-            enhanced_record['insurance_company'] = random.choice(self.insurance_companies)
-            enhanced_record['financing_bank'] = random.choice(self.banks)
+            columns = self._normalize([record])
+            derived = self.enrichment_from_seed(
+                fingerprint_seed(columns['fingerprint'][0]),
+                columns['country_origin'][0], columns['country_destination'][0]
+            )
+            for name in SEEDED_ATTRIBUTES:
+                if derived[name] is not None:
+                    enhanced_record[name] = thaw(derived[name])
             
             # 타임스탬프 추가
             enhanced_record['enhanced_at'] = datetime.now().isoformat()
@@ -38,6 +38,13 @@ class FlaskAppConfig:
         # 컴포넌트 초기화
         self._initialize_components()
         
+        # 요청 스레드가 쓴 DB 세션 반납 (세션은 스레드별)
+        @self.app.teardown_appcontext
+        def release_db_sessions(exception=None):
+            for db in (self.db_manager, self.scraper.db if self.scraper else None):
+                if db is not None:
+                    db.release_session()
+        
         # 스케줄러 시작
         self._start_scheduler()
         
@@ -62,8 +69,8 @@ class FlaskAppConfig:
                 logger.error(f"Failed to initialize AI Agent: {e}")
                 self.ai_agent = None
             
-            # 스케줄러
-            self.scheduler = MacadamiaTradeScheduler()
+            # 스케줄러 (수집기 공유)
+            self.scheduler = MacadamiaTradeScheduler(self.scraper)
             logger.info("Scheduler initialized")
             
         except Exception as e:
@@ -137,8 +144,8 @@ def create_components():
             logger.error(f"Failed to initialize AI Agent: {e}")
             ai_agent = None
         
-        # 스케줄러
-        scheduler = MacadamiaTradeScheduler()
+        # 스케줄러 (수집기 공유)
+        scheduler = MacadamiaTradeScheduler(scraper)
         logger.info("Scheduler initialized")
         
         return {
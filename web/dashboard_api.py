@@ -4,6 +4,7 @@
 from flask import jsonify
 from datetime import datetime, timedelta
 import logging
+from scrapers.resilience import get_circuit_breakers
 
 logger = logging.getLogger(__name__)
 
@@ -23,26 +24,9 @@ class DashboardAPI:
             total_records = len(records)
             total_value = sum(record.value_usd or 0 for record in records)
             
-            # 국가별 통계
-            export_stats = {}
-            import_stats = {}
-            
-            for record in records:
-                # 수출국 통계
-                if record.country_origin not in export_stats:
-                    export_stats[record.country_origin] = {'value': 0, 'count': 0}
-                export_stats[record.country_origin]['value'] += record.value_usd or 0
-                export_stats[record.country_origin]['count'] += 1
-                
-                # 수입국 통계
-                if record.country_destination not in import_stats:
-                    import_stats[record.country_destination] = {'value': 0, 'count': 0}
-                import_stats[record.country_destination]['value'] += record.value_usd or 0
-                import_stats[record.country_destination]['count'] += 1
-            
-            # 상위 5개 국가
-            top_exporters = sorted(export_stats.items(), key=lambda x: x[1]['value'], reverse=True)[:5]
-            top_importers = sorted(import_stats.items(), key=lambda x: x[1]['value'], reverse=True)[:5]
+            # 상위 5개 국가 (표준 국가 코드 기준 DB 집계)
+            top_exporters = self.db_manager.get_country_totals(365, role='origin', limit=5)
+            top_importers = self.db_manager.get_country_totals(365, role='destination', limit=5)
             
             # 월별 데이터 (최근 12개월)
             monthly_data = {}
@@ -84,7 +68,8 @@ class DashboardAPI:
                     'database': 'connected',
                     'last_update': last_update.strftime('%Y-%m-%d %H:%M:%S') if last_update else 'No data',
                     'scheduler': 'running',
-                    'total_records': len(self.db_manager.get_latest_records(30))
+                    'total_records': len(self.db_manager.get_latest_records(30)),
+                    'circuit_breakers': get_circuit_breakers().snapshot()
                 }
             })
         except Exception as e:
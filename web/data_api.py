@@ -30,10 +30,10 @@ class DataAPIHandler:
                     'product_description': record.product_description,
                     'country_origin': record.country_origin,
                     'country_destination': record.country_destination,
-                    'trade_value': record.trade_value,
+                    'trade_value': record.value_usd,
                     'quantity': record.quantity,
                     'trade_type': record.trade_type,
-                    'source': record.source
+                    'source': record.get_detailed_info().get('source')
                 })
             
             return jsonify({
@@ -60,13 +60,18 @@ class DataAPIHandler:
                     'success': True,
                     'message': f'데이터 수집 완료: {result["total_collected"]}건 수집',
                     'total_collected': result['total_collected'],
+                    'saved': result.get('saved', 0),
                     'sources_used': result['sources_used'],
+                    'sources_deferred': result.get('sources_deferred', []),
+                    'budget': result.get('budget'),
                     'errors': result.get('errors', [])
                 })
             else:
                 return jsonify({
                     'success': False,
-                    'error': result.get('errors', ['데이터 수집 실패'])
+                    'error': result.get('errors', ['데이터 수집 실패']),
+                    'sources_deferred': result.get('sources_deferred', []),
+                    'budget': result.get('budget')
                 })
         except Exception as e:
             logger.error(f"Manual collect error: {e}")
@@ -205,31 +210,18 @@ class DataAPIHandler:
                         'error': f'Missing required columns: {missing_columns}'
                     }), 400
                 
-                # 데이터 저장
-                saved_count = 0
-                for _, row in df.iterrows():
-                    try:
-                        from models import TradeRecord
-                        record = TradeRecord(
-                            product_code=row.get('product_code', ''),
-                            product_description=row.get('product_description', ''),
-                            country_origin=row.get('country_origin', ''),
-                            country_destination=row.get('country_destination', 'Korea'),
-                            trade_value=float(row.get('trade_value', 0)),
-                            quantity=float(row.get('quantity', 0)),
-                            trade_type=row.get('trade_type', 'import'),
-                            period=row.get('period', datetime.now().strftime('%Y%m')),
-                            year=int(row.get('year', datetime.now().year)),
-                            source='Manual_Upload'
-                        )
-                        
-                        record_id = self.db_manager.save_trade_record(record)
-                        if record_id:
-                            saved_count += 1
-                            
-                    except Exception as e:
-                        logger.error(f"레코드 저장 오류: {e}")
-                        continue
+                # 기본값은 열 단위로 채움
+                for column, default in (('country_destination', 'Korea'), ('trade_type', 'import'),
+                                        ('source', 'Manual_Upload')):
+                    df[column] = df[column].fillna(default) if column in df.columns else default
+                if 'period' not in df.columns and 'year' not in df.columns:
+                    df['period'] = datetime.now().strftime('%Y%m')
+                
+                df = df.astype(object).where(pd.notnull(df), None)
+                records = df.to_dict('records')
+                
+                # 수집 데이터와 같은 경로로 저장 (표준화 → 중복 제외 → 대량 저장 → 집계 스냅샷 반영)
+                saved_count = self.scraper.save_to_database(records)
                 
                 return jsonify({
                     'success': True,
@@ -15,8 +15,8 @@ class DatabaseAPI:
         self.db_manager = db_manager
         self.config = config
     
-    def init_database(self):
-        """데이터베이스 초기화 및 샘플 데이터 생성"""
+    def init_database(self, scraper):
+        """데이터베이스 초기화 및 샘플 데이터 생성 (수집 데이터와 같은 중복 필터/집계 갱신 경로로 저장)"""
         try:
             # 기존 데이터 확인
             existing_records = self.db_manager.get_latest_records(10)
@@ -31,16 +31,8 @@ class DatabaseAPI:
             # 샘플 데이터 생성
             sample_data = self._generate_sample_data()
             
-            # 데이터베이스에 저장
-            saved_count = 0
-            for data in sample_data:
-                try:
-                    saved = self.db_manager.save_record(data)
-                    if saved:
-                        saved_count += 1
-                except Exception as e:
-                    logger.error(f"Error saving sample record: {e}")
-                    continue
+            # 표준화 → 중복 제외 → 대량 저장 → 집계 스냅샷 반영
+            saved_count = scraper.save_to_database(sample_data)
             
             return jsonify({
                 'success': True,
@@ -161,7 +153,8 @@ class DatabaseAPI:
                 'quantity': quantity,
                 'unit': product['unit'],
                 'value_usd': value,
-                'trade_type': 'export'
+                'trade_type': 'export',
+                'source': 'Sample_Data'
             }
             
             sample_data.append(record_data)
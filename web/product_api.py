@@ -4,6 +4,8 @@
 from flask import jsonify, request
 import logging
 from product_database import search_products_by_name, get_hs_code_info, get_all_product_categories
+from hs_index import get_hs_index, normalize_hs_code
+from .reference_cache import DEFAULT_MAX_AGE, DEFAULT_MAX_ENTRIES, ReferenceCache
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,13 @@ class ProductAPIHandler:
     
     def __init__(self, components):
         self.db_manager = components['db_manager']
+        config = components.get('config')
+        max_age = getattr(config, 'REFERENCE_CACHE_MAX_AGE', DEFAULT_MAX_AGE)
+        # 카탈로그/HS 코드 응답은 종류가 한정되어 있고 검색 응답은 질의별이므로 캐시를 따로 둠
+        self.reference_cache = ReferenceCache(max_age=max_age)
+        self.search_cache = ReferenceCache(
+            max_entries=getattr(config, 'SEARCH_CACHE_SIZE', DEFAULT_MAX_ENTRIES), max_age=max_age
+        )
         
     def search_products(self):
         """제품 검색"""
@@ -30,15 +39,20 @@ class ProductAPIHandler:
                     'error': 'Search query must be at least 2 characters'
                 }), 400
             
-            # 제품 검색 실행
-            results = search_products_by_name(query)
+            # 제품 검색 실행 (fuzzy=1이면 오타/부분 입력 허용 유사도 검색)
+            fuzzy = request.args.get('fuzzy', '').lower() in ('1', 'true', 'yes')
             
-            return jsonify({
-                'success': True,
-                'results': results,
-                'query': query,
-                'total': len(results)
-            })
+            def build():
+                results = search_products_by_name(query, fuzzy=fuzzy)
+                return {
+                    'success': True,
+                    'results': results,
+                    'query': query,
+                    'fuzzy': fuzzy,
+                    'total': len(results)
+                }
+            
+            return self.search_cache.respond((query, fuzzy), build)
             
         except Exception as e:
             logger.error(f"제품 검색 오류: {e}")
@@ -80,17 +94,71 @@ class ProductAPIHandler:
                 'error': str(e)
             }), 500
     
-    def get_categories(self):
-        """제품 카테고리 목록"""
+    def get_hscode_info(self, hs_code: str):
+        """HS 코드 계층 정보 (/api/hscode/<hs_code>)
+        
+        코드 항목과 상위 계층, 바로 아래 코드를 반환하며 ?descendants=1이면 하위 코드 전체를 포함
+        """
         try:
-            # 모든 제품 카테고리 조회
-            categories = get_all_product_categories()
+            code = normalize_hs_code(hs_code)
+            if not code:
+                return jsonify({
+                    'success': False,
+                    'error': f'Invalid HS code: {hs_code}'
+                }), 400
+            
+            descendants = request.args.get('descendants', '').lower() in ('1', 'true', 'yes')
+            return self.reference_cache.respond(
+                ('hscode', code, descendants), lambda: self._hs_payload(hs_code, code, descendants)
+            )
             
+        except Exception as e:
+            logger.error(f"HS 코드 계층 조회 오류: {e}")
             return jsonify({
-                'success': True,
-                'categories': categories,
-                'total': len(categories)
-            })
+                'success': False,
+                'error': str(e)
+            }), 500
+    
+    def _hs_payload(self, hs_code: str, code: str, descendants: bool):
+        index = get_hs_index()
+        entry = index.get(code)
+        if entry is None:
+            return jsonify({
+                'success': False,
+                'error': f'HS code {hs_code} not found'
+            }), 404
+        
+        payload = {
+            'success': True,
+            'hs_code': code,
+            'level': entry['level'],
+            'description': entry.get('description'),
+            'products': list(entry.get('products', ())),
+            'info': get_hs_code_info(code),
+            'ancestors': [self._hs_summary(item) for item in index.ancestors(code)],
+            'children': [self._hs_summary(item) for item in index.children(code)]
+        }
+        if descendants:
+            payload['descendants'] = [self._hs_summary(item) for item in index.prefix(code) if item['code'] != code]
+        return payload
+    
+    @staticmethod
+    def _hs_summary(entry) -> dict:
+        return {'code': entry['code'], 'level': entry['level'], 'description': entry.get('description')}
+    
+    def get_product_categories(self):
+        """제품 카테고리 목록 (/api/products/categories)"""
+        try:
+            def build():
+                # 모든 제품 카테고리 조회
+                categories = get_all_product_categories()
+                return {
+                    'success': True,
+                    'categories': categories,
+                    'total': len(categories)
+                }
+            
+            return self.reference_cache.respond(('categories',), build)
             
         except Exception as e:
             logger.error(f"카테고리 조회 오류: {e}")
@@ -99,6 +167,8 @@ class ProductAPIHandler:
                 'error': str(e)
             }), 500
     
+    get_categories = get_product_categories
+    
     def get_product_stats(self):
         """제품별 통계"""
         try:
@@ -0,0 +1,95 @@
+"""
+참조 데이터 응답 캐시
+배포 때만 바뀌는 제품/HS 코드 응답을 한 번만 JSON으로 직렬화해 두고
+강한 ETag와 Cache-Control을 붙여 반환하며, If-None-Match가 일치하면 304로 응답
+"""
+from collections import OrderedDict, namedtuple
+from typing import Callable, Dict, Hashable, Optional
+import hashlib
+import json
+import logging
+import threading
+
+from flask import Response, request
+
+logger = logging.getLogger(__name__)
+
+# 브라우저/프록시 캐시 유지 시간 (초) - 값이 바뀌면 ETag가 바뀌므로 재검증으로 갱신
+DEFAULT_MAX_AGE = 86400
+
+# 캐시할 응답 수 (가장 오래 쓰이지 않은 것부터 제거)
+DEFAULT_MAX_ENTRIES = 1024
+
+# 직렬화된 응답 (body는 UTF-8 JSON 바이트, etag는 따옴표 없는 값)
+CachedPayload = namedtuple('CachedPayload', ['body', 'etag'])
+
+
+def serialize_payload(payload: Dict) -> CachedPayload:
+    """응답 dict를 JSON 바이트와 내용 기반 강한 ETag로 변환"""
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return CachedPayload(body, hashlib.blake2b(body, digest_size=16).hexdigest())
+
+
+class ReferenceCache:
+    """직렬화된 참조 데이터 응답의 LRU 캐시
+
+    사용:
+        cache.respond(('categories',), lambda: {'success': True, ...})
+
+    build()는 캐시에 없을 때만 호출되며 성공 응답 dict를 반환하거나,
+    오류 응답(Flask 응답 또는 (응답, 상태 코드))을 그대로 돌려주면 캐시하지 않고 반환함.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_age: int = DEFAULT_MAX_AGE):
+        self.max_entries = max(1, max_entries)
+        self.cache_control = f'public, max-age={max(0, max_age)}'
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'not_modified': 0}
+
+    def get(self, key: Hashable) -> Optional[CachedPayload]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+            return entry
+
+    def put(self, key: Hashable, entry: CachedPayload) -> CachedPayload:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def respond(self, key: Hashable, build: Callable[[], Dict]):
+        """캐시된 응답 반환 (없으면 build() 결과를 직렬화하여 저장)"""
+        entry = self.get(key)
+        if entry is None:
+            with self._lock:
+                self.stats['misses'] += 1
+            payload = build()
+            if not isinstance(payload, dict):
+                return payload
+            entry = self.put(key, serialize_payload(payload))
+        return self._response(entry)
+
+    def _response(self, entry: CachedPayload) -> Response:
+        # GET 재검증은 약한 비교 (W/"..." 표기도 일치로 처리)
+        if request.if_none_match.contains_weak(entry.etag):
+            with self._lock:
+                self.stats['not_modified'] += 1
+            response = Response(status=304)
+        else:
+            response = Response(entry.body, mimetype='application/json')
+        response.set_etag(entry.etag)
+        response.headers['Cache-Control'] = self.cache_control
+        return response